@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the annotation renderer against per-box drawing.
+
+Compares AnnotationRenderer (one shared overlay, blended once over dirty
+regions) with the previous draw_rounded_rectangle loop (full-frame copy and
+blend per box) at 1 to 100 boxes, and checks with an image diff that both
+produce the same pixels for non-overlapping boxes.
+
+    python benchmarks/bench_annotation.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import cv2
+import numpy as np
+
+from person_detection.core.config import Config
+from person_detection.detection.detector import draw_rounded_rectangle
+from person_detection.detection.renderer import AnnotationRenderer
+from stub_model import random_boxes
+
+
+def legacy_render(frame, detections):
+    """Per-box rendering as done before AnnotationRenderer."""
+    for (x1, y1, x2, y2), _ in detections:
+        draw_rounded_rectangle(frame, (x1, y1), (x2, y2), (0, 150, 0), 1, radius=8)
+    cv2.putText(frame, f'Persons: {len(detections)}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+    return frame
+
+
+def grid_detections(count, width, height):
+    """Non-overlapping boxes laid out on a grid, for the image diff."""
+    cols = int(np.ceil(np.sqrt(count)))
+    rows = int(np.ceil(count / cols))
+    cell_w, cell_h = width // cols, height // rows
+    detections = []
+    for i in range(count):
+        row, col = divmod(i, cols)
+        x1, y1 = col * cell_w + 2, row * cell_h + 2
+        detections.append(((x1, y1, x1 + cell_w - 4, y1 + cell_h - 4), 0.9))
+    return detections
+
+
+def test_frame(width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def image_diff(counts, width, height):
+    """Return the largest pixel difference between both renderers."""
+    worst = 0
+    renderer = AnnotationRenderer()
+    for count in counts:
+        detections = grid_detections(count, width, height)
+        frame = test_frame(width, height)
+        expected = legacy_render(frame.copy(), detections)
+        actual = renderer.render(frame.copy(), detections)
+        worst = max(worst, int(np.abs(expected.astype(int) - actual.astype(int)).max()))
+    return worst
+
+
+def time_render(render, frame, detections, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render(frame.copy(), detections)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark annotation rendering.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--boxes", type=int, nargs="+", default=[1, 5, 10, 25, 50, 100])
+    args = parser.parse_args()
+
+    width, height = Config.DEFAULT_FRAME_WIDTH, Config.DEFAULT_FRAME_HEIGHT
+    worst = image_diff(args.boxes, width, height)
+    print(f"Image diff (non-overlapping boxes): max pixel difference {worst}")
+
+    renderer = AnnotationRenderer()
+    frame = test_frame(width, height)
+    print(f"{'boxes':>6} {'per-box ms':>11} {'single-pass ms':>15} {'speedup':>8}")
+    for count in args.boxes:
+        xyxy, conf = random_boxes(count, width, height)
+        detections = [(tuple(int(v) for v in box), float(c)) for box, c in zip(xyxy, conf)]
+        legacy = time_render(legacy_render, frame, detections, args.iterations)
+        single = time_render(renderer.render, frame, detections, args.iterations)
+        print(f"{count:>6} {legacy * 1000:>11.3f} {single * 1000:>15.3f} {legacy / single:>7.1f}x")
+
+    return 0 if worst == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
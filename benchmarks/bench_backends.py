@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Parity and speed check between the torch and ONNX Runtime backends.
+
+Runs the person model through both backends on the same frames, matches
+their boxes by IoU and reports agreement and per-frame latency. Frames come
+from an image directory, or random frames when none is given (useful for
+timing only, since random noise rarely contains persons).
+
+    python benchmarks/bench_backends.py --frames recorded_frames/
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from person_detection.core.config import Config
+from person_detection.core.models import ModelManager
+from person_detection.core.onnx_backend import OnnxYoloModel
+from person_detection.detection.detector import PersonDetector
+from person_detection.detection.tracker import greedy_match, iou_matrix
+
+
+def load_frames(directory, count):
+    if directory is None:
+        rng = np.random.default_rng(0)
+        shape = (Config.DEFAULT_FRAME_HEIGHT, Config.DEFAULT_FRAME_WIDTH, 3)
+        return [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(count)]
+    names = sorted(os.listdir(directory))[:count]
+    frames = [cv2.imread(os.path.join(directory, name)) for name in names]
+    return [frame for frame in frames if frame is not None]
+
+
+def run_backend(model, frames, conf, repeats):
+    """Return per-frame ``(boxes, confidences)`` and median latency in ms."""
+    detector = PersonDetector()
+    detector.set_accuracy_threshold(conf)
+    detector._model_manager = type("Manager", (), {"get_person_model": lambda self: model})()
+    detector._predict(frames[0])  # warm up
+    outputs, times = [], []
+    for frame in frames:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            prediction = detector._predict(frame)[0]
+            times.append(time.perf_counter() - start)
+        outputs.append(detector.extract_boxes(prediction))
+    return outputs, float(np.median(times)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare torch and ONNX Runtime backends.")
+    parser.add_argument("--frames", help="directory of recorded frames")
+    parser.add_argument("--count", type=int, default=50, help="frames to use")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per frame")
+    parser.add_argument("--conf", type=float, default=Config.DEFAULT_ACCURACY)
+    parser.add_argument("--min-iou", type=float, default=0.9,
+                        help="IoU for two boxes to count as the same detection")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    from ultralytics import YOLO
+
+    frames = load_frames(args.frames, args.count)
+    torch_model = YOLO(Config.MODEL_PATH)
+    onnx_model = OnnxYoloModel(ModelManager.export_onnx(Config.MODEL_PATH))
+
+    torch_out, torch_ms = run_backend(torch_model, frames, args.conf, args.repeats)
+    onnx_out, onnx_ms = run_backend(onnx_model, frames, args.conf, args.repeats)
+
+    matched = total = 0
+    worst_conf = 0.0
+    for (tb, tc), (ob, oc) in zip(torch_out, onnx_out):
+        total += max(len(tb), len(ob))
+        rows, cols = greedy_match(iou_matrix(tb.astype(float), ob.astype(float)), args.min_iou)
+        matched += len(rows)
+        if len(rows):
+            worst_conf = max(worst_conf, float(np.abs(tc[rows] - oc[cols]).max()))
+    agreement = matched / total if total else 1.0
+
+    print(f"Frames: {len(frames)}  detections: {total}  matched: {matched} ({agreement:.1%})")
+    print(f"Max confidence difference on matched boxes: {worst_conf:.4f}")
+    print(f"torch {torch_ms:.1f} ms/frame   onnx {onnx_ms:.1f} ms/frame   "
+          f"speedup {torch_ms / onnx_ms:.2f}x")
+    return 0 if agreement >= args.min_agreement else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark the detect_and_count_persons hot path stage by stage.
+
+Times model.predict, box extraction, the detection snapshot and annotation separately
+for frames with 0, 5 and 50 persons, reporting p50/p95/p99 latency per stage
+and memory allocated per frame. Runs against a stub model by default; pass
+recorded frames to also measure the real model:
+
+    python benchmarks/bench_detector.py --save baseline.json
+    python benchmarks/bench_detector.py --real 0=frames/empty.jpg 5=frames/five.jpg --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from person_detection.core.config import Config
+from person_detection.detection.detector import PersonDetector
+from stub_model import StubModel, StubModelManager
+
+STAGES = ("predict", "extract", "snapshot", "annotate", "total")
+
+
+def percentiles(samples):
+    """Get p50/p95/p99 of a list of seconds, in milliseconds."""
+    values = np.asarray(samples) * 1000.0
+    return {f"p{p}": round(float(np.percentile(values, p)), 4) for p in (50, 95, 99)}
+
+
+def run_frame(detector, frame):
+    """Run one frame through the detector, returning per-stage durations."""
+    timings = {}
+    start = time.perf_counter()
+    prediction = detector._predict(frame)[0]
+    t1 = time.perf_counter()
+    detections = detector.extract_detections(prediction)
+    t2 = time.perf_counter()
+    detector.record_detections(frame, detections, [None] * len(detections))
+    t3 = time.perf_counter()
+    detector.annotate(frame, detections)
+    t4 = time.perf_counter()
+    timings["predict"] = t1 - start
+    timings["extract"] = t2 - t1
+    timings["snapshot"] = t3 - t2
+    timings["annotate"] = t4 - t3
+    timings["total"] = t4 - start
+    return timings
+
+
+def bench_case(detector, frame, iterations):
+    """Benchmark one frame, returning latency percentiles and memory."""
+    samples = {stage: [] for stage in STAGES}
+    for _ in range(iterations):
+        timings = run_frame(detector, frame.copy())
+        for stage, value in timings.items():
+            samples[stage].append(value)
+
+    # Measure allocations in a separate pass so tracing does not skew timings.
+    allocated = []
+    for _ in range(min(iterations, 20)):
+        work = frame.copy()
+        tracemalloc.start()
+        run_frame(detector, work)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated.append(peak)
+
+    return {
+        "latency_ms": {stage: percentiles(values) for stage, values in samples.items()},
+        "peak_alloc_kb": round(float(np.median(allocated)) / 1024.0, 1),
+    }
+
+
+def stub_cases(persons_list, iterations):
+    """Benchmark the stub model on synthetic frames."""
+    frame = np.full((Config.DEFAULT_FRAME_HEIGHT, Config.DEFAULT_FRAME_WIDTH, 3), 127, np.uint8)
+    results = {}
+    for persons in persons_list:
+        detector = PersonDetector()
+        detector._model_manager = StubModelManager(StubModel(persons))
+        results[f"stub/{persons}"] = bench_case(detector, frame, iterations)
+    return results
+
+
+def real_cases(specs, iterations):
+    """Benchmark the real model on recorded frames given as ``persons=path``."""
+    import cv2
+
+    detector = PersonDetector()
+    results = {}
+    for spec in specs:
+        label, _, path = spec.partition("=")
+        frame = cv2.imread(path)
+        if frame is None:
+            print(f"Could not read frame: {path}", file=sys.stderr)
+            continue
+        detector._predict(frame)  # warm up
+        results[f"real/{label}"] = bench_case(detector, frame, iterations)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print p95 changes against a baseline; return True if any regressed."""
+    regressed = False
+    for case, data in results.items():
+        if case not in baseline:
+            continue
+        for stage in STAGES:
+            if stage not in baseline[case]["latency_ms"]:
+                continue
+            new = data["latency_ms"][stage]["p95"]
+            old = baseline[case]["latency_ms"][stage]["p95"]
+            if old <= 0:
+                continue
+            change = (new - old) / old
+            flag = ""
+            if change > tolerance:
+                flag = "  REGRESSION"
+                regressed = True
+            print(f"{case:<12} {stage:<9} p95 {old:9.3f} -> {new:9.3f} ms ({change:+.1%}){flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the detector hot path.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--persons", type=int, nargs="+", default=[0, 5, 50],
+                        help="person counts for the stub model")
+    parser.add_argument("--real", nargs="*", default=[], metavar="PERSONS=PATH",
+                        help="recorded frames to run through the real model")
+    parser.add_argument("--save", help="write results to this JSON baseline")
+    parser.add_argument("--compare", help="compare against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed p95 slowdown before flagging a regression")
+    args = parser.parse_args()
+
+    results = stub_cases(args.persons, args.iterations)
+    if args.real:
+        results.update(real_cases(args.real, args.iterations))
+
+    for case, data in results.items():
+        print(f"{case}  (peak alloc {data['peak_alloc_kb']} KiB/frame)")
+        for stage in STAGES:
+            p = data["latency_ms"][stage]
+            print(f"    {stage:<9} p50 {p['p50']:9.3f}  p95 {p['p95']:9.3f}  p99 {p['p99']:9.3f} ms")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
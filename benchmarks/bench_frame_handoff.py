@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark the capture-to-display frame hand-off.
+
+Replays the per-frame work of VideoThread between ``cap.read`` and the Qt
+signal, once as before pooling (fresh capture array, ``frame.copy()`` for
+the snapshot, ``cvtColor`` to RGB for the QImage) and once with the pooled
+path (decode into a recycled buffer, snapshot and BGR QImage by reference).
+Prints full-frame allocations and copies per frame, peak transient memory
+and time per frame, and checks that a frame held by a lagging display is
+never overwritten before it is released.
+
+    python benchmarks/bench_frame_handoff.py --frames 500 --display-lag 3
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from person_detection.core.config import Config
+from person_detection.detection.frame_buffer import FrameBuffer
+from person_detection.detection.frame_pool import FramePool, PooledFrame, read_pooled
+
+try:
+    from PyQt6.QtGui import QImage
+except ImportError:
+    QImage = None
+
+
+class FakeCapture:
+    """``cv2.VideoCapture`` stand-in that cycles through prepared frames.
+
+    Like OpenCV it decodes into the array passed to ``read`` when the shape
+    matches and allocates otherwise; allocations are counted.
+    """
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+        self.allocations = 0
+
+    def read(self, image=None):
+        source = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        if image is None or image.shape != source.shape:
+            image = np.empty_like(source)
+            self.allocations += 1
+        np.copyto(image, source)
+        return True, image
+
+
+def wrap_qimage(array, fmt):
+    if QImage is None:
+        return None
+    h, w, _ = array.shape
+    return QImage(array.data, w, h, array.strides[0], fmt)
+
+
+def run_legacy(cap, frames):
+    """Per-frame hand-off as VideoThread did before pooling."""
+    copies = 0
+    buffer = FrameBuffer(Config.FRAME_BUFFER_SIZE)
+    detected_img = None
+    for _ in range(frames):
+        _, frame = cap.read()
+        buffer.put(frame)
+        frame = buffer.get_latest(timeout=0)
+        detected_img = frame.copy()
+        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        copies += 2
+        wrap_qimage(rgb_image, QImage.Format.Format_RGB888 if QImage else None)
+    return {"copies": copies, "allocations": cap.allocations + copies, "snapshot": detected_img}
+
+
+def run_pooled(cap, frames, display_lag):
+    """Pooled hand-off: snapshot and display hold references, not copies.
+
+    The display releases frames ``display_lag`` frames late and checks their
+    pixels are unchanged, as a slow UI thread would see them.
+    """
+    pool = FramePool(Config.FRAME_POOL_SIZE)
+    buffer = FrameBuffer(Config.FRAME_BUFFER_SIZE, on_drop=PooledFrame.release)
+    snapshot = None
+    on_screen = deque()
+    corrupted = 0
+    shape = None
+    for index in range(frames):
+        _, frame = read_pooled(cap, pool, shape)
+        shape = frame.array.shape
+        buffer.put(frame)
+        frame = buffer.get_latest(timeout=0)
+        frame.array[0, 0, 0] = index % 256  # stand-in for annotation
+
+        previous, snapshot = snapshot, frame
+        if previous is not None:
+            previous.release()
+        wrap_qimage(frame.array, QImage.Format.Format_BGR888 if QImage else None)
+        on_screen.append((frame.retain(), index % 256))
+        while len(on_screen) > display_lag:
+            painted, marker = on_screen.popleft()
+            corrupted += int(painted.array[0, 0, 0] != marker)
+            painted.release()
+
+    for painted, _ in on_screen:
+        painted.release()
+    snapshot.release()
+    return {"copies": 0, "allocations": cap.allocations + pool.allocated - 1,
+            "corrupted": corrupted, "pool": pool.stats()}
+
+
+def measure(run, *args):
+    """Run once under tracemalloc; return result, ms per frame and peak MiB."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = run(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frame hand-off to the UI.")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--display-lag", type=int, default=3,
+                        help="frames the simulated UI holds before releasing")
+    parser.add_argument("--width", type=int, default=Config.DEFAULT_FRAME_WIDTH)
+    parser.add_argument("--height", type=int, default=Config.DEFAULT_FRAME_HEIGHT)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    sources = [rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8) for _ in range(4)]
+    frame_mb = sources[0].nbytes / (1024 * 1024)
+
+    legacy, legacy_s, legacy_peak = measure(run_legacy, FakeCapture(sources), args.frames)
+    pooled, pooled_s, pooled_peak = measure(run_pooled, FakeCapture(sources), args.frames, args.display_lag)
+
+    print(f"{args.width}x{args.height} BGR ({frame_mb:.2f} MiB/frame), {args.frames} frames, "
+          f"QImage {'wrapped' if QImage else 'skipped (PyQt6 not installed)'}")
+    print(f"{'path':<8} {'copies/frame':>13} {'allocs/frame':>13} {'peak MiB':>9} {'ms/frame':>9}")
+    for name, result, seconds, peak in (("legacy", legacy, legacy_s, legacy_peak),
+                                        ("pooled", pooled, pooled_s, pooled_peak)):
+        print(f"{name:<8} {result['copies'] / args.frames:>13.2f} "
+              f"{result['allocations'] / args.frames:>13.3f} {peak:>9.2f} "
+              f"{seconds / args.frames * 1000:>9.3f}")
+    print(f"Pool: {pooled['pool']}")
+    print(f"Frames overwritten while held by the display: {pooled['corrupted']}")
+    return 0 if pooled["corrupted"] == 0 and pooled["pool"]["outstanding"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for multi-camera batched inference.
+
+Feeds 1, 2, 4 and 8 synthetic camera streams through the person model,
+once as a single batched predict call per tick and once as one call per
+stream, and prints frames per second for both.
+
+    python benchmarks/bench_multi_camera.py --ticks 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from person_detection.core.config import Config
+from person_detection.detection.detector import PersonDetector
+
+
+def synthetic_frames(streams, seed=0):
+    """Build one random frame per synthetic stream."""
+    rng = np.random.default_rng(seed)
+    shape = (Config.DEFAULT_FRAME_HEIGHT, Config.DEFAULT_FRAME_WIDTH, 3)
+    return [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(streams)]
+
+
+def run_batched(detector, frames, ticks):
+    """Time one batched predict call per tick."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        detector.predict_batch(frames)
+    return time.perf_counter() - start
+
+
+def run_sequential(detector, frames, ticks):
+    """Time one predict call per stream per tick."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for frame in frames:
+            detector.predict_batch([frame])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=20, help="ticks per measurement")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    detector = PersonDetector()
+    # Warm up lazy model initialization before timing anything.
+    detector.predict_batch(synthetic_frames(1))
+
+    print(f"{'streams':>8} {'batched fps':>12} {'sequential fps':>15} {'speedup':>8}")
+    for streams in args.streams:
+        frames = synthetic_frames(streams)
+        batched = run_batched(detector, frames, args.ticks)
+        sequential = run_sequential(detector, frames, args.ticks)
+        total = streams * args.ticks
+        print(f"{streams:>8} {total / batched:>12.1f} {total / sequential:>15.1f} "
+              f"{sequential / batched:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the person tracker on synthetic trajectories.
+
+Moves N boxes along noisy straight-line paths, drops a fraction of the
+detections, skips inference on every other frame, and reports per-frame
+update cost together with ID switches against the ground truth.
+
+    python benchmarks/bench_tracker.py --tracks 5 20 50 100
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from person_detection.detection.tracker import PersonTracker, iou_matrix
+
+
+def trajectories(tracks, frames, seed=0, width=1920, height=1080):
+    """Ground-truth boxes of shape ``(frames, tracks, 4)``."""
+    rng = np.random.default_rng(seed)
+    size = rng.uniform([30, 80], [60, 160], (tracks, 2))
+    start = rng.uniform([0, 0], [width - 60, height - 160], (tracks, 2))
+    velocity = rng.uniform(-4, 4, (tracks, 2))
+    t = np.arange(frames)[:, None, None]
+    origin = start[None] + velocity[None] * t
+    return np.concatenate([origin, origin + size[None]], axis=2)
+
+
+def run(tracks, frames, drop_rate, stride, seed=0):
+    truth = trajectories(tracks, frames, seed)
+    rng = np.random.default_rng(seed + 1)
+    tracker = PersonTracker()
+    update_times, carry_times = [], []
+    assigned = {}
+    switches = 0
+
+    for f in range(frames):
+        if f % stride:
+            start = time.perf_counter()
+            tracker.carry()
+            carry_times.append(time.perf_counter() - start)
+            continue
+        keep = rng.random(tracks) >= drop_rate
+        boxes = truth[f][keep] + rng.normal(0, 1.5, (keep.sum(), 4))
+        conf = np.full(len(boxes), 0.9)
+        start = time.perf_counter()
+        out_boxes, _, ids = tracker.update(boxes, conf)
+        update_times.append(time.perf_counter() - start)
+
+        # Count ID switches: a ground-truth object matched to a new track ID.
+        if len(out_boxes):
+            iou = iou_matrix(truth[f], out_boxes.astype(float))
+            best = iou.argmax(axis=1)
+            for gt in np.flatnonzero(iou.max(axis=1) >= 0.5):
+                tid = int(ids[best[gt]])
+                if gt in assigned and assigned[gt] != tid:
+                    switches += 1
+                assigned[gt] = tid
+
+    return {
+        "update_us": np.median(update_times) * 1e6,
+        "carry_us": np.median(carry_times) * 1e6 if carry_times else 0.0,
+        "switches": switches,
+        "count": tracker.count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the person tracker.")
+    parser.add_argument("--tracks", type=int, nargs="+", default=[5, 20, 50, 100])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--drop-rate", type=float, default=0.1,
+                        help="fraction of detections missing per inference frame")
+    parser.add_argument("--stride", type=int, default=2,
+                        help="run inference on every Nth frame")
+    args = parser.parse_args()
+
+    print(f"{'tracks':>7} {'update us':>10} {'carry us':>9} {'id switches':>12} {'final count':>12}")
+    for tracks in args.tracks:
+        result = run(tracks, args.frames, args.drop_rate, args.stride)
+        print(f"{tracks:>7} {result['update_us']:>10.1f} {result['carry_us']:>9.1f} "
+              f"{result['switches']:>12} {result['count']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Person alert check: a crowd walking past several cameras.
+
+Replays a synthetic person-count trace per camera (a crowd passing each
+camera in turn with missed detections, a second crowd within the cooldown,
+and occasional single-frame false positives) through PersonAlerts in a
+video-loop thread, while the bot's alert sender drains the queue into a
+local stand-in Bot API with slow responses. Reports how many alerts the
+naive triggers would have sent (every frame with persons; every 0 -> N
+edge) against the messages and uploads actually sent, and how long the
+video loop spent per frame in the alerting stage.
+
+    python benchmarks/check_alerts.py --cameras 4 --admins 2 --latency 0.3
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from fake_telegram_api import FakeBotAPI, InputMediaPhoto, LocalBotClient
+from person_detection.core.config import Config
+from person_detection.detection.alerts import AlertQueue, PersonAlerts
+from person_detection.telegram.broadcast import Broadcaster
+from person_detection.telegram.photos import PhotoFanout, alert_items
+
+
+def make_trace(cameras, fps, seconds, miss_rate, false_rate, seed):
+    """Person counts per camera and frame."""
+    rng = random.Random(seed)
+    frames = int(fps * seconds)
+    traces = {}
+    for i in range(cameras):
+        counts = []
+        # The crowd reaches camera i a little after camera i - 1, and comes
+        # back once more well inside the cooldown.
+        visits = [(1.0 + 0.4 * i, 6.0), (seconds * 0.6 + 0.3 * i, 3.0)]
+        for frame in range(frames):
+            t = frame / fps
+            present = any(start <= t < start + length for start, length in visits)
+            if present:
+                counts.append(0 if rng.random() < miss_rate else rng.randint(1, 12))
+            else:
+                counts.append(1 if rng.random() < false_rate else 0)
+        traces[f"cam{i}"] = counts
+    return traces
+
+
+def naive_counts(traces):
+    """Alerts sent by level (every frame) and edge (every 0 -> N) triggers."""
+    level = sum(1 for counts in traces.values() for c in counts if c > 0)
+    edge = 0
+    for counts in traces.values():
+        previous = 0
+        for c in counts:
+            edge += previous == 0 and c > 0
+            previous = c
+    return level, edge
+
+
+def video_loop(alerts, traces, fps, speed, frame, timings):
+    """Feed every camera's count each tick at ``fps`` / ``speed`` real time."""
+    period = 1.0 / fps
+    ticks = len(next(iter(traces.values())))
+    start = time.perf_counter()
+    for tick in range(ticks):
+        now = tick * period
+        for name, counts in traces.items():
+            t0 = time.perf_counter()
+            alerts.observe(name, counts[tick], frame, now=now)
+            timings.append(time.perf_counter() - t0)
+        delay = start + (tick + 1) * period / speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+async def sender(queue, bot, admins):
+    """TelegramBot.send_alerts with the stand-in client."""
+    fanout = PhotoFanout(Broadcaster(), media_factory=InputMediaPhoto)
+    loop = asyncio.get_running_loop()
+    messages = []
+    while not queue.closed or len(queue):
+        batch = await loop.run_in_executor(None, queue.get_batch, 0.1)
+        if batch:
+            messages.append(batch)
+            await fanout.send(bot, admins, alert_items(batch))
+    return messages
+
+
+async def run(args):
+    admins = list(range(1, args.admins + 1))
+    api = FakeBotAPI(admins, latency=args.latency)
+    bot = LocalBotClient(api)
+    traces = make_trace(args.cameras, args.fps, args.seconds, args.miss_rate,
+                        args.false_rate, args.seed)
+    frame = np.random.default_rng(args.seed).integers(
+        0, 256, (Config.DEFAULT_FRAME_HEIGHT, Config.DEFAULT_FRAME_WIDTH, 3), dtype=np.uint8)
+
+    # Simulated time runs ``speed`` times faster; scale the coalescing
+    # window to match.
+    queue = AlertQueue(window=Config.ALERT_COALESCE_SECONDS / args.speed)
+    alerts = PersonAlerts(queue)
+    timings = []
+    loop_thread = threading.Thread(target=video_loop, args=(
+        alerts, traces, args.fps, args.speed, frame, timings))
+    start = time.perf_counter()
+    loop_thread.start()
+    send_task = asyncio.ensure_future(sender(queue, bot, admins))
+    await asyncio.get_running_loop().run_in_executor(None, loop_thread.join)
+    loop_elapsed = time.perf_counter() - start
+    queue.close()
+    messages = await send_task
+
+    level, edge = naive_counts(traces)
+    timings.sort()
+    per_frame = [t * 1e6 for t in timings]
+    photos = sum(len(batch) for batch in messages)
+    print(f"{args.cameras} cameras, {args.seconds:.0f}s at {args.fps} fps (x{args.speed} speed), "
+          f"{args.admins} admins, {args.latency * 1000:.0f} ms API latency")
+    print(f"naive level trigger: {level} alerts -> {level * args.admins} uploads")
+    print(f"naive edge trigger:  {edge} alerts -> {edge * args.admins} uploads")
+    print(f"debounced+coalesced: {photos} photos in {len(messages)} message(s), "
+          f"{api.uploads} uploads, {sum(api.calls.values())} API calls")
+    for batch in messages:
+        print("  " + "; ".join(alert.caption() for alert in batch))
+    print(f"alert stats: {alerts.stats()}, queue: {queue.stats()}")
+    print(f"video loop: {len(timings)} observe calls, p50 {per_frame[len(per_frame) // 2]:.1f} us, "
+          f"p99 {per_frame[int(len(per_frame) * 0.99)]:.1f} us, max {per_frame[-1]:.1f} us; "
+          f"replay took {loop_elapsed:.2f}s for {args.seconds / args.speed:.2f}s of frames")
+    return len(messages) == 1 and photos == args.cameras and api.uploads == args.cameras
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check debounced, coalesced person alerts.")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--admins", type=int, default=2)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=20.0, help="simulated seconds")
+    parser.add_argument("--speed", type=float, default=4.0, help="replay speed-up")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per API call")
+    parser.add_argument("--miss-rate", type=float, default=0.2, help="missed detections in a crowd")
+    parser.add_argument("--false-rate", type=float, default=0.003, help="one-frame false positives")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    return 0 if asyncio.run(run(args)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Broadcast check against a local fake Telegram API.
+
+Sends the bot's greeting (getChat, then sendMessage) to thousands of fake
+users through Broadcaster and checks that every reachable user got exactly
+one message, blocked users failed without retries, 429s were retried and
+the server's sending rate limit held. For comparison it times the old
+one-at-a-time loop on a sample of users and extrapolates.
+
+Telegram allows about 30 messages/second; the default limits here are
+scaled up so thousands of users finish in seconds, with the engine rate
+and burst in the same proportion to the server's limit as in production.
+
+    python benchmarks/check_broadcast.py --users 3000 --latency 0.05
+    python benchmarks/check_broadcast.py --transport http   # needs pyTelegramBotAPI
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_telegram_api import FakeBotAPI, LocalBotClient, serve
+from person_detection.core.config import Config
+from person_detection.telegram.broadcast import Broadcaster, TokenBucket, summarize
+
+
+def make_client(transport, port, api):
+    if transport == "local":
+        return LocalBotClient(api)
+    from telebot import asyncio_helper
+    from telebot.async_telebot import AsyncTeleBot
+    asyncio_helper.API_URL = f"http://127.0.0.1:{port}/bot{{0}}/{{1}}"
+    return AsyncTeleBot("123456:fake-token")
+
+
+def greeter(bot, bucket=None):
+    """The per-user send of TelegramBot.send_message_to_all_users."""
+    async def greet(user_id):
+        chat = await bot.get_chat(user_id)
+        if bucket is not None:
+            await bucket.acquire()
+        return await bot.send_message(user_id, f"Hello {chat.first_name} @{chat.username}!")
+    return greet
+
+
+async def sequential(bot, user_ids):
+    """The previous loop: one user at a time, stopping on the first error."""
+    greet = greeter(bot)
+    for user_id in user_ids:
+        await greet(user_id)
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    user_ids = list(range(100000, 100000 + args.users))
+    blocked = set(rng.sample(user_ids, int(len(user_ids) * args.blocked)))
+    api = FakeBotAPI(user_ids, latency=args.latency, rate_limit=args.server_rate,
+                     throttle=args.throttle, blocked=blocked, seed=args.seed)
+    server, port = await serve(api)
+    bot = make_client(args.transport, port, api)
+    try:
+        sample = [u for u in user_ids if u not in blocked][:args.sample]
+        start = time.perf_counter()
+        await sequential(bot, sample)
+        per_user = (time.perf_counter() - start) / max(1, len(sample))
+        api.messages.clear()
+
+        burst = max(1.0, args.rate * Config.BROADCAST_BURST / Config.BROADCAST_RATE)
+        broadcaster = Broadcaster(concurrency=args.concurrency, backoff=0.2,
+                                  bucket=TokenBucket(args.rate, burst))
+        start = time.perf_counter()
+        results = await broadcaster.broadcast(user_ids, greeter(bot, broadcaster.bucket))
+        elapsed = time.perf_counter() - start
+    finally:
+        if args.transport == "http":
+            await bot.close_session()
+        server.close()
+        await server.wait_closed()
+
+    summary = summarize(results)
+    reachable = [u for u in user_ids if u not in blocked]
+    missing = [u for u in reachable if len(api.messages.get(u, [])) != 1]
+    blocked_ok = all(not r.ok and r.attempts == 1 for r in results if r.recipient in blocked)
+
+    print(f"{args.users} users ({len(blocked)} blocked), {args.latency * 1000:.0f} ms latency, "
+          f"server limit {args.server_rate}/s, engine {args.rate}/s x {args.concurrency}, "
+          f"transport {args.transport}")
+    print(f"Sequential (sampled): {per_user * 1000:.1f} ms/user -> ~{per_user * args.users:.1f}s total")
+    print(f"Broadcaster: {elapsed:.2f}s ({summary['recipients'] / elapsed:.0f} users/s), {summary}")
+    print(f"429s from server: {api.throttled}, retried by engine: {broadcaster.rate_limited}, "
+          f"peak sends in 1s: {api.peak_rate}")
+    print(f"Reachable users without exactly one message: {len(missing)}; "
+          f"blocked users failed without retry: {blocked_ok}")
+    return not missing and blocked_ok and summary["delivered"] == len(reachable)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the broadcast engine against a fake Bot API.")
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per API call")
+    parser.add_argument("--server-rate", type=int, default=300, help="server sends per second")
+    parser.add_argument("--rate", type=float, default=250, help="engine sends per second")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--blocked", type=float, default=0.01, help="fraction of users who blocked the bot")
+    parser.add_argument("--throttle", type=float, default=0.001, help="chance of a random 429")
+    parser.add_argument("--sample", type=int, default=20, help="users timed with the old loop")
+    parser.add_argument("--transport", choices=["auto", "http", "local"], default="auto")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.transport == "auto":
+        try:
+            import telebot  # noqa: F401
+            args.transport = "http"
+        except ImportError:
+            print("pyTelegramBotAPI not installed; calling the fake API in-process.")
+            args.transport = "local"
+    return 0 if asyncio.run(run(args)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Camera hot-plug check against a fake /dev and sysfs tree.
+
+Builds a fake ``/sys/class/video4linux`` and ``/dev`` in a temporary
+directory, plugs and unplugs USB cameras the way the kernel and udev do
+(sysfs entries first, then ``/dev/videoN`` nodes, two nodes per camera,
+some behind a hub), and checks that DeviceWatcher reports each change once
+with the names ``v4l2-ctl --list-devices`` would print. Reports the time
+from the last node appearing to the callback, the watcher's CPU use while
+idle, and, for comparison, how long the old per-second subprocess call held
+the GUI thread.
+
+    python benchmarks/check_camera_watcher.py --cameras 3 --idle 5
+    python benchmarks/check_camera_watcher.py --poll   # without inotify
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from person_detection.detection.devices import DeviceWatcher, scan_video_devices, usb_bus_info
+
+HOST_CONTROLLER = "0000:00:14.0"
+
+
+class FakeDevices:
+    """A fake sysfs and /dev tree with USB cameras that can be plugged in and out."""
+
+    def __init__(self, root):
+        self.root = root
+        self.dev_dir = os.path.join(root, "dev")
+        self.sysfs_dir = os.path.join(root, "sys", "class", "video4linux")
+        self.usb_root = os.path.join(root, "sys", "devices", "pci0000:00", HOST_CONTROLLER, "usb1")
+        os.makedirs(self.dev_dir)
+        os.makedirs(self.sysfs_dir)
+        os.makedirs(self.usb_root)
+        self.next_node = 0
+
+    def plug(self, port, card, node_delay=0.0):
+        """Add a camera on USB ``port`` ("2" or "1.3" behind a hub); returns its nodes."""
+        interface = os.path.join(self.usb_root, f"1-{port}", f"1-{port}:1.0")
+        os.makedirs(interface, exist_ok=True)
+        nodes = [f"video{self.next_node}", f"video{self.next_node + 1}"]
+        self.next_node += 2
+        for node in nodes:
+            entry = os.path.join(self.sysfs_dir, node)
+            os.makedirs(entry)
+            with open(os.path.join(entry, "name"), "w") as f:
+                f.write(card + "\n")
+            os.symlink(interface, os.path.join(entry, "device"))
+        for node in nodes:
+            time.sleep(node_delay)
+            open(os.path.join(self.dev_dir, node), "w").close()
+        return nodes
+
+    def unplug(self, nodes):
+        for node in nodes:
+            os.remove(os.path.join(self.dev_dir, node))
+        for node in nodes:
+            shutil.rmtree(os.path.join(self.sysfs_dir, node))
+
+
+class Recorder:
+    def __init__(self):
+        self.changes = []
+        self.cond = threading.Condition()
+
+    def __call__(self, added, removed):
+        with self.cond:
+            self.changes.append((time.perf_counter(), added, removed))
+            self.cond.notify_all()
+
+    def wait(self, count, timeout):
+        with self.cond:
+            self.cond.wait_for(lambda: len(self.changes) >= count, timeout)
+            return len(self.changes) >= count
+
+
+def legacy_tick_ms(samples):
+    """Time the old timer callback's subprocess call (or a stand-in without v4l2-ctl)."""
+    command = ["v4l2-ctl", "--list-devices"] if shutil.which("v4l2-ctl") else ["true"]
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, text=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return command[0], sorted(times)
+
+
+def run(args):
+    ok = True
+    assert usb_bus_info(f"/sys/devices/pci0000:00/{HOST_CONTROLLER}/usb1/1-1/1-1.3/1-1.3:1.0") \
+        == f"usb-{HOST_CONTROLLER}-1.3"
+    assert usb_bus_info("/sys/devices/platform/vivid.0") is None
+
+    root = tempfile.mkdtemp(prefix="fake-v4l-")
+    try:
+        fake = FakeDevices(root)
+        present = fake.plug("1", "Built-in Camera")
+        recorder = Recorder()
+        watcher = DeviceWatcher(recorder, fake.dev_dir, fake.sysfs_dir,
+                                use_inotify=not args.poll)
+        initial = watcher.start()
+        expected = {f"Built-in Camera (usb-{HOST_CONTROLLER}-1):": os.path.join(fake.dev_dir, "video0")}
+        print(f"watcher mode: {watcher.mode}; initial inventory: {initial}")
+        ok &= initial == expected
+
+        latencies = []
+        plugged = []
+        for i in range(args.cameras):
+            port = f"{i + 2}" if i % 2 == 0 else f"1.{i + 2}"
+            count = len(recorder.changes)
+            nodes = fake.plug(port, f"USB Camera {i}", node_delay=0.05)
+            ready = time.perf_counter()
+            if not recorder.wait(count + 1, 5):
+                print(f"plug {i}: no change reported")
+                ok = False
+                continue
+            at, added, removed = recorder.changes[count]
+            latencies.append((at - ready) * 1000)
+            name = f"USB Camera {i} (usb-{HOST_CONTROLLER}-{port}):"
+            good = added == {name: os.path.join(fake.dev_dir, nodes[0])} and not removed
+            ok &= good
+            print(f"plug {i}: {added} ({latencies[-1]:.0f} ms){'' if good else '  UNEXPECTED'}")
+            plugged.append((name, nodes))
+
+        for name, nodes in plugged:
+            count = len(recorder.changes)
+            fake.unplug(nodes)
+            ready = time.perf_counter()
+            if not recorder.wait(count + 1, 5):
+                print(f"unplug {name}: no change reported")
+                ok = False
+                continue
+            at, added, removed = recorder.changes[count]
+            latencies.append((at - ready) * 1000)
+            good = list(removed) == [name] and not added
+            ok &= good
+            print(f"unplug: {list(removed)} ({latencies[-1]:.0f} ms){'' if good else '  UNEXPECTED'}")
+
+        time.sleep(0.5)
+        changes = len(recorder.changes)
+        ok &= changes == 2 * args.cameras
+        scans = watcher.scans
+        cpu_start = time.process_time()
+        time.sleep(args.idle)
+        idle_cpu = time.process_time() - cpu_start
+        idle_scans = watcher.scans - scans
+        final = scan_video_devices(fake.dev_dir, fake.sysfs_dir)
+        watcher.stop()
+        ok &= final == expected and watcher.devices == expected
+
+        command, legacy = legacy_tick_ms(args.samples)
+        print(f"{changes} changes reported for {2 * args.cameras} plug/unplug events, "
+              f"{watcher.events} relevant /dev events, {watcher.scans} sysfs scans")
+        if latencies:
+            print(f"report latency: median {sorted(latencies)[len(latencies) // 2]:.0f} ms, "
+                  f"max {max(latencies):.0f} ms (settle {watcher.settle * 1000:.0f} ms)")
+        print(f"idle {args.idle:.0f}s: {idle_cpu * 1000:.1f} ms CPU, {idle_scans} scans, "
+              f"0 ms on the GUI thread")
+        print(f"old timer: {command} subprocess held the GUI thread "
+              f"{legacy[len(legacy) // 2]:.1f} ms median, {legacy[-1]:.1f} ms max, every second")
+    finally:
+        shutil.rmtree(root)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check camera hot-plug watching on a fake device tree.")
+    parser.add_argument("--cameras", type=int, default=3)
+    parser.add_argument("--idle", type=float, default=5.0, help="idle seconds to measure CPU over")
+    parser.add_argument("--samples", type=int, default=20, help="old subprocess calls to time")
+    parser.add_argument("--poll", action="store_true", help="poll instead of using inotify")
+    args = parser.parse_args()
+    ok = run(args)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Clip recorder check: pre-roll, post-roll and video-loop cost.
+
+Replays a synthetic 30 fps camera (each frame carries its index in a
+corner patch) with a person-count trace containing two visits, feeding
+ClipRecorder.push from the "video loop" with pooled frames. Checks that
+two clips are written, that each starts about ``pre_roll`` seconds before
+the person appeared and runs until ``post_roll`` after they left, and
+reports the time push() takes on the loop and the pre-roll memory.
+
+For comparison the same trace runs through the naive approach: a deque of
+raw frame copies at full frame rate, with the pre-roll and every following
+frame written by cv2.VideoWriter on the loop itself.
+
+    python benchmarks/check_clip_recorder.py --speed 4 --storage jpeg
+"""
+
+import argparse
+import collections
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from person_detection.detection.frame_pool import FramePool
+from person_detection.detection.recorder import ClipRecorder
+
+WIDTH, HEIGHT, FPS = 640, 480, 30
+PATCH = (slice(0, 120), slice(0, 160))
+
+
+def make_background(seed):
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (HEIGHT // 8, WIDTH // 8, 3), dtype=np.uint8)
+    return cv2.resize(small, (WIDTH, HEIGHT), interpolation=cv2.INTER_LINEAR)
+
+
+def draw_frame(out, background, index):
+    """Background with a moving box and the frame index in the corner patch."""
+    np.copyto(out, background)
+    x = (index * 7) % (WIDTH - 80)
+    cv2.rectangle(out, (x, 200), (x + 80, 400), (0, 255, 0), 2)
+    out[PATCH] = (40 + (index % 20) * 10, 40 + (index // 20 % 20) * 10, 40 + (index // 400) * 10)
+
+
+def read_index(frame):
+    levels = [int(round((float(frame[PATCH][..., c].mean()) - 40) / 10)) for c in range(3)]
+    return levels[0] + levels[1] * 20 + levels[2] * 400
+
+
+def make_trace(visits, seconds):
+    """Person count per frame: ``visits`` are (start, length) in seconds."""
+    counts = []
+    for i in range(int(seconds * FPS)):
+        t = i / FPS
+        counts.append(3 if any(s <= t < s + d for s, d in visits) else 0)
+    return counts
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1e6
+
+
+def run_recorder(args, counts, background, directory):
+    pool = FramePool(8)
+    recorder = ClipRecorder(directory, pre_roll=args.pre_roll, post_roll=args.post_roll,
+                            fps=args.clip_fps, storage=args.storage)
+    recorder.start()
+    timings = []
+    peak_bytes = 0
+    start = time.perf_counter()
+    for index, persons in enumerate(counts):
+        frame = pool.acquire((HEIGHT, WIDTH, 3))
+        draw_frame(frame.array, background, index)
+        frame.timestamp = index / FPS
+        t0 = time.perf_counter()
+        recorder.push("cam0", frame, persons)
+        timings.append(time.perf_counter() - t0)
+        frame.release()
+        if index % FPS == 0:
+            peak_bytes = max(peak_bytes, recorder.stats()["pre_roll_bytes"])
+        delay = start + (index + 1) / FPS / args.speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    stats = recorder.stats()
+    recorder.close()
+    return recorder, timings, peak_bytes, stats
+
+
+def run_naive(args, counts, background, directory):
+    """Full-rate raw deque; pre-roll and live frames written on the loop."""
+    pre_roll = collections.deque(maxlen=int(args.pre_roll * FPS))
+    frame = np.empty((HEIGHT, WIDTH, 3), np.uint8)
+    writer = None
+    last_seen = None
+    clips = 0
+    timings = []
+    for index, persons in enumerate(counts):
+        draw_frame(frame, background, index)
+        t = index / FPS
+        t0 = time.perf_counter()
+        pre_roll.append(frame.copy())
+        if persons and writer is None:
+            clips += 1
+            writer = cv2.VideoWriter(os.path.join(directory, f"naive{clips}.mp4"),
+                                     cv2.VideoWriter_fourcc(*"mp4v"), FPS, (WIDTH, HEIGHT))
+            for old in pre_roll:
+                writer.write(old)
+        elif writer is not None:
+            writer.write(frame)
+        if persons:
+            last_seen = t
+        if writer is not None and t - last_seen >= args.post_roll:
+            writer.release()
+            writer = None
+        timings.append(time.perf_counter() - t0)
+    if writer is not None:
+        writer.release()
+    return timings, sum(f.nbytes for f in pre_roll)
+
+
+def clip_indexes(path):
+    cap = cv2.VideoCapture(path)
+    indexes = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        indexes.append(read_index(frame))
+    cap.release()
+    return indexes
+
+
+def run(args):
+    visits = [(8.0, 6.0), (26.0, 3.0)]
+    counts = make_trace(visits, args.seconds)
+    background = make_background(args.seed)
+    root = tempfile.mkdtemp(prefix="clips-")
+    ok = True
+    try:
+        recorder, timings, peak_bytes, stats = run_recorder(args, counts, background, root)
+        naive_timings, naive_bytes = run_naive(args, counts, background, root)
+
+        print(f"{args.seconds:.0f}s at {FPS} fps (x{args.speed} speed), visits {visits}, "
+              f"pre-roll {args.pre_roll}s, post-roll {args.post_roll}s, "
+              f"clips at {args.clip_fps} fps, storage {args.storage}")
+        print(f"recorder stats: {stats}")
+        written = sorted(recorder.written)
+        ok &= len(written) == len(visits)
+        for path, (start, length) in zip(written, visits):
+            indexes = clip_indexes(path)
+            first, last = indexes[0] / FPS, indexes[-1] / FPS
+            good = (abs(first - (start - args.pre_roll)) <= 2 / args.clip_fps
+                    and abs(last - (start + length + args.post_roll)) <= 2 / args.clip_fps)
+            ok &= good
+            print(f"  {os.path.basename(path)}: {len(indexes)} frames, {first:.1f}s to {last:.1f}s "
+                  f"for a visit at {start:.1f}-{start + length:.1f}s: {good}")
+        print(f"push() on the loop:  p50 {percentile(timings, 0.5):.1f} us, "
+              f"p99 {percentile(timings, 0.99):.1f} us, max {max(timings) * 1e6:.0f} us; "
+              f"pre-roll memory {peak_bytes / 1024 / 1024:.1f} MiB")
+        print(f"naive, on the loop:  p50 {percentile(naive_timings, 0.5):.1f} us, "
+              f"p99 {percentile(naive_timings, 0.99):.1f} us, max {max(naive_timings) * 1e6:.0f} us; "
+              f"pre-roll memory {naive_bytes / 1024 / 1024:.1f} MiB")
+        ok &= stats["dropped"] == 0
+    finally:
+        shutil.rmtree(root)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check event-triggered clip recording.")
+    parser.add_argument("--seconds", type=float, default=40.0, help="simulated seconds")
+    parser.add_argument("--speed", type=float, default=4.0, help="replay speed-up")
+    parser.add_argument("--pre-roll", type=float, default=5.0)
+    parser.add_argument("--post-roll", type=float, default=5.0)
+    parser.add_argument("--clip-fps", type=int, default=10)
+    parser.add_argument("--storage", choices=["jpeg", "raw"], default="jpeg")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    ok = run(args)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
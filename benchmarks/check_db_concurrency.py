@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Concurrency check for the database layer under a bot message flood.
+
+Replays the bot's new-user handler for a flood of stub messages (many
+users, each sending several messages at once) on an asyncio loop while a
+second thread does GUI-style settings reads and slow writes. Runs it once with
+the handler calling DBHelper directly on the loop, as the bot used to, and
+once through AsyncDBHelper. Reports how long a heartbeat task on the loop
+was stalled, messages handled per second and errors, and checks that every
+user is stored exactly once.
+
+    python benchmarks/check_db_concurrency.py --users 200 --messages 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from person_detection.database.handler import AsyncDBHelper, DBHelper
+
+
+class StubMessage:
+    """The fields of a Telegram message the handler reads."""
+
+    def __init__(self, user_id):
+        self.text = "hello"
+        self.from_user = type("User", (), {"id": user_id, "first_name": f"user{user_id}"})()
+
+
+async def handle_direct(db, message):
+    """Handler as it was: synchronous DB calls on the event loop."""
+    user = message.from_user
+    if not db.user_exists(user.id):
+        db.add_user(user.first_name, user.id)
+    await asyncio.sleep(0)  # reply_to
+
+
+async def handle_async(async_db, message):
+    """Handler as the bot runs it now."""
+    user = message.from_user
+    await async_db.add_user_if_missing(user.first_name, user.id)
+    await asyncio.sleep(0)  # reply_to
+
+
+async def heartbeat(stop, period, lags):
+    """Record how late a periodic task wakes up; stalls show up as lag."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(period)
+        lags.append(time.perf_counter() - start - period)
+
+
+def settings_worker(db, stop, errors, hold):
+    """GUI-thread traffic: read settings and rewrite admins.
+
+    Each admin rewrite keeps the write lock for ``hold`` seconds, standing
+    in for a slow disk or a large event log batch commit.
+    """
+    while not stop.is_set():
+        try:
+            db.get_bot_token()
+            db.get_admins()
+            db.conn.execute("BEGIN IMMEDIATE")
+            time.sleep(hold)
+            db.add_new_admins([1, 2, 3])
+        except Exception as e:
+            errors.append(repr(e))
+        time.sleep(0.005)
+
+
+async def flood(handler, target, messages, burst):
+    """Deliver ``burst`` messages per millisecond, each as its own task."""
+    errors = []
+
+    async def one(message):
+        try:
+            await handler(target, message)
+        except Exception as e:
+            errors.append(repr(e))
+
+    tasks = []
+    for i in range(0, len(messages), burst):
+        tasks.extend(asyncio.ensure_future(one(message)) for message in messages[i:i + burst])
+        await asyncio.sleep(0.001)
+    await asyncio.gather(*tasks)
+    return errors
+
+
+def run(mode, users, per_user, burst, hold, seed):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DBHelper(os.path.join(tmp, "bot.db"))
+        async_db = AsyncDBHelper(db)
+        messages = [StubMessage(1000 + u) for u in range(users) for _ in range(per_user)]
+        random.Random(seed).shuffle(messages)
+
+        stop_gui = threading.Event()
+        gui_errors = []
+        gui = threading.Thread(target=settings_worker, args=(db, stop_gui, gui_errors, hold))
+        gui.start()
+
+        async def main():
+            stop_beat = asyncio.Event()
+            lags = []
+            beat = asyncio.ensure_future(heartbeat(stop_beat, 0.005, lags))
+            start = time.perf_counter()
+            if mode == "direct":
+                errors = await flood(handle_direct, db, messages, burst)
+            else:
+                errors = await flood(handle_async, async_db, messages, burst)
+            elapsed = time.perf_counter() - start
+            stop_beat.set()
+            await beat
+            return errors, elapsed, lags
+
+        errors, elapsed, lags = asyncio.run(main())
+        stop_gui.set()
+        gui.join()
+        async_db.shutdown()
+
+        rows = db.conn.execute("SELECT user_id, COUNT(*) FROM tgmembers GROUP BY user_id").fetchall()
+        duplicates = sum(1 for _, count in rows if count > 1)
+        return {
+            "messages": len(messages),
+            "elapsed": elapsed,
+            "p99_lag_ms": float(np.percentile(lags, 99)) * 1000 if lags else 0.0,
+            "max_lag_ms": max(lags, default=0.0) * 1000,
+            "errors": errors + gui_errors,
+            "users": len(rows),
+            "duplicates": duplicates,
+            "connections": db.connection_count(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flood the DB layer with stub bot messages.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=5, help="messages per user")
+    parser.add_argument("--burst", type=int, default=20, help="messages arriving per millisecond")
+    parser.add_argument("--hold-ms", type=float, default=20,
+                        help="how long each settings write holds the database lock")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'mode':<8} {'msgs/s':>8} {'stall p99 ms':>13} {'stall max ms':>13} {'users':>6} "
+          f"{'dupes':>6} {'conns':>6} {'errors':>7}")
+    for mode in ("direct", "async"):
+        r = run(mode, args.users, args.messages, args.burst, args.hold_ms / 1000, args.seed)
+        print(f"{mode:<8} {r['messages'] / r['elapsed']:>8.0f} {r['p99_lag_ms']:>13.1f} "
+              f"{r['max_lag_ms']:>13.1f} "
+              f"{r['users']:>6} {r['duplicates']:>6} {r['connections']:>6} {len(r['errors']):>7}")
+        for error in r["errors"][:3]:
+            print(f"    {error}")
+        if mode == "async":
+            ok = not r["errors"] and r["duplicates"] == 0 and r["users"] == args.users
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Frame source check: deterministic replay and reconnecting streams.
+
+Writes a short synthetic video (each frame carries its index in the
+pixels) and an image sequence to a temporary directory, then checks:
+
+* video file replay as fast as possible yields every frame once, in order,
+  with increasing sequence numbers and positions;
+* real-time replay takes as long as the clip;
+* the image sequence yields every image at ``index / fps``;
+* a network stream served over local HTTP keeps delivering after the
+  server goes away for a while and comes back, where the old read loop
+  stopped at the first failed read.
+
+    python benchmarks/check_frame_sources.py --frames 90 --outage 1.5
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from person_detection.detection.frame_buffer import FrameBuffer
+from person_detection.detection.frame_pool import PooledFrame
+from person_detection.detection.sources import (ImageSequenceSource, NetworkStreamSource,
+                                                VideoFileSource)
+
+WIDTH, HEIGHT = 320, 240
+
+
+def make_frame(index):
+    """A flat frame whose blue and green levels encode ``index`` (survives MJPEG)."""
+    frame = np.full((HEIGHT, WIDTH, 3), 128, dtype=np.uint8)
+    frame[..., 0] = 20 + (index % 20) * 10
+    frame[..., 1] = 20 + (index // 20) * 10
+    return frame
+
+
+def frame_index(array):
+    blue, green = (int(round((float(array[..., c].mean()) - 20) / 10)) for c in (0, 1))
+    return green * 20 + blue
+
+
+def write_media(root, frames, fps):
+    video = os.path.join(root, "clip.avi")
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"MJPG"), fps, (WIDTH, HEIGHT))
+    for i in range(frames):
+        writer.write(make_frame(i))
+    writer.release()
+    images = os.path.join(root, "images")
+    os.makedirs(images)
+    for i in range(min(frames, 30)):
+        cv2.imwrite(os.path.join(images, f"{i:05d}.png"), make_frame(i))
+    return video, images
+
+
+def replay(source):
+    """Pull every frame through ``frames()``; returns (indexes, sequences, positions, seconds)."""
+    indexes, sequences, positions = [], [], []
+    start = time.perf_counter()
+    for frame in source.frames():
+        indexes.append(frame_index(frame.array))
+        sequences.append(frame.sequence)
+        positions.append(frame.position)
+        frame.release()
+    return indexes, sequences, positions, time.perf_counter() - start
+
+
+class MediaServer:
+    """Serves one file over HTTP; can be switched off to simulate an outage."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not server.up:
+                    self.send_error(503)
+                    return
+                server.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "video/x-msvideo")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.up = True
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/clip.avi"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def legacy_stream(url):
+    """The old capture loop: stop at the first failed read."""
+    cap = cv2.VideoCapture(url)
+    frames = 0
+    while True:
+        ret, _ = cap.read()
+        if not ret:
+            break
+        frames += 1
+    cap.release()
+    return frames
+
+
+def check_stream(url, server, frames, outage, seconds):
+    source = NetworkStreamSource(url, backoff=0.2, max_backoff=1.0)
+    buffer = FrameBuffer(1, on_drop=PooledFrame.release)
+    source.start(buffer)
+    deadline = time.monotonic() + seconds
+    outage_done = False
+    consumed = 0
+    while time.monotonic() < deadline:
+        frame = buffer.get_latest(timeout=0.1)
+        if frame is not None:
+            consumed += 1
+            frame.release()
+        if not outage_done and source.frames_read >= frames:
+            # The first session ended: take the server away for a while.
+            server.up = False
+            time.sleep(outage)
+            server.up = True
+            outage_done = True
+    source.stop()
+    buffer.drain()
+    return source.stats(), consumed, server.requests
+
+
+def run(args):
+    ok = True
+    root = tempfile.mkdtemp(prefix="frame-sources-")
+    try:
+        video, images = write_media(root, args.frames, args.fps)
+        expected = list(range(args.frames))
+
+        indexes, sequences, positions, fast = replay(VideoFileSource(video))
+        good = indexes == expected and sequences == expected and positions == sorted(positions)
+        ok &= good
+        print(f"file, as fast as possible: {len(indexes)}/{args.frames} frames in order: {good}, "
+              f"{fast:.2f}s ({len(indexes) / fast:.0f} fps)")
+
+        indexes, _, positions, realtime = replay(VideoFileSource(video, realtime=True))
+        clip = args.frames / args.fps
+        good = indexes == expected and abs(realtime - clip) < 0.25
+        ok &= good
+        print(f"file, real time: {len(indexes)} frames in {realtime:.2f}s for a {clip:.2f}s clip: {good}")
+
+        count = min(args.frames, 30)
+        indexes, _, positions, _ = replay(ImageSequenceSource(images, fps=args.fps))
+        good = (indexes == list(range(count))
+                and np.allclose(positions, [i / args.fps for i in range(count)]))
+        ok &= good
+        print(f"image sequence: {len(indexes)}/{count} images at index/fps: {good}")
+
+        server = MediaServer(video)
+        try:
+            legacy = legacy_stream(server.url)
+            server.requests = 0
+            stats, consumed, requests = check_stream(server.url, server, args.frames,
+                                                     args.outage, args.seconds)
+        finally:
+            server.close()
+        good = stats["reconnects"] >= 1 and stats["frames"] > args.frames
+        ok &= good
+        print(f"stream, old loop: {legacy} frames, then stopped at the first failed read")
+        print(f"stream, with a {args.outage:.1f}s outage: {stats['frames']} frames read over "
+              f"{requests} connections, {stats['reconnects']} reconnect attempts, "
+              f"{consumed} consumed (latest-frame buffer): {good}")
+    finally:
+        shutil.rmtree(root)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check frame sources: replay and reconnect.")
+    parser.add_argument("--frames", type=int, default=90, help="at most 400 (frame index is in the pixel levels)")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--outage", type=float, default=1.5, help="seconds the stream server is down")
+    parser.add_argument("--seconds", type=float, default=5.0, help="how long to follow the stream")
+    args = parser.parse_args()
+    ok = run(args)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
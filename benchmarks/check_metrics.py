@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Pipeline metrics check: histogram cost, accuracy and the /metrics endpoint.
+
+* Times ``Histogram.observe`` against a bare ``time.perf_counter()`` pair,
+  so the cost per timed stage can be set against a frame budget.
+* Observes from several threads at once and checks no count is lost.
+* Compares histogram p50/p99 estimates with exact percentiles.
+* Replays a synthetic video through a ``VideoFileSource`` and the
+  detector's annotation stage, writes detection events through the event
+  log and "sends" through the broadcaster, then scrapes ``/metrics`` from a
+  ``MetricsServer`` on a free port and checks the text parses, buckets are
+  cumulative and every expected family is there.
+
+    python benchmarks/check_metrics.py --observations 1000000 --frames 120
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from person_detection.core.metrics import (DROPPED, QUEUE_DEPTH, Histogram, MetricsServer, registry,
+                                          sample, stage_summary, stage_timers)
+from person_detection.database.handler import AsyncDBHelper, DBHelper, DetectionEventLog
+from person_detection.detection.detector import PersonDetector
+from person_detection.detection.sources import VideoFileSource
+from person_detection.telegram.broadcast import Broadcaster
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (-?[0-9.e+-]+|\+Inf|NaN)$')
+EXPECTED = (
+    "person_detection_stage_seconds",
+    "person_detection_db_write_seconds",
+    "person_detection_db_call_seconds",
+    "person_detection_telegram_send_seconds",
+    "person_detection_queue_depth",
+    "person_detection_dropped_total",
+)
+
+
+def time_observe(count):
+    """Nanoseconds per call: perf_counter pair alone, and with observe."""
+    histogram = Histogram()
+    start = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        time.perf_counter() - t0
+    bare = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        histogram.observe(time.perf_counter() - t0)
+    timed = time.perf_counter() - start
+    return bare / count * 1e9, timed / count * 1e9, histogram.count == count
+
+
+def check_threads(threads, per_thread):
+    histogram = Histogram()
+
+    def work():
+        for i in range(per_thread):
+            histogram.observe((i % 100) * 1e-4)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    counts, total = histogram.snapshot()
+    expected_sum = threads * sum((i % 100) * 1e-4 for i in range(per_thread))
+    return sum(counts), threads * per_thread, abs(total - expected_sum) < 1e-6 * expected_sum
+
+
+def check_quantiles(count, seed):
+    """Histogram estimates vs exact percentiles of lognormal latencies (median ~8 ms)."""
+    values = np.random.default_rng(seed).lognormal(np.log(0.008), 0.6, count)
+    histogram = Histogram()
+    for value in values.tolist():
+        histogram.observe(value)
+    rows = []
+    for q in (0.5, 0.99):
+        exact = float(np.quantile(values, q))
+        estimate = histogram.quantile(q)
+        # The estimate must fall in the same bucket as the exact value.
+        bucket = np.searchsorted(histogram.bounds, exact)
+        lower = histogram.bounds[bucket - 1] if bucket else 0.0
+        upper = histogram.bounds[bucket] if bucket < len(histogram.bounds) else float("inf")
+        rows.append((q, exact, estimate, lower <= estimate <= upper))
+    return rows
+
+
+def write_video(path, frames):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (640, 480))
+    rng = np.random.default_rng(0)
+    background = cv2.resize(rng.integers(0, 256, (60, 80, 3), dtype=np.uint8), (640, 480))
+    for i in range(frames):
+        frame = background.copy()
+        cv2.rectangle(frame, (i * 4 % 560, 150), (i * 4 % 560 + 80, 350), (0, 255, 0), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def run_pipeline(root, frames):
+    """Drive the real stages that run without a model, Qt or Telegram."""
+    video = os.path.join(root, "clip.avi")
+    write_video(video, frames)
+    source = VideoFileSource(video, name="replay")
+    detector = PersonDetector()
+    detector.timings = timings = stage_timers("replay")
+    detector.last_detections = [((100, 150, 180, 350), 0.9), ((300, 120, 380, 330), 0.8)]
+    event_log = DetectionEventLog(os.path.join(root, "events.db"), batch_size=16)
+
+    def collect():
+        events = event_log.stats()
+        return [sample(QUEUE_DEPTH, events["queued"], queue="event_log"),
+                sample(DROPPED, events["dropped"], queue="event_log")]
+
+    registry.add_collector(collect)
+    for frame in source.frames():
+        start = time.perf_counter()
+        detector.annotate_last(frame.array)
+        event_log.record(source.name, frame.sequence % 3, detector.last_detections)
+        timings["total"].observe_since(start)
+        frame.release()
+    event_log.flush()
+
+    async def send(recipient):
+        await asyncio.sleep(0.002)
+        if recipient % 5 == 0:
+            raise ValueError("chat not found")
+        return recipient
+
+    async def bot_work(async_db):
+        await async_db.add_user_if_missing("someone", 1)
+        await async_db.get_all_users()
+        return await Broadcaster(rate=1000, concurrency=8).broadcast(range(40), send)
+
+    async_db = AsyncDBHelper(DBHelper(os.path.join(root, "bot.db")))
+    try:
+        asyncio.run(bot_work(async_db))
+    finally:
+        async_db.shutdown()
+    return timings, event_log, collect
+
+
+def parse(text):
+    """Check the exposition text; returns {name: [(labels, value)]} and a list of problems."""
+    samples, problems, types = {}, [], {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ", 3)
+            types[name] = kind
+            continue
+        if line.startswith("#") or not line:
+            continue
+        match = SAMPLE.match(line)
+        if match is None:
+            problems.append(f"unparsable: {line}")
+            continue
+        name, labels, value = match.groups()
+        samples.setdefault(name, []).append((labels or "", float(value)))
+    for name, kind in types.items():
+        if kind != "histogram":
+            continue
+        buckets = {}
+        for labels, value in samples.get(f"{name}_bucket", []):
+            series = re.sub(r',?le="[^"]*"', "", labels)
+            buckets.setdefault(series, []).append(value)
+        counts = dict(samples.get(f"{name}_count", []))
+        for series, values in buckets.items():
+            if values != sorted(values):
+                problems.append(f"{name}{series}: buckets not cumulative")
+            if counts.get(series.replace("{}", "")) != values[-1]:
+                problems.append(f"{name}{series}: _count differs from the +Inf bucket")
+    return samples, types, problems
+
+
+def http_status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def run(args):
+    ok = True
+    bare, timed, counted = time_observe(args.observations)
+    ok &= counted
+    per_frame = (timed - bare) * 9 / 1000
+    print(f"observe: {timed - bare:.0f} ns on top of the perf_counter pair ({bare:.0f} ns), "
+          f"{timed:.0f} ns per timed stage; 9 stages per frame ~{per_frame:.1f} us "
+          f"({per_frame / 33333 * 100:.3f}% of a 30 fps frame)")
+
+    seen, expected, sum_ok = check_threads(args.threads, args.observations // args.threads)
+    ok &= seen == expected and sum_ok
+    print(f"{args.threads} threads: {seen}/{expected} observations counted, sum exact: {sum_ok}")
+
+    for q, exact, estimate, good in check_quantiles(args.observations // 10, args.seed):
+        ok &= good
+        print(f"p{q * 100:g}: exact {exact * 1000:.2f} ms, histogram {estimate * 1000:.2f} ms, "
+              f"same bucket: {good}")
+
+    root = tempfile.mkdtemp(prefix="metrics-")
+    server = MetricsServer(port=0)
+    try:
+        timings, event_log, collect = run_pipeline(root, args.frames)
+        print(f"pipeline stages: {stage_summary(timings)}")
+        server.start()
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        start = time.perf_counter()
+        with urllib.request.urlopen(url, timeout=5) as response:
+            content_type = response.headers["Content-Type"]
+            text = response.read().decode()
+        scrape_ms = (time.perf_counter() - start) * 1000
+        samples, types, problems = parse(text)
+        missing = [name for name in EXPECTED if name not in types]
+        for problem in problems[:10]:
+            print(f"  {problem}")
+        good = not problems and not missing and content_type.startswith("text/plain; version=0.0.4")
+        ok &= good
+        print(f"scrape: {len(text)} bytes, {sum(len(v) for v in samples.values())} samples in "
+              f"{len(types)} families, {scrape_ms:.1f} ms; valid: {good}"
+              + (f"; missing {missing}" if missing else ""))
+
+        frames = dict(samples["person_detection_stage_seconds_count"])
+        good = (frames.get('{camera="replay",stage="capture"}') == args.frames
+                and frames.get('{camera="replay",stage="annotate"}') == args.frames)
+        ok &= good
+        print(f"stage counts match {args.frames} frames for capture and annotate: {good}")
+
+        sends = dict(samples["person_detection_telegram_send_seconds_count"])
+        good = sends.get('{result="ok"}') == 32 and sends.get('{result="error"}') == 8
+        ok &= good
+        print(f"telegram sends: {sends}: {good}")
+        writes = dict(samples["person_detection_db_write_seconds_count"])
+        good = writes.get("") == event_log.batches and event_log.written == args.frames
+        ok &= good
+        print(f"db batch writes: {writes.get('')} for {event_log.written} events: {good}")
+
+        calls = dict(samples["person_detection_db_call_seconds_count"])
+        good = set(calls) == {'{method="add_user_if_missing"}', '{method="get_all_users"}'}
+        ok &= good
+        print(f"bot database calls: {calls}: {good}")
+
+        status = http_status(url.replace("/metrics", "/"))
+        ok &= status == 404
+        print(f"other paths: HTTP {status}")
+    finally:
+        server.stop()
+        registry.remove_collector(collect)
+        event_log.close()
+        shutil.rmtree(root)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check pipeline metrics and the /metrics endpoint.")
+    parser.add_argument("--observations", type=int, default=1000000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    ok = run(args)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Photo fan-out check against a local stand-in Bot API.
+
+Sends a "Get photo" result (several person crops, some with faces) to a
+few admins twice: once the way send_photoo used to (encode on the event
+loop, upload every crop to every admin, one emission per person) and once
+through PhotoFanout. Counts uploads and bytes received by the fake API,
+API calls, and how long the event loop was blocked (longest stall and
+total of stalls over 1 ms), and checks every admin
+received every photo with the right caption.
+
+    python benchmarks/check_photo_fanout.py --admins 3 --persons 4
+    python benchmarks/check_photo_fanout.py --transport http   # needs pyTelegramBotAPI
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import cv2
+import numpy as np
+
+from fake_telegram_api import FakeBotAPI, InputMediaPhoto, LocalBotClient, serve
+from person_detection.telegram.broadcast import Broadcaster
+from person_detection.telegram.photos import PhotoFanout, photo_items
+
+
+def make_client(transport, port, api):
+    if transport == "local":
+        return LocalBotClient(api), InputMediaPhoto
+    from telebot import asyncio_helper
+    from telebot.async_telebot import AsyncTeleBot
+    from telebot.types import InputMediaPhoto as TelebotInputMediaPhoto
+    asyncio_helper.API_URL = f"http://127.0.0.1:{port}/bot{{0}}/{{1}}"
+    return AsyncTeleBot("123456:fake-token"), (
+        lambda media, caption: TelebotInputMediaPhoto(media, caption=caption))
+
+
+def make_detections(persons, with_faces, seed):
+    """Noisy person crops (hard to compress, like camera frames) and faces."""
+    rng = np.random.default_rng(seed)
+    detections = []
+    for i in range(persons):
+        person = rng.integers(0, 256, (720, 360, 3), dtype=np.uint8)
+        face = person[40:200, 100:260].copy() if i < with_faces else None
+        detections.append((person, face))
+    return detections
+
+
+async def legacy_send(bot, admins, detections):
+    """send_photoo as it was, called once per emitted detection."""
+    for person, face in detections:
+        _, buffer = cv2.imencode('.jpg', person)
+        photo = buffer.tobytes()
+        for admin in admins:
+            await bot.send_photo(admin, photo, caption="Person detected!")
+        if face is not None:
+            _, buffer = cv2.imencode('.jpg', face)
+            face_bytes = buffer.tobytes()
+            for admin in admins:
+                await bot.send_photo(admin, face_bytes, caption="Face detected!")
+        await bot.send_message(admins[0], "Photo sent to admin.")
+
+
+async def fanout_send(bot, admins, detections, media_factory):
+    """TelegramBot.send_photos."""
+    fanout = PhotoFanout(Broadcaster(), media_factory=media_factory)
+    results = await fanout.send(bot, admins, photo_items(detections, "persons"))
+    await bot.send_message(admins[0], "Photo sent to admin.")
+    return results
+
+
+async def heartbeat(stop, lags, period=0.002):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(period)
+        lags.append(time.perf_counter() - start - period)
+
+
+async def measure(api, send):
+    api.calls.clear()
+    api.messages.clear()
+    api.uploads = api.upload_bytes = 0
+    stop, lags = asyncio.Event(), []
+    beat = asyncio.ensure_future(heartbeat(stop, lags))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await send()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    return {
+        "elapsed": elapsed,
+        "stall_ms": max(lags, default=0.0) * 1000,
+        "blocked_ms": sum(lag for lag in lags if lag > 0.001) * 1000,
+        "uploads": api.uploads,
+        "upload_mb": api.upload_bytes / (1024 * 1024),
+        "calls": sum(api.calls.values()),
+        "media_groups": api.calls["sendMediaGroup"],
+    }
+
+
+def received(api, admins, expected_captions):
+    """Whether every admin got every photo with its caption."""
+    for admin in admins:
+        captions = [m.get("caption") for m in api.messages.get(admin, []) if "photo" in m]
+        if sorted(captions) != sorted(expected_captions):
+            return False
+    return True
+
+
+async def run(args):
+    admins = list(range(1, args.admins + 1))
+    api = FakeBotAPI(admins, latency=args.latency)
+    server, port = await serve(api)
+    bot, media_factory = make_client(args.transport, port, api)
+    detections = make_detections(args.persons, args.faces, args.seed)
+    expected = [caption for _, caption in photo_items(detections, "persons")]
+    try:
+        legacy = await measure(api, lambda: legacy_send(bot, admins, detections))
+        legacy_ok = received(api, admins, expected)
+        fanout = await measure(api, lambda: fanout_send(bot, admins, detections, media_factory))
+        fanout_ok = received(api, admins, expected)
+    finally:
+        if args.transport == "http":
+            await bot.close_session()
+        server.close()
+        await server.wait_closed()
+
+    print(f"{args.admins} admins, {args.persons} persons ({args.faces} with faces) -> "
+          f"{len(expected)} photos each, {args.latency * 1000:.0f} ms latency, transport {args.transport}")
+    print(f"{'path':<8} {'uploads':>8} {'MiB up':>8} {'API calls':>10} {'media groups':>13} "
+          f"{'max stall ms':>13} {'blocked ms':>11} {'seconds':>8} {'delivered':>10}")
+    for name, r, ok in (("legacy", legacy, legacy_ok), ("fanout", fanout, fanout_ok)):
+        print(f"{name:<8} {r['uploads']:>8} {r['upload_mb']:>8.2f} {r['calls']:>10} "
+              f"{r['media_groups']:>13} {r['stall_ms']:>13.1f} {r['blocked_ms']:>11.1f} "
+              f"{r['elapsed']:>8.2f} {str(ok):>10}")
+    return fanout_ok and fanout["uploads"] == len(expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check photo fan-out against a stand-in Bot API.")
+    parser.add_argument("--admins", type=int, default=3)
+    parser.add_argument("--persons", type=int, default=4)
+    parser.add_argument("--faces", type=int, default=2, help="persons with a face crop")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per API call")
+    parser.add_argument("--transport", choices=["auto", "http", "local"], default="auto")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.transport == "auto":
+        try:
+            import telebot  # noqa: F401
+            args.transport = "http"
+        except ImportError:
+            print("pyTelegramBotAPI not installed; calling the stand-in API in-process.")
+            args.transport = "local"
+    return 0 if asyncio.run(run(args)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
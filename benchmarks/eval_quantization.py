@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Accuracy/speed report for INT8 model variants.
+
+Builds the fp32 ONNX model and its dynamic and static INT8 variants for the
+person model (and the face model when present), runs each on a fixed set of
+frames and reports latency, resident memory added by loading and running the
+model, and detection agreement with fp32.
+
+    python benchmarks/eval_quantization.py --frames eval_frames/ --calibration Model/calibration
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from person_detection.core.config import Config
+from person_detection.core.models import ModelManager
+from person_detection.core.onnx_backend import OnnxYoloModel
+from person_detection.detection.tracker import greedy_match, iou_matrix
+
+
+def rss_mb():
+    """Current resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_frames(directory, count):
+    names = sorted(n for n in os.listdir(directory) if n.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp')))
+    frames = [cv2.imread(os.path.join(directory, n)) for n in names[:count]]
+    return [f for f in frames if f is not None]
+
+
+def evaluate(path, frames, conf, classes):
+    """Run one model variant; return outputs, latency percentiles and memory."""
+    before = rss_mb()
+    model = OnnxYoloModel(path)
+    model.predict(frames[0], classes=classes, conf=conf)  # warm up
+    times, outputs = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        result = model.predict(frame, classes=classes, conf=conf)[0]
+        times.append(time.perf_counter() - start)
+        outputs.append(result.boxes.xyxy.numpy().astype(float))
+    times = np.asarray(times) * 1000
+    return {
+        "outputs": outputs,
+        "p50": float(np.percentile(times, 50)),
+        "p95": float(np.percentile(times, 95)),
+        "memory_mb": rss_mb() - before,
+        "size_mb": os.path.getsize(path) / (1024 * 1024),
+        "model": model,
+    }
+
+
+def agreement(reference, candidate, min_iou):
+    """Fraction of boxes matched between two runs, and frames with equal counts."""
+    matched = total = same_count = 0
+    for ref, cand in zip(reference, candidate):
+        total += max(len(ref), len(cand))
+        rows, _ = greedy_match(iou_matrix(ref, cand), min_iou)
+        matched += len(rows)
+        same_count += len(ref) == len(cand)
+    return (matched / total if total else 1.0), same_count / max(1, len(reference))
+
+
+def report(label, weights, frames, args, classes):
+    variants = {"fp32": ModelManager.export_onnx(weights)}
+    variants["int8-dynamic"] = ModelManager.quantize_int8(weights, "dynamic")
+    if args.calibration:
+        variants["int8-static"] = ModelManager.quantize_int8(weights, "static", args.calibration)
+
+    print(f"\n{label}: {weights}")
+    print(f"{'variant':<14} {'size MB':>8} {'p50 ms':>8} {'p95 ms':>8} {'+RSS MB':>8} "
+          f"{'box agree':>10} {'count agree':>12}")
+    results = {}
+    for name, path in variants.items():
+        results[name] = evaluate(path, frames, args.conf, classes)
+        boxes, counts = agreement(results["fp32"]["outputs"], results[name]["outputs"], args.min_iou)
+        r = results[name]
+        print(f"{name:<14} {r['size_mb']:>8.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['memory_mb']:>8.1f} "
+              f"{boxes:>10.1%} {counts:>12.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report INT8 accuracy/speed against fp32.")
+    parser.add_argument("--frames", required=True, help="fixed evaluation frames")
+    parser.add_argument("--calibration", default=None,
+                        help="calibration frames for static INT8 (default: skip static)")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--conf", type=float, default=Config.DEFAULT_ACCURACY)
+    parser.add_argument("--min-iou", type=float, default=0.5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames, args.count)
+    if not frames:
+        print(f"No frames found in {args.frames}", file=sys.stderr)
+        return 1
+
+    report("Person model", Config.MODEL_PATH, frames, args, [Config.PERSON_CLASS_ID])
+    if os.path.exists(Config.FACE_MODEL_PATH):
+        report("Face model", Config.FACE_MODEL_PATH, frames, args, None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
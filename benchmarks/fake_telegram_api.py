@@ -0,0 +1,283 @@
+"""
+Local stand-in for the Telegram Bot API, for the bot checks.
+
+``FakeBotAPI`` keeps the state (known chats, delivered messages, call
+counts) and applies Telegram-like behaviour: per-request latency, a global
+sending rate limit answered with 429 ``retry_after``, optional random
+throttling and users who blocked the bot (403). ``serve`` exposes it over
+HTTP at ``/bot<token>/<method>`` so ``AsyncTeleBot`` can be pointed at it::
+
+    telebot.asyncio_helper.API_URL = f"http://127.0.0.1:{port}/bot{{0}}/{{1}}"
+
+``LocalBotClient`` calls the same object in-process with ``AsyncTeleBot``
+method names, for machines without pyTelegramBotAPI installed.
+
+Photos count as uploads only when file bytes arrive; sending a known
+``file_id`` is answered from the stored upload.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict, deque
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from urllib.parse import parse_qsl, urlsplit
+
+SEND_METHODS = {"sendMessage", "sendPhoto", "sendMediaGroup"}
+
+
+class FakeBotAPI:
+    """Bot API state and behaviour, independent of the transport."""
+
+    def __init__(self, users=(), latency=0.0, rate_limit=None, throttle=0.0,
+                 blocked=(), seed=0):
+        self.users = {int(u): {"id": int(u), "type": "private", "first_name": f"user{u}",
+                               "username": f"user{u}"} for u in users}
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.throttle = throttle
+        self.blocked = {int(u) for u in blocked}
+        self.random = random.Random(seed)
+        self.calls = Counter()
+        self.messages = defaultdict(list)
+        self.throttled = 0
+        self.peak_rate = 0
+        self.uploads = 0
+        self.upload_bytes = 0
+        self.files = {}
+        self._sends = deque()
+        self._message_id = 0
+
+    def add_chat(self, chat_id):
+        self.users.setdefault(int(chat_id), {"id": int(chat_id), "type": "private",
+                                             "first_name": f"user{chat_id}",
+                                             "username": f"user{chat_id}"})
+
+    @staticmethod
+    def error(code, description, **parameters):
+        payload = {"ok": False, "error_code": code, "description": description}
+        if parameters:
+            payload["parameters"] = parameters
+        return code, payload
+
+    def _rate_check(self):
+        """Sliding one-second window over sending methods."""
+        now = time.monotonic()
+        while self._sends and now - self._sends[0] > 1.0:
+            self._sends.popleft()
+        if self.rate_limit is not None and len(self._sends) >= self.rate_limit:
+            return False
+        if self.throttle and self.random.random() < self.throttle:
+            return False
+        self._sends.append(now)
+        self.peak_rate = max(self.peak_rate, len(self._sends))
+        return True
+
+    def _message(self, chat_id, **content):
+        self._message_id += 1
+        message = {"message_id": self._message_id, "date": int(time.time()),
+                   "chat": {"id": chat_id, "type": "private"}, **content}
+        self.messages[chat_id].append(message)
+        return message
+
+    async def call(self, method, params, files=None):
+        """Handle one API call; returns ``(http_status, json_payload)``."""
+        files = files or {}
+        self.calls[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        chat_id = params.get("chat_id")
+        if chat_id is not None:
+            chat_id = int(chat_id)
+            if chat_id not in self.users:
+                return self.error(400, "Bad Request: chat not found")
+            if chat_id in self.blocked:
+                return self.error(403, "Forbidden: bot was blocked by the user")
+
+        if method in SEND_METHODS and not self._rate_check():
+            self.throttled += 1
+            return self.error(429, "Too Many Requests: retry after 1", retry_after=1)
+
+        if method == "getChat":
+            return 200, {"ok": True, "result": self.users[chat_id]}
+        if method == "sendMessage":
+            return 200, {"ok": True, "result": self._message(chat_id, text=params.get("text", ""))}
+        if method == "sendPhoto":
+            photo = self._photo(params.get("photo"), files.get("photo"))
+            if photo is None:
+                return self.error(400, "Bad Request: wrong file identifier/HTTP URL specified")
+            return 200, {"ok": True, "result": self._message(
+                chat_id, photo=[photo], caption=params.get("caption"))}
+        if method == "sendMediaGroup":
+            media = params.get("media")
+            media = json.loads(media) if isinstance(media, str) else media
+            if not 2 <= len(media) <= 10:
+                return self.error(400, "Bad Request: wrong number of media items")
+            photos = []
+            for item in media:
+                ref = item["media"]
+                data = files.get(ref[len("attach://"):]) if ref.startswith("attach://") else None
+                photo = self._photo(ref, data)
+                if photo is None:
+                    return self.error(400, "Bad Request: wrong file identifier/HTTP URL specified")
+                photos.append((photo, item.get("caption")))
+            return 200, {"ok": True, "result": [
+                self._message(chat_id, photo=[photo], caption=caption) for photo, caption in photos
+            ]}
+        return self.error(404, "Not Found: method not found")
+
+    def _photo(self, file_id, data):
+        """Store an upload, or look up a ``file_id``; returns a PhotoSize."""
+        if data is not None:
+            self.uploads += 1
+            self.upload_bytes += len(data)
+            file_id = f"file{len(self.files)}"
+            self.files[file_id] = data
+        elif file_id not in self.files:
+            return None
+        return {"file_id": file_id, "file_unique_id": file_id, "width": 0, "height": 0,
+                "file_size": len(self.files[file_id])}
+
+
+class FakeApiError(Exception):
+    """Raised by ``LocalBotClient``; has the fields of telebot's ApiTelegramException."""
+
+    def __init__(self, status, payload):
+        super().__init__(f"Error code: {status}. Description: {payload.get('description')}")
+        self.error_code = payload.get("error_code", status)
+        self.result_json = payload
+
+
+class InputMediaPhoto:
+    """Stand-in for ``telebot.types.InputMediaPhoto`` used with LocalBotClient."""
+
+    def __init__(self, media, caption=None):
+        self.media = media
+        self.caption = caption
+
+
+class Namespace:
+    """Attribute access over a JSON object, like telebot's result types."""
+
+    def __init__(self, data):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                value = Namespace(value)
+            elif isinstance(value, list):
+                value = [Namespace(item) if isinstance(item, dict) else item for item in value]
+            setattr(self, key, value)
+
+
+class LocalBotClient:
+    """In-process client with the ``AsyncTeleBot`` methods the bot uses."""
+
+    def __init__(self, api):
+        self.api = api
+
+    async def _call(self, method, params, files=None):
+        status, payload = await self.api.call(method, params, files)
+        if not payload.get("ok"):
+            raise FakeApiError(status, payload)
+        result = payload["result"]
+        if isinstance(result, list):
+            return [Namespace(item) for item in result]
+        return Namespace(result)
+
+    async def get_chat(self, chat_id):
+        return await self._call("getChat", {"chat_id": chat_id})
+
+    async def send_message(self, chat_id, text):
+        return await self._call("sendMessage", {"chat_id": chat_id, "text": text})
+
+    async def send_photo(self, chat_id, photo, caption=None):
+        params = {"chat_id": chat_id, "caption": caption}
+        if isinstance(photo, (bytes, bytearray)):
+            return await self._call("sendPhoto", params, {"photo": bytes(photo)})
+        params["photo"] = photo
+        return await self._call("sendPhoto", params)
+
+    async def send_media_group(self, chat_id, media):
+        items, files = [], {}
+        for i, item in enumerate(media):
+            ref = item.media
+            if isinstance(ref, (bytes, bytearray)):
+                files[f"file{i}"] = bytes(ref)
+                ref = f"attach://file{i}"
+            items.append({"type": "photo", "media": ref, "caption": item.caption})
+        return await self._call("sendMediaGroup", {"chat_id": chat_id, "media": items}, files)
+
+
+def parse_body(content_type, body):
+    """Parse an urlencoded, JSON or multipart body into ``(params, files)``."""
+    if not body:
+        return {}, {}
+    if content_type.startswith("application/json"):
+        return json.loads(body), {}
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=default_policy).parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+        )
+        params, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            payload = part.get_payload(decode=True) or b""
+            if part.get_filename() is not None:
+                files[name] = payload
+            else:
+                params[name] = payload.decode()
+        return params, files
+    return dict(parse_qsl(body.decode())), {}
+
+
+async def _read_request(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = b""
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip().split(b";")[0], 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            body += chunk[:-2]
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return target, headers, body
+
+
+async def serve(api, host="127.0.0.1", port=0):
+    """Serve ``api`` over HTTP; returns ``(server, port)``."""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    target, headers, body = await _read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                url = urlsplit(target)
+                method = url.path.rstrip("/").rsplit("/", 1)[-1]
+                params, files = parse_body(headers.get("content-type", ""), body)
+                params.update(parse_qsl(url.query))
+                status, payload = await api.call(method, params, files)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    return server, server.sockets[0].getsockname()[1]
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Load test for the SQLite detection event log.
+
+Runs one producer thread per simulated camera calling
+DetectionEventLog.record at a fixed frame rate (every frame, the worst
+case; pass --changes-only to log count changes only), while a reader thread
+keeps querying. Reports the latency of record calls as seen by the video
+loop, events written and dropped, writer batches, and query times, and
+checks the range queries use the time/camera indexes.
+
+    python benchmarks/load_event_log.py --cameras 4 --fps 30 --seconds 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import sqlite3
+
+import numpy as np
+
+from person_detection.database.handler import DetectionEventLog
+
+
+def camera_producer(log, name, fps, seconds, changes_only, latencies, seed):
+    """Call record at ``fps`` for ``seconds``, timing each call."""
+    rng = random.Random(seed)
+    record = log.record_change if changes_only else log.record
+    period = 1.0 / fps
+    persons = 0
+    start = time.perf_counter()
+    frames = int(fps * seconds)
+    for frame in range(frames):
+        persons = max(0, persons + rng.choice((-1, 0, 0, 0, 1)))
+        detections = [((10 * i, 20, 10 * i + 50, 200), 0.9) for i in range(persons)]
+        t0 = time.perf_counter()
+        record(name, persons, detections)
+        latencies.append(time.perf_counter() - t0)
+        delay = start + (frame + 1) * period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def reader(log, stop, query_times):
+    """Query the last few seconds repeatedly while producers run."""
+    while not stop.is_set():
+        now = time.time()
+        t0 = time.perf_counter()
+        log.events(start=now - 5, end=now, limit=1000)
+        log.aggregate(start=now - 60, bucket_seconds=10)
+        query_times.append(time.perf_counter() - t0)
+        time.sleep(0.1)
+
+
+def uses_index(db_name, sql):
+    conn = sqlite3.connect(db_name)
+    try:
+        plan = " ".join(str(row[-1]) for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+    finally:
+        conn.close()
+    return "USING INDEX" in plan or "USING COVERING INDEX" in plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the detection event log.")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--changes-only", action="store_true",
+                        help="log count changes only, as the video threads do")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "events.db")
+        log = DetectionEventLog(db_name)
+        latencies, query_times = [], []
+        stop = threading.Event()
+        producers = [
+            threading.Thread(target=camera_producer,
+                             args=(log, f"cam{i}", args.fps, args.seconds, args.changes_only,
+                                   latencies, i))
+            for i in range(args.cameras)
+        ]
+        reader_thread = threading.Thread(target=reader, args=(log, stop, query_times))
+
+        start = time.perf_counter()
+        reader_thread.start()
+        for thread in producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        produced = time.perf_counter() - start
+        log.flush()
+        drained = time.perf_counter() - start
+        stop.set()
+        reader_thread.join()
+        log.close()
+
+        stats = log.stats()
+        rows = log._query("SELECT COUNT(*) FROM detection_events", [])[0][0]
+        t0 = time.perf_counter()
+        per_camera = log.aggregate(bucket_seconds=1)
+        aggregate_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        window = log.events(camera="cam0", start=time.time() - args.seconds / 2)
+        range_ms = (time.perf_counter() - t0) * 1000
+
+        lat = np.asarray(latencies) * 1e6
+        print(f"{args.cameras} cameras x {args.fps:g} fps for {args.seconds:g}s "
+              f"({'count changes' if args.changes_only else 'every frame'})")
+        print(f"record() latency: p50 {np.percentile(lat, 50):.1f} us  p99 {np.percentile(lat, 99):.1f} us  "
+              f"max {lat.max():.1f} us")
+        print(f"Producers finished in {produced:.2f}s, all events committed after {drained:.2f}s")
+        print(f"Events: {stats['recorded']} recorded, {rows} in database, {stats['dropped']} dropped, "
+              f"{stats['batches']} batches")
+        if query_times:
+            q = np.asarray(query_times) * 1000
+            print(f"Concurrent queries: {len(q)}  p50 {np.percentile(q, 50):.2f} ms  p99 {np.percentile(q, 99):.2f} ms")
+        print(f"Full aggregate ({len(per_camera)} buckets): {aggregate_ms:.2f} ms; "
+              f"cam0 range ({len(window)} events): {range_ms:.2f} ms")
+        indexed = (uses_index(db_name, "SELECT * FROM detection_events WHERE ts >= 0 AND ts < 1")
+                   and uses_index(db_name, "SELECT * FROM detection_events WHERE camera = 'cam0' AND ts >= 0"))
+        print(f"Range queries use indexes: {indexed}")
+
+    ok = rows == stats["recorded"] and stats["dropped"] == 0 and indexed
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Replay check for the motion gate.
+
+Replays a synthetic corridor where people walk in, stand still and leave,
+once with every frame inferred and once behind the motion gate. Reports the
+fraction of frames the gate skipped and fails if any entry seen by the
+ungated run is not picked up by the gated run within a few frames.
+
+    python benchmarks/replay_motion_gate.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from person_detection.detection.detector import PersonDetector
+from person_detection.detection.motion import MotionGate
+from stub_model import StubBoxes, StubModelManager, StubResult
+
+WIDTH, HEIGHT = 640, 480
+PERSON_W, PERSON_H = 60, 160
+MIN_VISIBLE_AREA = 40 * 120
+
+
+def person_positions(frames):
+    """Script of x positions per frame for each walker (None when absent)."""
+    script = []
+    for i in range(frames):
+        walkers = []
+        # Walker 1 crosses left to right, pausing in the middle.
+        if 100 <= i < 260:
+            x = -PERSON_W + (i - 100) * 8
+            walkers.append(min(x, 300) if i < 200 else 300 + (i - 200) * 8)
+        elif 260 <= i < 400:
+            walkers.append(300)
+        # Walker 2 enters from the right and leaves again.
+        if 500 <= i < 620:
+            walkers.append(WIDTH - (i - 500) * 6)
+        script.append(walkers)
+    return script
+
+
+def render(background, walkers):
+    frame = background.copy()
+    for x in walkers:
+        x1, x2 = max(0, x), min(WIDTH, x + PERSON_W)
+        if x2 > x1:
+            frame[200:200 + PERSON_H, x1:x2] = 40
+    return frame
+
+
+class CorridorModel:
+    """Stub model that 'detects' the dark walkers by comparing to the background."""
+
+    def __init__(self, background):
+        self.background = background
+
+    def predict(self, source, **kwargs):
+        frames = source if isinstance(source, list) else [source]
+        results = []
+        for frame in frames:
+            mask = np.abs(frame[..., 0].astype(int) - self.background[..., 0].astype(int)) > 60
+            cols = np.flatnonzero(mask.any(axis=0))
+            boxes = []
+            if cols.size:
+                # Split into separate walkers where columns are not contiguous.
+                for run in np.split(cols, np.flatnonzero(np.diff(cols) > 1) + 1):
+                    rows = np.flatnonzero(mask[:, run].any(axis=1))
+                    if (run[-1] - run[0] + 1) * rows.size >= MIN_VISIBLE_AREA:
+                        boxes.append([run[0], rows[0], run[-1] + 1, rows[-1] + 1])
+            xyxy = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+            conf = np.full(len(xyxy), 0.9, dtype=np.float32)
+            cls = np.zeros(len(xyxy), dtype=np.float32)
+            results.append(StubResult(StubBoxes(xyxy, conf, cls), frame.shape[:2]))
+        return results
+
+
+def run(frames, background, gated):
+    detector = PersonDetector()
+    detector._model_manager = StubModelManager(CorridorModel(background))
+    detector.motion_gate = MotionGate() if gated else None
+    counts = [detector.detect_and_count_persons(frame.copy())[1] for frame in frames]
+    return counts, detector.motion_gate
+
+
+def entries(counts):
+    return [i for i in range(1, len(counts)) if counts[i] > counts[i - 1]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay check for the motion gate.")
+    parser.add_argument("--frames", type=int, default=900)
+    parser.add_argument("--max-delay", type=int, default=3,
+                        help="frames the gated run may lag an entry")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    background = np.full((HEIGHT, WIDTH, 3), 180, dtype=np.uint8)
+    frames = []
+    for walkers in person_positions(args.frames):
+        frame = render(background, walkers)
+        noise = rng.integers(-3, 4, frame.shape)
+        frames.append(np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8))
+
+    reference, _ = run(frames, background, gated=False)
+    gated, gate = run(frames, background, gated=True)
+
+    missed = []
+    for i in entries(reference):
+        window = gated[i:i + args.max_delay + 1]
+        if max(window) < reference[i]:
+            missed.append(i)
+
+    agreement = np.mean(np.asarray(reference) == np.asarray(gated))
+    print(f"Frames: {len(frames)}  skipped: {gate.skipped} ({gate.skip_fraction:.1%})")
+    print(f"Entries: {len(entries(reference))}  missed: {len(missed)}  "
+          f"per-frame count agreement: {agreement:.1%}")
+    if missed:
+        print(f"Missed entries at frames: {missed}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Stand-in for an ultralytics YOLO model, for benchmarks that should not
+depend on model weights or torch.
+
+``StubModel.predict`` returns results shaped like ultralytics ``Results``:
+``result.boxes`` iterates per-box objects whose ``cls``, ``conf`` and
+``xyxy`` behave like tensors (``.cpu().numpy()``).
+"""
+
+import numpy as np
+
+
+class StubTensor:
+    """Minimal tensor look-alike backed by a NumPy array."""
+
+    def __init__(self, array):
+        self._array = np.asarray(array)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._array
+
+    def __getitem__(self, item):
+        return StubTensor(self._array[item])
+
+    def __len__(self):
+        return len(self._array)
+
+    def __int__(self):
+        return int(self._array)
+
+    def __float__(self):
+        return float(self._array)
+
+
+class StubBoxes:
+    """Boxes container with the iteration behaviour of ultralytics Boxes."""
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = StubTensor(xyxy)
+        self.conf = StubTensor(conf)
+        self.cls = StubTensor(cls)
+
+    def __len__(self):
+        return len(self.xyxy)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield StubBoxes(self.xyxy.numpy()[i:i + 1], self.conf.numpy()[i:i + 1],
+                            self.cls.numpy()[i:i + 1])
+
+
+class StubResult:
+    def __init__(self, boxes, orig_shape):
+        self.boxes = boxes
+        self.orig_shape = orig_shape
+
+
+def random_boxes(count, width, height, seed=0, min_size=24):
+    """Build ``count`` random person boxes inside a ``width`` x ``height`` frame."""
+    rng = np.random.default_rng(seed)
+    w = rng.integers(min_size, max(min_size + 1, width // 3), count)
+    h = rng.integers(min_size * 2, max(min_size * 2 + 1, height // 2), count)
+    x1 = rng.integers(0, np.maximum(1, width - w))
+    y1 = rng.integers(0, np.maximum(1, height - h))
+    xyxy = np.stack([x1, y1, x1 + w, y1 + h], axis=1).astype(np.float32)
+    conf = rng.uniform(0.5, 0.99, count).astype(np.float32)
+    return xyxy, conf
+
+
+class StubModel:
+    """Model stand-in that returns a fixed number of person boxes per frame."""
+
+    def __init__(self, persons=0, seed=0):
+        self.persons = persons
+        self.seed = seed
+
+    def predict(self, source, **kwargs):
+        frames = source if isinstance(source, list) else [source]
+        results = []
+        for frame in frames:
+            height, width = frame.shape[:2]
+            xyxy, conf = random_boxes(self.persons, width, height, self.seed)
+            cls = np.zeros(self.persons, dtype=np.float32)
+            results.append(StubResult(StubBoxes(xyxy, conf, cls), (height, width)))
+        return results
+
+
+class StubModelManager:
+    """Drop-in for ``model_manager`` that serves stub models."""
+
+    def __init__(self, person_model, face_model=None):
+        self.person_model = person_model
+        self.face_model = face_model
+
+    def get_person_model(self):
+        return self.person_model
+
+    def get_face_model(self):
+        return self.face_model
+
+    def has_face_model(self):
+        return self.face_model is not None
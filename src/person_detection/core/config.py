@@ -11,21 +11,142 @@ class Config:
     FACE_MODEL_PATH = "Model/face_yolov8n.pt"
     MODEL_URL = 'https://github.com/ultralytics/assets/releases/download/v8.2.0/yolov8n.pt'
     
+    # Inference backend: "torch" (ultralytics), "onnx" (ONNX Runtime on CPU)
+    # or "onnx-int8" (quantized ONNX Runtime model)
+    INFERENCE_BACKEND = os.environ.get("PERSON_DETECTION_BACKEND", "torch")
+    ONNX_OPSET = 17
+    ONNX_THREADS = None  # None uses every CPU core
+    ONNX_MAX_DETECTIONS = 300
+    
+    # INT8 quantization settings
+    QUANT_MODE = "static"  # "static" (calibrated) or "dynamic"
+    QUANT_CALIBRATION_DIR = "Model/calibration"
+    QUANT_CALIBRATION_FRAMES = 100
+    
     # Detection settings
     DEFAULT_ACCURACY = 0.5
     PERSON_CLASS_ID = 0
+    FACE_CONFIDENCE = 0.6
+    FACE_MODEL_STRIDE = 32
+    FACE_MIN_IMGSZ = 64
+    FACE_MAX_IMGSZ = 640
+    
+    # Face cache settings
+    FACE_CACHE_TTL = 30.0
+    FACE_CACHE_MAX_ENTRIES = 256
+    FACE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    FACE_CACHE_GRID = 32
     
     # Camera settings
     DEFAULT_FRAME_WIDTH = 640
     DEFAULT_FRAME_HEIGHT = 480
     DEFAULT_FPS = 30
     
+    # Camera hot-plug settings
+    CAMERA_DEV_DIR = "/dev"
+    CAMERA_SYSFS_DIR = "/sys/class/video4linux"
+    CAMERA_SETTLE_SECONDS = 0.3  # quiet time after a /dev event before rescanning
+    CAMERA_RESCAN_SECONDS = 30.0  # safety rescan while watching /dev
+    CAMERA_POLL_SECONDS = 1.0  # rescan interval when inotify is unavailable
+    
+    # Frame source settings
+    SOURCE_RECONNECT_BACKOFF = 0.5  # first reconnect delay, doubled on each failure
+    SOURCE_RECONNECT_MAX_BACKOFF = 10.0
+    SOURCE_PREFETCH = 8  # frames decoded ahead when replaying every frame
+    STREAM_OPEN_TIMEOUT_MS = 5000
+    STREAM_READ_TIMEOUT_MS = 5000
+    
+    # Clip recording settings
+    CLIPS_ENABLED = False
+    CLIP_DIR = os.path.abspath(os.path.expanduser(os.environ.get(
+        "PERSON_DETECTION_CLIP_DIR", os.path.join("~", "Videos", "person_detection"))))
+    CLIP_PRE_ROLL_SECONDS = 5.0
+    CLIP_POST_ROLL_SECONDS = 5.0  # keep recording this long after the last person
+    CLIP_MAX_SECONDS = 60.0
+    CLIP_FPS = 10  # frames kept per second, in the pre-roll and in clips
+    CLIP_STORAGE = "jpeg"  # pre-roll as "jpeg" (compact) or "raw" (one fixed array)
+    CLIP_JPEG_QUALITY = 80
+    CLIP_QUEUE_SIZE = 16  # frames waiting for the recorder before new ones are dropped
+    CLIP_CODEC = "mp4v"
+    
+    # Pipeline settings
+    FRAME_BUFFER_SIZE = 1
+    FRAME_WAIT_TIMEOUT = 0.5
+    MULTI_CAMERA_IDLE_SLEEP = 0.005
+    # Free frame buffers kept per resolution; capture, inference, snapshot
+    # and display each hold at most one at a time.
+    FRAME_POOL_SIZE = 6
+    # Unannotated snapshots kept for on-demand person crops
+    SNAPSHOT_POOL_SIZE = 3
+    
+    # Motion gate settings
+    MOTION_GATE_ENABLED = False
+    MOTION_THRESHOLD = 0.01
+    MOTION_PIXEL_DELTA = 25
+    MOTION_DOWNSCALE_WIDTH = 160
+    MOTION_REFRESH_SECONDS = 5.0
+    
+    # Adaptive inference stride settings
+    ADAPTIVE_STRIDE_ENABLED = False
+    INFERENCE_BUDGET_MS = 33
+    MAX_INFERENCE_STRIDE = 10
+    MIN_CPU_HEADROOM = 0.15
+    LATENCY_SMOOTHING = 0.2
+    
+    # Tracking settings
+    TRACKING_ENABLED = False
+    TRACK_IOU_THRESHOLD = 0.3
+    TRACK_MAX_AGE = 5
+    TRACK_MIN_HITS = 2
+    
     # UI settings
     WINDOW_WIDTH = 1074
     WINDOW_HEIGHT = 908
     
+    # Import-time budgets (ms) for the entry points, checked by
+    # ``python -m person_detection.profiling --check``
+    IMPORT_BUDGETS_MS = {
+        "person_detection.cli": 150,
+        "person_detection.main": 600,
+    }
+    
+    # Telegram broadcast settings (Telegram allows about 30 messages/second)
+    BROADCAST_RATE = 25  # messages per second across all chats
+    BROADCAST_BURST = 5  # rate + burst must stay under the limit in any one second
+    BROADCAST_CONCURRENCY = 16
+    BROADCAST_MAX_RETRIES = 5
+    BROADCAST_BACKOFF = 1.0  # seconds, doubled on each retry
+    PHOTO_JPEG_QUALITY = 95
+    
+    # Person alert settings
+    # Off unless opted in: alerts push camera snapshots to every bot admin.
+    ALERTS_ENABLED = os.environ.get("PERSON_DETECTION_ALERTS", "0") == "1"
+    ALERT_MIN_PERSONS = 1
+    ALERT_ENTER_FRAMES = 3  # consecutive frames with persons before alerting
+    ALERT_CLEAR_SECONDS = 10.0  # seconds without persons before a camera re-arms
+    ALERT_COOLDOWN = 60.0  # minimum seconds between alerts on one camera
+    ALERT_QUEUE_SIZE = 16  # cameras with an alert waiting to be sent
+    ALERT_COALESCE_SECONDS = 2.0  # how long a burst may grow before it is sent
+    
     # Database settings
     DATABASE_NAME = "person_dt.db"
+    DB_BUSY_TIMEOUT = 30.0  # seconds a writer waits for the database lock
+    DB_EXECUTOR_WORKERS = 4  # threads behind the bot's async database calls
+
+    # Detection event log settings
+    EVENT_LOG_ENABLED = True
+    EVENT_LOG_DATABASE = "detection_events.db"  # kept apart from the tracked DATABASE_NAME
+    EVENT_LOG_BATCH_SIZE = 500
+    EVENT_LOG_FLUSH_INTERVAL = 1.0  # seconds between writer commits
+    EVENT_LOG_QUEUE_SIZE = 20000  # events buffered before new ones are dropped
+    
+    # Metrics settings
+    METRICS_ENABLED = False  # serve Prometheus text metrics at /metrics
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = 9464
+    # Histogram bucket upper bounds in seconds
+    METRICS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                       0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
     
     @classmethod
     def get_model_dir(cls):
@@ -0,0 +1,25 @@
+"""Deferred imports for heavy optional dependencies."""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """Return a module that is only executed on first attribute access.
+
+    Used for ``cv2``, ``numpy`` and similar dependencies so that importing
+    a package module does not pay for them until they are actually used.
+    If the module is already imported, or cannot be found, this behaves
+    like a plain import.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        return importlib.import_module(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,321 @@
+"""Pipeline metrics: low-overhead latency histograms and a Prometheus text endpoint.
+
+Stages record into fixed-bucket histograms: an observation is a bisect and
+two list increments in a per-thread shard, with no lock and no allocation.
+Counters and queue depths that components already keep in their
+``stats()`` are read by collectors only when the endpoint is scraped, so
+they add nothing to the video loop.
+``render`` formats everything in the Prometheus text format, and
+``MetricsServer`` serves it on a local port::
+
+    curl -s http://127.0.0.1:9464/metrics
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from .config import Config
+
+STAGES = ("capture", "motion", "inference", "boxes", "annotate", "mosaic", "convert", "emit", "total")
+
+
+class Histogram:
+    """One histogram series: counts per bucket, plus the sum of observed values.
+
+    ``bounds`` are the inclusive bucket upper bounds; values above the last
+    one land in the implicit ``+Inf`` bucket. Each observing thread gets
+    its own shard of counters, so ``observe`` takes no lock and threads
+    never contend; ``snapshot`` adds the shards up.
+    """
+
+    __slots__ = ("bounds", "_local", "_shards", "_lock")
+
+    def __init__(self, bounds=Config.METRICS_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _new_shard(self):
+        # Bucket counts, then the sum; kept after its thread exits.
+        shard = [0] * (len(self.bounds) + 1) + [0.0]
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def observe(self, value):
+        """Add one observation."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[bisect_left(self.bounds, value)] += 1
+        shard[-1] += value
+
+    def observe_since(self, start):
+        """Observe the seconds elapsed since ``start``, a ``time.perf_counter()`` value."""
+        elapsed = time.perf_counter() - start
+        self.observe(elapsed)
+        return elapsed
+
+    def snapshot(self):
+        """Get ``(counts, sum)``: per-bucket counts (the last is ``+Inf``) and the total."""
+        with self._lock:
+            shards = list(self._shards)
+        counts = [0] * (len(self.bounds) + 1)
+        total = 0.0
+        for shard in shards:
+            values = list(shard)
+            for i, count in enumerate(values[:-1]):
+                counts[i] += count
+            total += values[-1]
+        return counts, total
+
+    @property
+    def count(self):
+        return sum(self.snapshot()[0])
+
+    def quantile(self, q):
+        """Estimate the ``q`` quantile, interpolating inside its bucket.
+
+        Returns None before the first observation; values in the ``+Inf``
+        bucket are reported as the largest finite bound.
+        """
+        counts, _ = self.snapshot()
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+    def summary(self):
+        """Count and estimated p50/p99 in milliseconds, for logs and ``pipeline_stats``."""
+        p50, p99 = self.quantile(0.5), self.quantile(0.99)
+        return {
+            "count": self.count,
+            "p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 3) if p99 is not None else None,
+        }
+
+
+class HistogramFamily:
+    """A named histogram with one ``Histogram`` per combination of label values."""
+
+    def __init__(self, name, documentation, labelnames=(), bounds=Config.METRICS_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.bounds = tuple(bounds)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Get the series for ``values`` (in ``labelnames`` order), creating it once.
+
+        Look the series up once and keep it; observing on the returned
+        ``Histogram`` skips the label lookup on every frame.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple(str(v) for v in values)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, Histogram(self.bounds))
+        return series
+
+    def series(self):
+        """``(label_values, Histogram)`` pairs."""
+        with self._lock:
+            return list(self._series.items())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Histograms recorded by the pipeline and collectors read at scrape time.
+
+    A collector is a callable returning ``(name, type, help, labels, value)``
+    tuples, ``type`` being "counter" or "gauge" and ``labels`` a dict. One
+    that raises is reported and skipped, so a scrape never fails because a
+    component is shutting down.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name, documentation, labelnames=(), bounds=Config.METRICS_BUCKETS):
+        """Get the histogram family ``name``, creating it on first use."""
+        with self._lock:
+            family = self._histograms.get(name)
+            if family is None:
+                family = self._histograms[name] = HistogramFamily(name, documentation, labelnames, bounds)
+            return family
+
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            families = list(self._histograms.values())
+            collectors = list(self._collectors)
+        lines = []
+        for family in families:
+            series = family.series()
+            if not series:
+                continue
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} histogram")
+            for values, histogram in series:
+                counts, total = histogram.snapshot()
+                cumulative = 0
+                for bound, count in zip(family.bounds + (float("inf"),), counts):
+                    cumulative += count
+                    labels = _labels(family.labelnames, values, ("le", _number(float(bound))))
+                    lines.append(f"{family.name}_bucket{labels} {cumulative}")
+                labels = _labels(family.labelnames, values)
+                lines.append(f"{family.name}_sum{labels} {_number(total)}")
+                lines.append(f"{family.name}_count{labels} {cumulative}")
+
+        samples = {}
+        for collector in collectors:
+            try:
+                collected = list(collector())
+            except Exception as e:
+                print(f"Metrics collector {collector!r} failed: {e}")
+                continue
+            for name, kind, documentation, labels, value in collected:
+                samples.setdefault(name, (kind, documentation, []))[2].append((labels, value))
+        for name, (kind, documentation, values) in samples.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in values:
+                lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry shared by the pipeline, the bot and the database writer
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "person_detection_stage_seconds",
+    "Time spent in each stage of the frame pipeline.",
+    ("camera", "stage"),
+)
+
+
+def stage_timers(camera, stages=STAGES):
+    """Per-stage histograms for one camera, keyed by stage name."""
+    return {stage: STAGE_SECONDS.labels(camera, stage) for stage in stages}
+
+
+def stage_summary(timers):
+    """Count and p50/p99 of every stage that has been observed."""
+    return {stage: histogram.summary() for stage, histogram in timers.items() if histogram.count}
+
+
+# ``(name, type, help)`` of the metrics collectors report
+QUEUE_DEPTH = ("person_detection_queue_depth", "gauge", "Items waiting in a pipeline queue.")
+DROPPED = ("person_detection_dropped_total", "counter",
+           "Items dropped because the next stage was busy or its queue was full.")
+PROCESSED = ("person_detection_frames_total", "counter", "Frames that reached a pipeline stage.")
+RECONNECTS = ("person_detection_source_reconnects_total", "counter",
+              "Reconnect attempts of a frame source.")
+
+
+def sample(metric, value, **labels):
+    """A collector sample of ``metric``, one of the tuples above."""
+    name, kind, documentation = metric
+    return name, kind, documentation, labels, value
+
+
+class MetricsServer:
+    """Serves ``registry.render()`` at ``/metrics`` from a background thread.
+
+    Binds to ``Config.METRICS_HOST`` (localhost by default) so metrics are
+    only reachable from the machine itself or through a tunnel; port 0
+    picks a free port, available as ``port`` after ``start``.
+    """
+
+    def __init__(self, registry=registry, host=Config.METRICS_HOST, port=Config.METRICS_PORT):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self._httpd = None
+        self._thread = None
+
+    def start(self):
+        """Start serving; returns the bound port."""
+        if self._httpd is not None:
+            return self.port
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = server.registry.render().encode()
+                server.scrapes += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        print(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(2)
+        self._httpd = self._thread = None
@@ -1,11 +1,18 @@
 """Model management for YOLO models."""
 
 import os
+import threading
 import urllib.request
-from ultralytics import YOLO
+import numpy as np
 from .config import Config
 
 
+def _load_yolo(weights_path):
+    """Load ultralytics weights; imported here so the ONNX backends never load torch."""
+    from ultralytics import YOLO
+    return YOLO(weights_path)
+
+
 class ModelManager:
     """Manages YOLO model downloading and initialization."""
     
@@ -13,16 +20,43 @@ class ModelManager:
         self.person_model = None
         self.face_model = None
         self._initialized = False
+        self._warmed_up = False
+        self._lock = threading.RLock()
     
     def initialize(self):
-        """Initialize models by downloading if needed and loading them."""
-        if self._initialized:
-            return
-            
-        Config.ensure_model_dir_exists()
-        self._download_models()
-        self._load_models()
-        self._initialized = True
+        """Initialize models by downloading if needed and loading them.
+        
+        Safe to call from several threads; only the first call loads.
+        """
+        with self._lock:
+            if self._initialized:
+                return
+                
+            Config.ensure_model_dir_exists()
+            self._download_models()
+            self._load_models()
+            self._initialized = True
+    
+    def warmup(self):
+        """Run one inference per model on a dummy frame.
+        
+        The first prediction pays for lazy backend initialization; doing it
+        up front keeps that cost off the first camera frame.
+        """
+        self.initialize()
+        with self._lock:
+            if self._warmed_up:
+                return
+            frame = np.zeros((Config.DEFAULT_FRAME_HEIGHT, Config.DEFAULT_FRAME_WIDTH, 3), dtype=np.uint8)
+            self.person_model.predict(frame, classes=[Config.PERSON_CLASS_ID], verbose=False)
+            if self.face_model is not None:
+                self.face_model.predict(frame, verbose=False)
+            self._warmed_up = True
+    
+    @property
+    def is_ready(self):
+        """Whether models are loaded and warmed up."""
+        return self._initialized and self._warmed_up
     
     def _download_models(self):
         """Download models if they don't exist."""
@@ -42,15 +76,62 @@ class ModelManager:
             print("Face model already exists.")
     
     def _load_models(self):
-        """Load the models into memory."""
-        self.person_model = YOLO(Config.MODEL_PATH)
+        """Load the models into memory using the configured backend."""
+        self.person_model = self._load_model(Config.MODEL_PATH)
         
         if os.path.exists(Config.FACE_MODEL_PATH):
-            self.face_model = YOLO(Config.FACE_MODEL_PATH)
+            self.face_model = self._load_model(Config.FACE_MODEL_PATH)
         else:
             self.face_model = None
             print("Face model not available.")
     
+    def _load_model(self, weights_path):
+        """Load one model with the backend selected in ``Config.INFERENCE_BACKEND``."""
+        if Config.INFERENCE_BACKEND == "onnx":
+            from .onnx_backend import OnnxYoloModel
+            return OnnxYoloModel(self.export_onnx(weights_path))
+        if Config.INFERENCE_BACKEND == "onnx-int8":
+            from .onnx_backend import OnnxYoloModel
+            try:
+                return OnnxYoloModel(self.quantize_int8(weights_path))
+            except (FileNotFoundError, ImportError) as e:
+                print(f"INT8 model unavailable ({e}), using fp32 ONNX.")
+                return OnnxYoloModel(self.export_onnx(weights_path))
+        if Config.INFERENCE_BACKEND != "torch":
+            raise ValueError(f"Unknown inference backend: {Config.INFERENCE_BACKEND}")
+        return _load_yolo(weights_path)
+    
+    @staticmethod
+    def export_onnx(weights_path):
+        """Export PyTorch weights to ONNX once and return the ``.onnx`` path."""
+        onnx_path = os.path.splitext(weights_path)[0] + ".onnx"
+        if not os.path.exists(onnx_path) or os.path.getmtime(onnx_path) < os.path.getmtime(weights_path):
+            print(f"Exporting {weights_path} to ONNX...")
+            exported = _load_yolo(weights_path).export(
+                format="onnx", dynamic=True, simplify=True, opset=Config.ONNX_OPSET
+            )
+            if os.path.abspath(exported) != os.path.abspath(onnx_path):
+                os.replace(exported, onnx_path)
+            print("Export complete.")
+        return onnx_path
+    
+    @classmethod
+    def quantize_int8(cls, weights_path, mode=None, calibration_dir=None):
+        """Produce an INT8 ONNX variant of the weights once and return its path.
+        
+        Static quantization calibrates on frames from
+        ``Config.QUANT_CALIBRATION_DIR``; dynamic quantization needs none.
+        """
+        from .quantization import quantize_onnx
+        mode = mode or Config.QUANT_MODE
+        onnx_path = cls.export_onnx(weights_path)
+        int8_path = os.path.splitext(weights_path)[0] + f".int8-{mode}.onnx"
+        if not os.path.exists(int8_path) or os.path.getmtime(int8_path) < os.path.getmtime(onnx_path):
+            print(f"Quantizing {onnx_path} to INT8 ({mode})...")
+            quantize_onnx(onnx_path, int8_path, mode, calibration_dir or Config.QUANT_CALIBRATION_DIR)
+            print("Quantization complete.")
+        return int8_path
+    
     def get_person_model(self):
         """Get the person detection model."""
         if not self._initialized:
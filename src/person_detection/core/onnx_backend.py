@@ -0,0 +1,186 @@
+"""ONNX Runtime inference backend for YOLO models.
+
+Runs exported YOLOv8 ``.onnx`` models with NumPy pre-processing and NMS,
+returning results shaped like ultralytics ``Results`` (``result.boxes`` with
+``xyxy``, ``conf`` and ``cls`` that support ``.cpu().numpy()``), so
+``PersonDetector`` works unchanged on either backend.
+"""
+
+import os
+import cv2
+import numpy as np
+from .config import Config
+
+MODEL_STRIDE = 32
+
+
+class NumpyTensor:
+    """Tensor look-alike over a NumPy array (``.cpu().numpy()`` is a no-op)."""
+
+    def __init__(self, array):
+        self._array = np.asarray(array)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._array
+
+    def __getitem__(self, item):
+        return NumpyTensor(self._array[item])
+
+    def __len__(self):
+        return len(self._array)
+
+    def __int__(self):
+        return int(self._array)
+
+    def __float__(self):
+        return float(self._array)
+
+
+class NumpyBoxes:
+    """Detected boxes with the iteration behaviour of ultralytics ``Boxes``."""
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = NumpyTensor(xyxy)
+        self.conf = NumpyTensor(conf)
+        self.cls = NumpyTensor(cls)
+
+    def __len__(self):
+        return len(self.xyxy)
+
+    def __iter__(self):
+        xyxy, conf, cls = self.xyxy.numpy(), self.conf.numpy(), self.cls.numpy()
+        for i in range(len(self)):
+            yield NumpyBoxes(xyxy[i:i + 1], conf[i:i + 1], cls[i:i + 1])
+
+
+class NumpyResults:
+    """Per-image detection result."""
+
+    def __init__(self, boxes, orig_shape):
+        self.boxes = boxes
+        self.orig_shape = orig_shape
+
+
+def nms(boxes, scores, iou_threshold):
+    """Greedy non-maximum suppression; returns kept indices by descending score."""
+    order = np.argsort(-scores)
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        x1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        y1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        x2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        y2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-6)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=int)
+
+
+def letterbox_image(image, size):
+    """Resize and pad a BGR image onto a ``size`` x ``size`` canvas, ultralytics-style.
+
+    Returns the canvas, the scale applied and the ``(left, top)`` padding.
+    """
+    h, w = image.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    pad_x, pad_y = (size - new_w) / 2, (size - new_h) / 2
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    top, left = int(round(pad_y - 0.1)), int(round(pad_x - 0.1))
+    canvas[top:top + new_h, left:left + new_w] = image
+    return canvas, scale, (left, top)
+
+
+def preprocess(images, size):
+    """Build the ``(N, 3, size, size)`` float input batch and per-image letterbox data."""
+    batch = np.empty((len(images), 3, size, size), dtype=np.float32)
+    meta = []
+    for i, image in enumerate(images):
+        canvas, scale, pad = letterbox_image(image, size)
+        # BGR HWC uint8 -> RGB CHW float in [0, 1]
+        batch[i] = canvas[..., ::-1].transpose(2, 0, 1) * (1.0 / 255.0)
+        meta.append((scale, pad, image.shape[:2]))
+    return batch, meta
+
+
+class OnnxYoloModel:
+    """YOLOv8 detector running under ONNX Runtime on the CPU."""
+
+    def __init__(self, onnx_path, threads=Config.ONNX_THREADS):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "The 'onnx' inference backend requires onnxruntime: pip install onnxruntime"
+            ) from e
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = threads or os.cpu_count() or 1
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Static exports fix the input size; dynamic ones report strings.
+        shape = model_input.shape
+        self.fixed_size = shape[2] if isinstance(shape[2], int) else None
+        self.stride = MODEL_STRIDE
+
+    def _postprocess(self, output, meta, conf, classes, iou):
+        results = []
+        for prediction, (scale, (left, top), (h, w)) in zip(output, meta):
+            prediction = prediction.T  # (anchors, 4 + classes)
+            scores = prediction[:, 4:]
+            cls = scores.argmax(axis=1)
+            best = scores[np.arange(len(scores)), cls]
+            mask = best >= conf
+            if classes is not None:
+                mask &= np.isin(cls, classes)
+            boxes, best, cls = prediction[mask, :4], best[mask], cls[mask]
+
+            xyxy = np.empty_like(boxes)
+            xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2
+            xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2
+            xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2
+            xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2
+
+            if len(xyxy):
+                # Offset boxes per class so NMS never suppresses across classes.
+                keep = nms(xyxy + cls[:, None] * 4096.0, best, iou)[:Config.ONNX_MAX_DETECTIONS]
+                xyxy, best, cls = xyxy[keep], best[keep], cls[keep]
+                xyxy -= np.array([left, top, left, top], dtype=xyxy.dtype)
+                xyxy /= scale
+                np.clip(xyxy, 0, [w, h, w, h], out=xyxy)
+
+            results.append(NumpyResults(
+                NumpyBoxes(xyxy.astype(np.float32), best.astype(np.float32), cls.astype(np.float32)),
+                (h, w),
+            ))
+        return results
+
+    def predict(self, source, classes=None, conf=0.25, iou=0.7, imgsz=640, verbose=False, **kwargs):
+        """Detect objects in an image or list of images (BGR ``ndarray``)."""
+        images = source if isinstance(source, (list, tuple)) else [source]
+        if not images:
+            return []
+        size = self.fixed_size or int(-(-imgsz // self.stride) * self.stride)
+        batch, meta = preprocess(images, size)
+        if self.fixed_size is not None and len(images) > 1 and self.session.get_inputs()[0].shape[0] == 1:
+            output = np.concatenate([
+                self.session.run(None, {self.input_name: batch[i:i + 1]})[0] for i in range(len(images))
+            ])
+        else:
+            output = self.session.run(None, {self.input_name: batch})[0]
+        return self._postprocess(output, meta, conf, classes, iou)
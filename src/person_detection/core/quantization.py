@@ -0,0 +1,86 @@
+"""INT8 quantization of exported ONNX models with ONNX Runtime."""
+
+import os
+import cv2
+from .config import Config
+from .onnx_backend import preprocess
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def calibration_images(directory, limit=Config.QUANT_CALIBRATION_FRAMES):
+    """Load up to ``limit`` BGR frames from a local calibration folder."""
+    if not directory or not os.path.isdir(directory):
+        raise FileNotFoundError(f"Calibration folder not found: {directory}")
+    names = sorted(n for n in os.listdir(directory) if n.lower().endswith(IMAGE_EXTENSIONS))
+    images = []
+    for name in names[:limit]:
+        image = cv2.imread(os.path.join(directory, name))
+        if image is not None:
+            images.append(image)
+    if not images:
+        raise FileNotFoundError(f"No calibration images in {directory}")
+    return images
+
+
+def _calibration_reader(input_name, images, size):
+    """Build an ONNX Runtime calibration reader feeding one frame at a time."""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self._batches = iter([preprocess([image], size)[0] for image in images])
+
+        def get_next(self):
+            batch = next(self._batches, None)
+            return None if batch is None else {input_name: batch}
+
+    return FrameReader()
+
+
+def quantize_onnx(onnx_path, output_path, mode=Config.QUANT_MODE,
+                  calibration_dir=Config.QUANT_CALIBRATION_DIR, size=640):
+    """Write an INT8 copy of ``onnx_path`` to ``output_path``.
+
+    ``mode`` is ``"dynamic"`` (weights only, no calibration data) or
+    ``"static"`` (weights and activations, calibrated on frames from
+    ``calibration_dir``).
+    """
+    try:
+        import onnxruntime as ort
+        from onnxruntime.quantization import QuantFormat, QuantType, quantize_dynamic, quantize_static
+    except ImportError as e:
+        raise ImportError(
+            "INT8 quantization requires onnxruntime and onnx: pip install onnxruntime onnx"
+        ) from e
+
+    source = onnx_path
+    try:
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+        source = os.path.splitext(output_path)[0] + ".prep.onnx"
+        quant_pre_process(onnx_path, source, skip_symbolic_shape=True)
+    except Exception as e:
+        print(f"Skipping quantization pre-processing: {e}")
+        source = onnx_path
+
+    try:
+        if mode == "dynamic":
+            quantize_dynamic(source, output_path, weight_type=QuantType.QUInt8)
+        elif mode == "static":
+            input_name = ort.InferenceSession(
+                source, providers=["CPUExecutionProvider"]
+            ).get_inputs()[0].name
+            reader = _calibration_reader(input_name, calibration_images(calibration_dir), size)
+            quantize_static(
+                source, output_path, reader,
+                quant_format=QuantFormat.QDQ,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+            )
+        else:
+            raise ValueError(f"Unknown quantization mode: {mode}")
+    finally:
+        if source != onnx_path and os.path.exists(source):
+            os.remove(source)
+    return output_path
@@ -1,5 +1,5 @@
 """Database operations module."""
 
-from .handler import DBHelper
+from .handler import AsyncDBHelper, DBHelper, DetectionEventLog
 
-__all__ = ["DBHelper"]
\ No newline at end of file
+__all__ = ["AsyncDBHelper", "DBHelper", "DetectionEventLog"]
\ No newline at end of file
@@ -1,17 +1,71 @@
 """Database handler for the person detection system."""
 
+import asyncio
+import json
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from ..core.config import Config
+from ..core.metrics import registry
+
+_STOP = object()
+
+WRITE_SECONDS = registry.histogram(
+    "person_detection_db_write_seconds",
+    "Duration of one detection event batch insert, including the commit.",
+)
+CALL_SECONDS = registry.histogram(
+    "person_detection_db_call_seconds",
+    "Duration of a database call made from asyncio code, excluding executor wait.",
+    ("method",),
+)
 
 
 class DBHelper:
-    """Database helper class for managing user data and bot settings."""
+    """Database helper class for managing user data and bot settings.
+
+    Each thread gets its own connection, opened on first use, so the GUI
+    thread, the bot's executor threads and the event log never share a
+    ``sqlite3`` connection. The database runs in WAL mode so readers do not
+    wait for writers; concurrent writers wait up to ``DB_BUSY_TIMEOUT``.
+    """
     
-    def __init__(self):
-        self.db_name = Config.DATABASE_NAME
-        self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
+    def __init__(self, db_name=None):
+        self.db_name = db_name or Config.DATABASE_NAME
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
         self.create_table()
 
+    @property
+    def conn(self):
+        """The calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_name, timeout=Config.DB_BUSY_TIMEOUT)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._connections_lock:
+                self._connections.remove(conn)
+            conn.close()
+
+    def connection_count(self):
+        """Number of per-thread connections currently open."""
+        with self._connections_lock:
+            return len(self._connections)
+
     def create_table(self):
         """Create necessary database tables."""
         c = self.conn.cursor()
@@ -30,6 +84,7 @@ class DBHelper:
              (admin_id INTEGER PRIMARY KEY AUTOINCREMENT,
               admin_user_id INTEGER)"""
         )
+        c.execute("CREATE INDEX IF NOT EXISTS idx_tgmembers_user_id ON tgmembers (user_id)")
         
         self.conn.commit()
         
@@ -50,6 +105,21 @@ class DBHelper:
         c = self.conn.cursor()
         c.execute("INSERT INTO tgmembers (name, user_id) VALUES (?, ?)", (name, user_id))
         self.conn.commit()
+
+    def add_user_if_missing(self, name, user_id):
+        """Add a user unless already registered; returns True if added.
+
+        The check and insert are one statement, so concurrent calls for the
+        same user cannot both insert.
+        """
+        c = self.conn.cursor()
+        c.execute(
+            "INSERT INTO tgmembers (name, user_id) SELECT ?, ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM tgmembers WHERE user_id = ?)",
+            (name, user_id, user_id),
+        )
+        self.conn.commit()
+        return c.rowcount == 1
         
     def get_bot_token(self):
         """Get the bot token from the database."""
@@ -85,4 +155,282 @@ class DBHelper:
         c.execute("DELETE FROM admins")
         for admin_user_id in admin_user_ids:
             c.execute("INSERT INTO admins (admin_user_id) VALUES (?)", (admin_user_id,))
-        self.conn.commit()
\ No newline at end of file
+        self.conn.commit()
+
+
+class AsyncDBHelper:
+    """Awaitable facade over ``DBHelper`` for asyncio code such as the bot.
+
+    Every ``DBHelper`` method is available as a coroutine that runs the call
+    on a small thread pool, so database work never blocks the event loop::
+
+        if await async_db.add_user_if_missing(name, user_id): ...
+    """
+
+    def __init__(self, db, max_workers=Config.DB_EXECUTOR_WORKERS):
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+
+    def __getattr__(self, name):
+        method = getattr(self.db, name)
+        if not callable(method):
+            raise AttributeError(f"DBHelper.{name} is not a method")
+
+        timer = CALL_SECONDS.labels(name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timer.observe_since(start)
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(timed, *args, **kwargs))
+
+        call.__name__ = name
+        return call
+
+    def shutdown(self, wait=True):
+        """Stop the executor threads."""
+        self._executor.shutdown(wait=wait)
+
+
+class DetectionEventLog:
+    """Detection history stored in SQLite, written off the video thread.
+
+    ``record`` only appends to a bounded in-memory queue, so callers never
+    wait on disk; when the queue is full the event is dropped and counted.
+    Events go to ``Config.EVENT_LOG_DATABASE``, a file of their own, so the
+    user and settings database is not rewritten on every detection.
+    A dedicated writer thread owns its own connection, runs the database in
+    WAL mode and inserts queued events in batches, one transaction per
+    ``batch_size`` events or ``flush_interval`` seconds. Queries open their
+    own connection and can run while the writer is busy.
+    """
+
+    def __init__(self, db_name=None, batch_size=Config.EVENT_LOG_BATCH_SIZE,
+                 flush_interval=Config.EVENT_LOG_FLUSH_INTERVAL,
+                 queue_size=Config.EVENT_LOG_QUEUE_SIZE):
+        self.db_name = db_name or Config.EVENT_LOG_DATABASE
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._last_counts = {}
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_time = WRITE_SECONDS.labels()
+
+        conn = self._connect()
+        try:
+            self.create_table(conn)
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="event-log", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, timeout=Config.DB_BUSY_TIMEOUT)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def create_table(conn):
+        """Create the events table and its time and camera indexes."""
+        c = conn.cursor()
+        c.execute(
+            """CREATE TABLE IF NOT EXISTS detection_events
+             (id INTEGER PRIMARY KEY AUTOINCREMENT,
+              ts REAL NOT NULL,
+              camera TEXT NOT NULL,
+              persons INTEGER NOT NULL,
+              boxes TEXT)"""
+        )
+        c.execute("CREATE INDEX IF NOT EXISTS idx_detection_events_ts ON detection_events (ts)")
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detection_events_camera_ts "
+            "ON detection_events (camera, ts)"
+        )
+        conn.commit()
+
+    def record(self, camera, persons, detections=None, timestamp=None):
+        """Queue an event for ``camera``; never blocks.
+
+        ``detections`` is a list of ``(box, confidence)`` pairs and is only
+        serialised on the writer thread, so it must not be mutated later.
+        Returns False if the queue was full and the event was dropped.
+        """
+        event = (time.time() if timestamp is None else timestamp, camera, persons, detections)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.recorded += 1
+        return True
+
+    def record_change(self, camera, persons, detections=None, timestamp=None):
+        """Queue an event only when the person count of ``camera`` changed."""
+        if self._last_counts.get(camera) == persons:
+            return False
+        self._last_counts[camera] = persons
+        return self.record(camera, persons, detections, timestamp)
+
+    @staticmethod
+    def _row(event):
+        timestamp, camera, persons, detections = event
+        boxes = None
+        if detections:
+            boxes = json.dumps([
+                [int(x1), int(y1), int(x2), int(y2), round(float(conf), 4)]
+                for (x1, y1, x2, y2), conf in detections
+            ])
+        return timestamp, camera, int(persons), boxes
+
+    def _write(self, conn, events):
+        start = time.perf_counter()
+        with conn:
+            conn.executemany(
+                "INSERT INTO detection_events (ts, camera, persons, boxes) VALUES (?, ?, ?, ?)",
+                [self._row(event) for event in events],
+            )
+        self.write_time.observe_since(start)
+        self.written += len(events)
+        self.batches += 1
+
+    def _writer_loop(self):
+        conn = self._connect()
+        pending = []
+        waiters = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                stop = item is _STOP
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not None and not stop:
+                    pending.append(item)
+                    while len(pending) < self.batch_size:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if item is _STOP:
+                            stop = True
+                            break
+                        if isinstance(item, threading.Event):
+                            waiters.append(item)
+                            break
+                        pending.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+
+                if pending and (stop or waiters or len(pending) >= self.batch_size
+                                or time.monotonic() >= deadline):
+                    try:
+                        self._write(conn, pending)
+                    except sqlite3.Error as e:
+                        print(f"Failed to write {len(pending)} detection events: {e}")
+                    pending = []
+                    deadline = None
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def flush(self, timeout=None):
+        """Wait until every event queued so far is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write any queued events and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join(timeout)
+
+    def _query(self, sql, params):
+        conn = sqlite3.connect(self.db_name, timeout=Config.DB_BUSY_TIMEOUT)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _where(start, end, camera):
+        clauses, params = [], []
+        if camera is not None:
+            clauses.append("camera = ?")
+            params.append(camera)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def events(self, start=None, end=None, camera=None, limit=None):
+        """Get events in ``[start, end)`` as dicts, oldest first."""
+        where, params = self._where(start, end, camera)
+        sql = f"SELECT ts, camera, persons, boxes FROM detection_events{where} ORDER BY ts"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {
+                "timestamp": ts,
+                "camera": cam,
+                "persons": persons,
+                "boxes": json.loads(boxes) if boxes else [],
+            }
+            for ts, cam, persons, boxes in self._query(sql, params)
+        ]
+
+    def aggregate(self, start=None, end=None, camera=None, bucket_seconds=3600):
+        """Get per-camera event count, peak and mean persons per time bucket.
+
+        Returns dicts with ``bucket`` (start of the bucket as a timestamp),
+        ``camera``, ``events``, ``max_persons`` and ``avg_persons``.
+        """
+        where, params = self._where(start, end, camera)
+        sql = (
+            "SELECT CAST(ts / ? AS INTEGER) * ? AS bucket, camera, COUNT(*), MAX(persons), AVG(persons) "
+            f"FROM detection_events{where} GROUP BY bucket, camera ORDER BY bucket, camera"
+        )
+        rows = self._query(sql, [bucket_seconds, bucket_seconds] + params)
+        return [
+            {
+                "bucket": bucket,
+                "camera": cam,
+                "events": count,
+                "max_persons": peak,
+                "avg_persons": round(mean, 3),
+            }
+            for bucket, cam, count, peak, mean in rows
+        ]
+
+    def stats(self):
+        """Get recorded, written, dropped and batch counters."""
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "queued": self._queue.qsize(),
+        }
@@ -1,6 +1,15 @@
 """Detection and camera management modules."""
 
 from .detector import PersonDetector
-from .camera import CameraChecker
+
+
+def __getattr__(name):
+    # CameraChecker needs PyQt6; import it lazily so headless users of
+    # PersonDetector do not pull in Qt.
+    if name == "CameraChecker":
+        from .camera import CameraChecker
+        return CameraChecker
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["PersonDetector", "CameraChecker"]
\ No newline at end of file
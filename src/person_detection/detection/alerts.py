@@ -0,0 +1,200 @@
+"""Person alerts: debounced per camera and coalesced before sending."""
+
+import threading
+import time
+from collections import OrderedDict
+from ..core.config import Config
+
+
+class PresenceDebouncer:
+    """Hysteresis on one camera's person count.
+
+    The camera becomes "occupied" after ``enter_frames`` consecutive frames
+    with at least ``min_persons`` persons, and "clear" again only after
+    ``clear_seconds`` without them, so a detector flickering around the
+    threshold does not produce an alert per flicker. An alert fires when
+    the camera becomes occupied, unless the previous alert on this camera
+    was less than ``cooldown`` seconds ago.
+    """
+
+    def __init__(self, min_persons=Config.ALERT_MIN_PERSONS,
+                 enter_frames=Config.ALERT_ENTER_FRAMES,
+                 clear_seconds=Config.ALERT_CLEAR_SECONDS,
+                 cooldown=Config.ALERT_COOLDOWN):
+        self.min_persons = min_persons
+        self.enter_frames = enter_frames
+        self.clear_seconds = clear_seconds
+        self.cooldown = cooldown
+        self.occupied = False
+        self._streak = 0
+        self._last_seen = None
+        self._last_alert = None
+        self.fired = 0
+        self.suppressed = 0
+
+    def update(self, persons, now=None):
+        """Feed one frame's person count; return True if an alert should fire."""
+        now = time.monotonic() if now is None else now
+        if persons >= self.min_persons:
+            self._streak += 1
+            self._last_seen = now
+            if self.occupied or self._streak < self.enter_frames:
+                return False
+            self.occupied = True
+            if self._last_alert is not None and now - self._last_alert < self.cooldown:
+                self.suppressed += 1
+                return False
+            self._last_alert = now
+            self.fired += 1
+            return True
+
+        self._streak = 0
+        if self.occupied and now - self._last_seen >= self.clear_seconds:
+            self.occupied = False
+        return False
+
+
+class Alert:
+    """A pending alert for one camera, possibly several merged together."""
+
+    __slots__ = ("camera", "persons", "image", "first_seen", "last_seen", "merged")
+
+    def __init__(self, camera, persons, image, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        self.camera = camera
+        self.persons = persons
+        self.image = image
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.merged = 1
+
+    def merge(self, other):
+        """Fold a newer alert for the same camera into this one.
+
+        The image with the most persons is kept.
+        """
+        if other.persons >= self.persons:
+            self.persons = other.persons
+            self.image = other.image
+        self.last_seen = max(self.last_seen, other.last_seen)
+        self.merged += other.merged
+
+    def caption(self):
+        text = f"Person alert on {self.camera}: {self.persons} person(s)"
+        if self.merged > 1:
+            text += f" ({self.merged} alerts merged)"
+        return text
+
+    def __repr__(self):
+        return f"Alert({self.camera!r}, persons={self.persons}, merged={self.merged})"
+
+
+class AlertQueue:
+    """Bounded, thread-safe queue holding at most one alert per camera.
+
+    ``put`` never blocks: an alert for a camera that already has one
+    waiting is merged into it, and when ``maxsize`` cameras are waiting the
+    oldest is dropped. ``get_batch`` waits for the first alert, then lets a
+    burst settle for ``window`` seconds and takes everything at once, so
+    the sender can turn a burst into a single message.
+    """
+
+    def __init__(self, maxsize=Config.ALERT_QUEUE_SIZE, window=Config.ALERT_COALESCE_SECONDS):
+        self.maxsize = maxsize
+        self.window = window
+        self._pending = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.merged = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def put(self, alert):
+        """Queue ``alert``, merging it with a pending one for the same camera."""
+        with self._cond:
+            if self._closed:
+                return
+            self.put_count += 1
+            pending = self._pending.get(alert.camera)
+            if pending is not None:
+                pending.merge(alert)
+                self.merged += 1
+                return
+            if len(self._pending) >= self.maxsize:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[alert.camera] = alert
+            self._cond.notify()
+
+    def get_batch(self, timeout=None):
+        """Wait up to ``timeout`` for alerts and return every pending one.
+
+        Returns an empty list on timeout or once the queue is closed.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending or self._closed, timeout):
+                return []
+            if self.window and not self._closed:
+                # Let the rest of a burst arrive; waking early only on close.
+                self._cond.wait_for(lambda: self._closed, self.window)
+            batch = list(self._pending.values())
+            self._pending.clear()
+            if batch:
+                self.batches += 1
+            return batch
+
+    def close(self):
+        """Wake waiting consumers and refuse further alerts."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+    def stats(self):
+        """Get alert counters."""
+        with self._cond:
+            return {
+                "put": self.put_count,
+                "merged": self.merged,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "pending": len(self._pending),
+            }
+
+
+class PersonAlerts:
+    """Turns per-camera person counts into queued alerts.
+
+    Called from the video loop after every frame. It only compares numbers
+    unless an alert fires, in which case it copies the annotated frame and
+    hands it to the queue without blocking; sending is left to whoever
+    drains the queue.
+    """
+
+    def __init__(self, queue, **debounce):
+        self.queue = queue
+        self._debounce = debounce
+        self.cameras = {}
+
+    def observe(self, camera, persons, image, now=None):
+        """Feed one camera's count; queue an alert with a copy of ``image`` if it fires."""
+        debouncer = self.cameras.get(camera)
+        if debouncer is None:
+            debouncer = self.cameras[camera] = PresenceDebouncer(**self._debounce)
+        if not debouncer.update(persons, now):
+            return False
+        self.queue.put(Alert(camera, persons, image.copy() if image is not None else None))
+        return True
+
+    def stats(self):
+        """Get fired and suppressed alert counts per camera."""
+        return {camera: {"fired": d.fired, "suppressed": d.suppressed}
+                for camera, d in self.cameras.items()}
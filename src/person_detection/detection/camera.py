@@ -1,64 +1,66 @@
 """Camera management and detection."""
 
-import subprocess
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtWidgets import QComboBox, QMessageBox
+from .devices import DeviceWatcher
 
 
-class CameraChecker:
-    """Manages camera detection and availability checking."""
-    
-    def __init__(self, combo_obj: QComboBox):
-        self.cameras = {}
-        self.combo_obj = combo_obj
-        self.timer = None
+class CameraChecker(QObject):
+    """Manages camera detection and availability checking.
 
-    def cam_available(self):
-        """Check for available cameras and update the combo box."""
-        try:
-            result = subprocess.run(['v4l2-ctl', '--list-devices'], capture_output=True, text=True)
-            if result.returncode == 0:
-                output = result.stdout
-                lines = output.split('\n')
-                new_cameras = {}
-                camera_name = None
+    A ``DeviceWatcher`` thread follows cameras being plugged in and out and
+    emits ``cameras_changed(added, removed)``; the combo box is updated from
+    that signal on the GUI thread, which never scans devices itself.
+    """
 
-                for i, line in enumerate(lines):
-                    if "usb-" in line:
-                        camera_name = lines[i].strip()
-                        address = lines[i+1].strip()
-                        new_cameras[camera_name] = address
+    cameras_changed = pyqtSignal(object, object)
 
-                # Check for new cameras
-                for camera in new_cameras.keys():
-                    if camera not in self.cameras:
-                        msg = QMessageBox()
-                        msg.setIcon(QMessageBox.Icon.Information)
-                        msg.setText(f"New camera detected: {camera}")
-                        msg.setWindowTitle("Camera Detection")
-                        msg.exec()
-                        self.combo_obj.addItem(camera)
+    def __init__(self, combo_obj: QComboBox, watcher=None):
+        super().__init__()
+        self.cameras = {}
+        self.combo_obj = combo_obj
+        self.watcher = watcher or DeviceWatcher(self.cameras_changed.emit)
+        self.notice = None
+        self.cameras_changed.connect(self._apply_changes)
 
-                # Check for removed cameras
-                for camera in self.cameras.keys():
-                    if camera not in new_cameras:
-                        self.combo_obj.removeItem(self.combo_obj.findText(camera))
+    def start(self):
+        """Fill the combo box with the cameras present and start watching."""
+        self._apply_changes(self.watcher.start(), {}, notify=False)
 
-                self.cameras = new_cameras.copy()
+    def stop(self):
+        """Stop watching for cameras."""
+        self.watcher.stop()
 
-            else:
-                print("Error running v4l2-ctl")
-                self.cameras = {}
-        except Exception as e:
-            print(f"Exception occurred: {e}")
-            self.cameras = {}
+    def _apply_changes(self, added, removed, notify=True):
+        """Update the camera list and combo box with one watcher diff."""
+        cameras = dict(self.cameras)
+        for camera in removed:
+            if camera not in added:
+                cameras.pop(camera, None)
+                self.combo_obj.removeItem(self.combo_obj.findText(camera))
+                print(f"Camera removed: {camera}")
+        for camera, address in added.items():
+            if self.combo_obj.findText(camera) < 0:
+                self.combo_obj.addItem(camera)
+            cameras[camera] = address
+        new = [camera for camera in added if camera not in self.cameras]
+        # Swap in a new dict so video threads reading it never see a partial update.
+        self.cameras = cameras
 
-    def start(self):
-        """Start the camera checking timer."""
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.cam_available)
-        self.timer.start(1000)
+        if notify and new:
+            self._notify("New camera detected: " + ", ".join(new))
+
+    def _notify(self, text):
+        """Show a non-modal notice, reusing the open one."""
+        print(text)
+        if self.notice is None:
+            self.notice = QMessageBox()
+            self.notice.setIcon(QMessageBox.Icon.Information)
+            self.notice.setWindowTitle("Camera Detection")
+            self.notice.setModal(False)
+        self.notice.setText(text)
+        self.notice.show()
 
     def get_cameras(self):
         """Get the dictionary of available cameras."""
-        return self.cameras
\ No newline at end of file
+        return self.cameras
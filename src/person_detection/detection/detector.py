@@ -1,33 +1,89 @@
 """Person detection functionality."""
 
-import cv2
+import threading
+import time
 from ..core.config import Config
+from ..core.lazy_import import lazy_import
+from .renderer import AnnotationRenderer, draw_rounded_shape
+from .motion import MotionGate
+from .face_cache import FaceCache, spatial_key, track_key
+from .frame_pool import FramePool
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
 
 
 def draw_rounded_rectangle(img, top_left, bottom_right, color, thickness, radius=50):
-    """Draw a rounded rectangle on the image."""
+    """Draw a rounded rectangle on the image.
+    
+    Copies and blends the whole frame per call; ``AnnotationRenderer``
+    batches all boxes of a frame into a single blend instead.
+    """
     x1, y1 = top_left
     x2, y2 = bottom_right
     overlay = img.copy()
-    edge_color = (0, 0, 255)
-    
-    cv2.rectangle(overlay, (x1 + radius, y1), (x2 - radius, y2), color, -1)
-    cv2.rectangle(overlay, (x1, y1 + radius), (x2, y2 - radius), color, -1)
-    cv2.circle(overlay, (x1 + radius, y1 + radius), radius, edge_color, -1)
-    cv2.circle(overlay, (x2 - radius, y1 + radius), radius, edge_color, -1)
-    cv2.circle(overlay, (x1 + radius, y2 - radius), radius, edge_color, -1)
-    cv2.circle(overlay, (x2 - radius, y2 - radius), radius, edge_color, -1)
-
+    draw_rounded_shape(overlay, x1, y1, x2, y2, color, radius)
     cv2.addWeighted(overlay, 0.4, img, 0.6, 0, img)
 
 
+class DetectionRecord:
+    """Boxes found on one inference frame and a snapshot of that frame.
+
+    ``boxes`` is an ``(N, 4)`` int array of ``x1, y1, x2, y2``,
+    ``confidences`` an ``(N,)`` array and ``keys`` the face cache key of each
+    box. ``frame`` is a ``PooledFrame`` holding the pixels under each box as
+    they were before annotation (the rest of the buffer is stale); it is
+    never written to afterwards, and crops are only cut from it when someone
+    asks for them.
+    """
+
+    __slots__ = ("boxes", "confidences", "keys", "frame")
+
+    def __init__(self, boxes, confidences, keys, frame):
+        self.boxes = boxes
+        self.confidences = confidences
+        self.keys = keys
+        self.frame = frame
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def crops(self):
+        """Copy out one person crop per box."""
+        image = self.frame.array
+        return [image[y1:y2, x1:x2].copy() for x1, y1, x2, y2 in self.boxes.tolist()]
+
+
+def _new_tracker():
+    """Create a tracker; imported on demand since it builds NumPy state at import."""
+    from .tracker import PersonTracker
+    return PersonTracker()
+
+
 class PersonDetector:
     """Handles person detection using YOLO models."""
     
     def __init__(self):
         self.accuracy_threshold = Config.DEFAULT_ACCURACY
         self.show_accuracy = False
-        self.detection_list = []
+        self.detection_record = None
+        self._record_lock = threading.Lock()
+        self._snapshot_pool = FramePool(Config.SNAPSHOT_POOL_SIZE)
+        self.face_cache = FaceCache()
+        self.renderer = AnnotationRenderer()
+        self.motion_gate = MotionGate() if Config.MOTION_GATE_ENABLED else None
+        self.tracker = _new_tracker() if Config.TRACKING_ENABLED else None
+        # Settings changed from other threads, applied at the start of the next frame.
+        self._pending = {}
+        self._settings_lock = threading.Lock()
+        self.last_detections = None
+        # What the last frame reported: the confirmed tracks when tracking, else the raw boxes.
+        self.shown_detections = []
+        # Whether the last detect_and_count_persons call ran the model.
+        self.inferred = False
+        self.track_ids = None
+        # Per-stage histograms from ``core.metrics.stage_timers``; None records nothing.
+        self.timings = None
         self._model_manager = None
     
     def _get_model_manager(self):
@@ -40,66 +96,310 @@ class PersonDetector:
     def set_accuracy_threshold(self, threshold):
         """Set the accuracy threshold for detection."""
         self.accuracy_threshold = threshold
+        self._request("motion_reset", True)
     
     def set_show_accuracy(self, show):
         """Set whether to show accuracy labels."""
         self.show_accuracy = show
     
-    def detect_and_count_persons(self, frame):
-        """Detect persons in frame and return annotated frame and count."""
+    def set_motion_gate(self, enabled):
+        """Enable or disable skipping inference on static scenes.
+        
+        Like ``set_tracking`` this takes effect at the start of the next frame.
+        """
+        self._request("motion_gate", enabled)
+    
+    def set_tracking(self, enabled):
+        """Enable or disable tracking persons across frames.
+        
+        Safe to call from any thread: the change is applied by the thread
+        processing frames at the start of its next frame, never mid-frame.
+        """
+        self._request("tracking", enabled)
+    
+    def _request(self, setting, value):
+        """Queue a setting change for ``_apply_pending``; the latest value wins."""
+        with self._settings_lock:
+            self._pending[setting] = value
+    
+    def _apply_pending(self):
+        """Apply settings requested since the last frame, on the frame-processing thread."""
+        if not self._pending:
+            return
+        with self._settings_lock:
+            pending, self._pending = self._pending, {}
+        if "tracking" in pending:
+            self._apply_tracking(pending["tracking"])
+        if "motion_gate" in pending:
+            enabled = pending["motion_gate"]
+            if enabled and self.motion_gate is None:
+                self.motion_gate = MotionGate()
+            elif not enabled:
+                self.motion_gate = None
+        if "motion_reset" in pending and self.motion_gate is not None:
+            self.motion_gate.reset()
+    
+    def _apply_tracking(self, enabled):
+        """Create or drop the tracker.
+        
+        A new tracker numbers its tracks from 1 again, so faces cached under
+        the old IDs are dropped whenever the tracker is replaced or removed.
+        """
+        if enabled and self.tracker is None:
+            self.tracker = _new_tracker()
+            self.face_cache.clear()
+        elif not enabled and self.tracker is not None:
+            self.tracker = None
+            self.track_ids = None
+            self.face_cache.clear()
+    
+    def _observe(self, stage, start):
+        """Record the time since ``start`` under ``stage`` if timings are on."""
+        if self.timings is not None:
+            self.timings[stage].observe(time.perf_counter() - start)
+    
+    def _predict(self, source):
+        """Run the person model on a frame or a list of frames."""
         model_manager = self._get_model_manager()
         model = model_manager.get_person_model()
+        start = time.perf_counter()
         # results = model.predict(frame, classes=[Config.PERSON_CLASS_ID], conf=self.accuracy_threshold)
-        results = model.predict(frame, classes=[Config.PERSON_CLASS_ID], conf=self.accuracy_threshold, verbose=False)
-        persons = 0
-        self.detection_list = []
-
-        for result in results[0].boxes:
-            cls = int(result.cls[0])
-            conf = float(result.conf[0].cpu().numpy())
-            if cls == Config.PERSON_CLASS_ID:
-                persons += 1
-                box = result.xyxy[0].cpu().numpy().astype(int)
-                x1, y1, x2, y2 = box
-                
-                color = (0, 150, 0)
-                thickness = 1
-                cut_frame = frame[y1:y2, x1:x2].copy()
-                self.detection_list.append(cut_frame)
-                draw_rounded_rectangle(frame, (x1, y1), (x2, y2), color, thickness, radius=8)
-
-                label = f'Person: {round(conf, 2)}'
-                label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-                label_w, label_h = label_size
-                
-                label_bg_top_left = (x1, y1 - label_h - 10)
-                label_bg_bottom_right = (x1 + label_w, y1)
-                if self.show_accuracy:
-                    cv2.rectangle(frame, label_bg_top_left, label_bg_bottom_right, (0, 255, 0), cv2.FILLED)
-                    cv2.putText(frame, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-    
-        cv2.putText(frame, f'Persons: {persons}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-        return frame, persons
+        results = model.predict(source, classes=[Config.PERSON_CLASS_ID], conf=self.accuracy_threshold, verbose=False)
+        self._observe("inference", start)
+        return results
+    
+    def detect_and_count_persons(self, frame):
+        """Detect persons in frame and return annotated frame and count.
+        
+        With a motion gate enabled, static frames reuse the last detections
+        instead of running the model; ``inferred`` tells which happened.
+        """
+        reused = self.reuse_if_static(frame)
+        self.inferred = reused is None
+        if reused is not None:
+            return reused
+        results = self._predict(frame)
+        return self.process_result(frame, results[0])
+    
+    def reuse_if_static(self, frame):
+        """Annotate frame with the last detections if the motion gate skips it.
+        
+        Returns ``(frame, persons)`` when inference can be skipped, else None.
+        """
+        self._apply_pending()
+        gate = self.motion_gate
+        if gate is None:
+            return None
+        start = time.perf_counter()
+        moved = gate.should_infer(frame)
+        self._observe("motion", start)
+        if moved or self.last_detections is None:
+            return None
+        return self.annotate_last(frame)
+    
+    def annotate_last(self, frame):
+        """Annotate frame with the last detections without running the model.
+        
+        With tracking enabled the tracks are carried forward by their motion
+        model instead of being redrawn in place.
+        """
+        self._apply_pending()
+        tracker = self.tracker
+        if tracker is not None:
+            detections = self._tracked_detections(*tracker.carry())
+        else:
+            detections = self.last_detections or []
+        self.shown_detections = detections
+        self.annotate(frame, detections)
+        return frame, len(detections)
+    
+    def _tracked_detections(self, boxes, confidences, ids):
+        """Turn tracker output into ``(box, confidence)`` pairs and remember the IDs."""
+        self.track_ids = ids
+        return [(tuple(box), float(conf)) for box, conf in zip(boxes, confidences)]
+    
+    def predict_batch(self, frames):
+        """Run a single batched prediction over several frames.
+        
+        Returns one ultralytics result per frame, in the same order.
+        """
+        if not frames:
+            return []
+        return self._predict(list(frames))
+    
+    @staticmethod
+    def extract_boxes(prediction):
+        """Get person boxes and confidences from a prediction as NumPy arrays.
+        
+        Returns an ``(N, 4)`` int array of ``x1, y1, x2, y2`` and an ``(N,)``
+        float array of confidences, copied off the device in one go.
+        """
+        boxes = prediction.boxes
+        mask = boxes.cls.cpu().numpy().astype(int) == Config.PERSON_CLASS_ID
+        xyxy = boxes.xyxy.cpu().numpy()[mask].astype(int)
+        conf = boxes.conf.cpu().numpy()[mask]
+        return xyxy, conf
+    
+    def process_result(self, frame, prediction):
+        """Annotate frame from a prediction result and return it with the count."""
+        start = time.perf_counter()
+        detections = self.extract_detections(prediction)
+        self._observe("boxes", start)
+        self.last_detections = detections
+        self._apply_pending()
+        tracker = self.tracker
+        if tracker is not None:
+            boxes = [box for box, _ in detections]
+            confidences = [conf for _, conf in detections]
+            tracked = tracker.update(boxes, confidences)
+            keys = [track_key(i) for i in tracker.last_detection_ids]
+            self.record_detections(frame, detections, keys)
+            detections = self._tracked_detections(*tracked)
+        else:
+            keys = [spatial_key(box) for box, _ in detections]
+            self.record_detections(frame, detections, keys)
+        self.shown_detections = detections
+        self.annotate(frame, detections)
+        return frame, len(detections)
+
+    def record_detections(self, frame, detections, keys):
+        """Keep the boxes of this frame and an unannotated snapshot of them.
+
+        Only the boxed pixels are copied, into a recycled pool buffer at the
+        same positions, so nothing is allocated per frame; crops are cut
+        from it on demand by ``get_detections_with_faces``.
+        """
+        record = None
+        if detections:
+            snapshot = self._snapshot_pool.acquire(frame.shape, frame.dtype)
+            image = snapshot.array
+            boxes = np.array([box for box, _ in detections], dtype=np.int32).reshape(-1, 4)
+            for x1, y1, x2, y2 in boxes.tolist():
+                image[y1:y2, x1:x2] = frame[y1:y2, x1:x2]
+            confidences = np.array([conf for _, conf in detections], dtype=np.float32)
+            record = DetectionRecord(boxes, confidences, keys, snapshot)
+        with self._record_lock:
+            previous, self.detection_record = self.detection_record, record
+        if previous is not None:
+            previous.frame.release()
+
+    def _current_record(self):
+        """Get the current record with its snapshot retained, or None."""
+        with self._record_lock:
+            record = self.detection_record
+            if record is not None:
+                record.frame.retain()
+            return record
+    
+    def extract_detections(self, prediction):
+        """Get ``(box, confidence)`` pairs for every person in a prediction.
+        
+        Built on ``extract_boxes``, so every box comes off the device in one
+        copy, the same as in the CLI.
+        """
+        xyxy, conf = self.extract_boxes(prediction)
+        return list(zip(map(tuple, xyxy.tolist()), conf.tolist()))
+    
+    def annotate(self, frame, detections):
+        """Draw boxes, optional confidence labels and the person count."""
+        track_ids = self.track_ids if self.tracker is not None else None
+        start = time.perf_counter()
+        result = self.renderer.render(frame, detections, self.show_accuracy, track_ids)
+        self._observe("annotate", start)
+        return result
     
     def get_detections_with_faces(self):
-        """Get detected persons with face analysis."""
-        if not self.detection_list:
+        """Get detected persons with face analysis.
+        
+        Person crops are cut from the snapshot of the last inference frame
+        here rather than on every frame. Faces already found for the same
+        track (or, without tracking, the same spot) are reused from
+        ``face_cache``. The remaining crops are letterboxed to one shared
+        size and sent to the face model in a single batched call; face boxes
+        are mapped back to their crop.
+        """
+        record = self._current_record()
+        if record is None:
             return []
+        try:
+            crops = record.crops()
+        finally:
+            record.frame.release()
         
         model_manager = self._get_model_manager()
         face_model = model_manager.get_face_model()
         if not face_model:
-            return [(detection, None) for detection in self.detection_list]
+            return [(crop, None) for crop in crops]
         
-        results = []
-        for detection in self.detection_list:
-            face = None
-            face_results = face_model.predict(detection, conf=0.6)
-            for fresult in face_results[0].boxes:
-                fbox = fresult.xyxy[0].cpu().numpy().astype(int)
-                fx1, fy1, fx2, fy2 = fbox
-                face = detection[fy1:fy2, fx1:fx2]
-                break  # Take first face found
-            results.append((detection, face))
+        faces = [None] * len(crops)
+        missing = []
+        for i, key in enumerate(record.keys):
+            found, face = self.face_cache.get(key)
+            if found:
+                faces[i] = face
+            else:
+                missing.append(i)
         
-        return results
\ No newline at end of file
+        if missing:
+            found_faces = detect_faces_batch(face_model, [crops[i] for i in missing])
+            for i, face in zip(missing, found_faces):
+                faces[i] = face
+                self.face_cache.put(record.keys[i], face)
+        
+        return list(zip(crops, faces))
+
+
+def face_input_size(crops):
+    """Pick the face model input size for a batch of crops.
+    
+    The size fits the largest crop rounded up to the model stride, bounded
+    by ``Config.FACE_MIN_IMGSZ`` and ``Config.FACE_MAX_IMGSZ``, so small
+    crops are not upscaled to the full model size.
+    """
+    largest = max(max(crop.shape[:2]) for crop in crops)
+    stride = Config.FACE_MODEL_STRIDE
+    size = -(-largest // stride) * stride
+    return int(min(Config.FACE_MAX_IMGSZ, max(Config.FACE_MIN_IMGSZ, size)))
+
+
+def letterbox(image, size):
+    """Fit image into a ``size`` x ``size`` canvas without upscaling.
+    
+    Returns the canvas and the scale applied; the image sits at the
+    top-left corner so mapping back only needs the scale.
+    """
+    h, w = image.shape[:2]
+    scale = min(size / w, size / h, 1.0)
+    if scale < 1.0:
+        image = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[:image.shape[0], :image.shape[1]] = image
+    return canvas, scale
+
+
+def detect_faces_batch(face_model, crops):
+    """Run the face model once over all crops and return one face (or None) per crop."""
+    faces = [None] * len(crops)
+    valid = [i for i, crop in enumerate(crops) if crop.size > 0]
+    if not valid:
+        return faces
+    
+    size = face_input_size([crops[i] for i in valid])
+    canvases, scales = [], []
+    for i in valid:
+        canvas, scale = letterbox(crops[i], size)
+        canvases.append(canvas)
+        scales.append(scale)
+    
+    face_results = face_model.predict(canvases, imgsz=size, conf=Config.FACE_CONFIDENCE, verbose=False)
+    for i, scale, fresult in zip(valid, scales, face_results):
+        if len(fresult.boxes) == 0:
+            continue
+        # Boxes come sorted by confidence; take the best face in each crop.
+        fbox = fresult.boxes.xyxy[0].cpu().numpy() / scale
+        h, w = crops[i].shape[:2]
+        fx1, fy1, fx2, fy2 = np.clip(fbox, 0, [w, h, w, h]).astype(int)
+        if fx2 > fx1 and fy2 > fy1:
+            faces[i] = crops[i][fy1:fy2, fx1:fx2]
+    return faces
@@ -0,0 +1,261 @@
+"""Video device discovery from sysfs and hot-plug watching without subprocesses."""
+
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import threading
+import time
+from ..core.config import Config
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+_EVENT = struct.Struct("iIII")
+_WATCH_MASK = IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+
+_NODE = re.compile(r"^video(\d+)$")
+_USB_INTERFACE = re.compile(r"^\d+-([\d.]+):\d+\.\d+$")
+_USB_ROOT = re.compile(r"^usb\d+$")
+
+
+def _read_attr(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def usb_bus_info(device_path):
+    """V4L2 ``bus_info`` ("usb-<host controller>-<port path>") for a sysfs device path.
+
+    ``device_path`` is the resolved ``/sys/class/video4linux/videoN/device``
+    link, e.g. ``.../0000:00:14.0/usb1/1-2/1-2:1.0``. Returns None for
+    devices that are not on USB.
+    """
+    parts = device_path.rstrip("/").split("/")
+    for i in range(len(parts) - 1, 0, -1):
+        match = _USB_INTERFACE.match(parts[i])
+        if match is None:
+            continue
+        for j in range(i - 1, 0, -1):
+            if _USB_ROOT.match(parts[j]):
+                return f"usb-{parts[j - 1]}-{match.group(1)}"
+        return None
+    return None
+
+
+def scan_video_devices(dev_dir=Config.CAMERA_DEV_DIR, sysfs_dir=Config.CAMERA_SYSFS_DIR):
+    """List USB cameras as ``{name: address}`` by reading sysfs.
+
+    Names match the device headers of ``v4l2-ctl --list-devices``
+    ("<card> (<bus_info>):") and the address is the camera's first
+    ``/dev/videoN`` node, so the result is what the previous
+    subprocess-based check produced. Nodes whose ``/dev`` entry does not
+    exist yet are left out until udev creates them.
+    """
+    try:
+        entries = os.listdir(sysfs_dir)
+    except OSError:
+        return {}
+
+    nodes = {}
+    for entry in entries:
+        match = _NODE.match(entry)
+        if match is None:
+            continue
+        bus_info = usb_bus_info(os.path.realpath(os.path.join(sysfs_dir, entry, "device")))
+        address = os.path.join(dev_dir, entry)
+        if bus_info is None or not os.path.exists(address):
+            continue
+        card = _read_attr(os.path.join(sysfs_dir, entry, "name")) or entry
+        index = int(match.group(1))
+        name = f"{card} ({bus_info}):"
+        if name not in nodes or index < nodes[name][0]:
+            nodes[name] = (index, address)
+
+    return {name: address for name, (_, address) in sorted(nodes.items(), key=lambda item: item[1][0])}
+
+
+class _Inotify:
+    """Minimal inotify binding over libc; raises OSError if unavailable."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def watch(self, path, mask=_WATCH_MASK):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def read(self):
+        """Return ``(mask, name)`` for every pending event."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            events.append((mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DeviceWatcher:
+    """Background thread that reports cameras being plugged in and out.
+
+    The thread sleeps on inotify events for ``dev_dir`` (udev creates and
+    removes ``videoN`` nodes there once the device is ready), waits
+    ``settle`` seconds for the rest of the burst a plug produces, then
+    rescans sysfs and calls ``on_change(added, removed)`` with the
+    difference, both ``{name: address}`` dicts. A full rescan also runs
+    every ``rescan_interval`` seconds to catch anything missed. Where
+    inotify is unavailable the directories are polled every
+    ``poll_interval`` seconds instead; either way nothing forks.
+
+    ``on_change`` runs on the watcher thread.
+    """
+
+    def __init__(self, on_change, dev_dir=Config.CAMERA_DEV_DIR,
+                 sysfs_dir=Config.CAMERA_SYSFS_DIR,
+                 settle=Config.CAMERA_SETTLE_SECONDS,
+                 rescan_interval=Config.CAMERA_RESCAN_SECONDS,
+                 poll_interval=Config.CAMERA_POLL_SECONDS,
+                 use_inotify=True):
+        self.on_change = on_change
+        self.dev_dir = dev_dir
+        self.sysfs_dir = sysfs_dir
+        self.settle = settle
+        self.rescan_interval = rescan_interval
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.devices = {}
+        self.mode = None
+        self.scans = 0
+        self.events = 0
+        self._thread = None
+        self._stop_r, self._stop_w = None, None
+
+    def scan(self):
+        self.scans += 1
+        return scan_video_devices(self.dev_dir, self.sysfs_dir)
+
+    def rescan(self):
+        """Scan now and report any difference from the last scan."""
+        current = self.scan()
+        added = {name: address for name, address in current.items()
+                 if self.devices.get(name) != address}
+        removed = {name: address for name, address in self.devices.items()
+                   if current.get(name) != address}
+        self.devices = current
+        if added or removed:
+            self.on_change(added, removed)
+        return added, removed
+
+    def start(self):
+        """Take the initial inventory and start watching; returns the inventory."""
+        self.devices = self.scan()
+        self._stop_r, self._stop_w = os.pipe()
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify()
+                inotify.watch(self.dev_dir)
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable, polling for cameras instead: {e}")
+                if inotify is not None:
+                    inotify.close()
+                inotify = None
+        self.mode = "inotify" if inotify is not None else "poll"
+        self._thread = threading.Thread(target=self._run, args=(inotify,),
+                                        name="camera-watcher", daemon=True)
+        self._thread.start()
+        return dict(self.devices)
+
+    def stop(self, timeout=2):
+        """Stop the watcher thread."""
+        if self._thread is None:
+            return
+        os.write(self._stop_w, b"x")
+        self._thread.join(timeout)
+        self._thread = None
+        os.close(self._stop_r)
+        os.close(self._stop_w)
+
+    def _run(self, inotify):
+        try:
+            if inotify is not None:
+                self._watch(inotify)
+            else:
+                self._poll()
+        except Exception as e:
+            print(f"Camera watcher stopped: {e}")
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _wait(self, fds, timeout):
+        """Wait for ``fds``; returns the ready ones, or None when stopping."""
+        ready, _, _ = select.select([self._stop_r] + fds, [], [], timeout)
+        if self._stop_r in ready:
+            return None
+        return ready
+
+    def _watch(self, inotify):
+        last_scan = time.monotonic()
+        while True:
+            timeout = max(0.0, last_scan + self.rescan_interval - time.monotonic())
+            ready = self._wait([inotify.fd], timeout)
+            if ready is None:
+                return
+            if ready and not self._relevant(inotify.read()):
+                continue
+            if ready:
+                # A plug creates several nodes and permission changes;
+                # scan once the burst is over.
+                while True:
+                    ready = self._wait([inotify.fd], self.settle)
+                    if ready is None:
+                        return
+                    if not ready:
+                        break
+                    inotify.read()
+            self.rescan()
+            last_scan = time.monotonic()
+
+    def _relevant(self, events):
+        relevant = False
+        for mask, name in events:
+            if mask & IN_Q_OVERFLOW or _NODE.match(name):
+                self.events += 1
+                relevant = True
+        return relevant
+
+    def _poll(self):
+        while self._wait([], self.poll_interval) is not None:
+            self.rescan()
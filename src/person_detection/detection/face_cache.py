@@ -0,0 +1,88 @@
+"""Cache of face detection results keyed by person track or position."""
+
+import threading
+import time
+from collections import OrderedDict
+from ..core.config import Config
+
+
+def spatial_key(box, grid=Config.FACE_CACHE_GRID):
+    """Key a person box by its position snapped to a coarse grid."""
+    return ("spatial",) + tuple(int(v) // grid for v in box)
+
+
+def track_key(track_id):
+    """Key a person by tracker ID; only valid for the tracker that issued it."""
+    return ("track", int(track_id))
+
+
+class FaceCache:
+    """LRU cache of face crops with a time-to-live and a memory cap.
+
+    Entries also record "no face found" so those crops are not re-run
+    either. Entries older than ``ttl`` seconds are treated as misses; the
+    least recently used entries are evicted when either ``max_entries`` or
+    ``max_bytes`` of cached face pixels is exceeded.
+    """
+
+    def __init__(self, ttl=Config.FACE_CACHE_TTL,
+                 max_entries=Config.FACE_CACHE_MAX_ENTRIES,
+                 max_bytes=Config.FACE_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, now=None):
+        """Return ``(True, face)`` for a valid entry, else ``(False, None)``."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+
+    def put(self, key, face, now=None):
+        """Store the face crop (or None for no face) found for ``key``."""
+        now = time.monotonic() if now is None else now
+        if face is not None:
+            face = face.copy()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (now, face)
+            self.bytes += face.nbytes if face is not None else 0
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, face = self._entries.pop(key)
+        self.bytes -= face.nbytes if face is not None else 0
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Get hit, miss, eviction and size counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+            }
@@ -0,0 +1,87 @@
+"""Latest-frame-wins buffers for handing frames between pipeline stages."""
+
+import threading
+from collections import deque
+
+
+class FrameBuffer:
+    """Small thread-safe ring buffer where the newest frame always wins.
+
+    Producers never block: when the buffer is full the oldest frame is
+    overwritten and counted as dropped. Consumers take the newest frame and
+    discard anything older, so a slow consumer never falls behind the
+    producer by more than one frame.
+
+    ``on_drop`` is called with every frame that is overwritten, discarded
+    or drained, e.g. ``PooledFrame.release``.
+    """
+
+    def __init__(self, capacity=1, on_drop=None):
+        if capacity < 1:
+            raise ValueError("FrameBuffer capacity must be at least 1")
+        self._frames = deque(maxlen=capacity)
+        self._on_drop = on_drop
+        self._cond = threading.Condition()
+        self._closed = False
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        """Store a frame, overwriting the oldest one if the buffer is full."""
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1
+                self._drop(self._frames[0])
+            self._frames.append(frame)
+            self.put_count += 1
+            self._cond.notify()
+
+    def get_latest(self, timeout=None):
+        """Return the newest frame, discarding older ones.
+
+        Returns None if no frame arrived within ``timeout`` seconds or the
+        buffer was closed.
+        """
+        with self._cond:
+            if not self._frames and not self._closed:
+                self._cond.wait(timeout)
+            if not self._frames:
+                return None
+            frame = self._frames.pop()
+            self.dropped += len(self._frames)
+            while self._frames:
+                self._drop(self._frames.popleft())
+            self.get_count += 1
+            return frame
+
+    def close(self):
+        """Wake up any waiting consumer; later gets return immediately."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def drain(self):
+        """Discard every buffered frame without counting it as dropped."""
+        with self._cond:
+            while self._frames:
+                self._drop(self._frames.popleft())
+
+    def _drop(self, frame):
+        if self._on_drop is not None:
+            self._on_drop(frame)
+
+    @property
+    def closed(self):
+        """Whether the buffer has been closed."""
+        return self._closed
+
+    def stats(self):
+        """Get put/get/dropped counters for this buffer."""
+        with self._cond:
+            return {
+                "put": self.put_count,
+                "get": self.get_count,
+                "dropped": self.dropped,
+                "depth": len(self._frames),
+            }
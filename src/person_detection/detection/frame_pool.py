@@ -0,0 +1,138 @@
+"""Pooled, reference-counted frame buffers for the capture-to-display path."""
+
+import threading
+from collections import defaultdict
+from ..core.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+class PooledFrame:
+    """A frame array that returns to its pool when the last holder releases it.
+
+    Every stage that keeps the frame beyond the current call (the capture
+    buffer, the display hand-off, the snapshot used for Telegram) calls
+    ``retain`` and later ``release``. Nothing copies the pixels; the array is
+    reused for a later frame once the count drops to zero, so no holder may
+    touch ``array`` after releasing it.
+
+    Frame sources stamp ``timestamp`` (``time.monotonic()`` at capture),
+    ``position`` (seconds into the source) and ``sequence``.
+    """
+
+    __slots__ = ("array", "_pool", "_refs", "timestamp", "position", "sequence")
+
+    def __init__(self, array, pool):
+        self.array = array
+        self._pool = pool
+        self._refs = 1
+        self.timestamp = None
+        self.position = None
+        self.sequence = None
+
+    def retain(self):
+        """Add a holder; returns ``self`` for chaining."""
+        with self._pool._lock:
+            if self._refs <= 0:
+                raise RuntimeError("PooledFrame retained after it was returned to the pool")
+            self._refs += 1
+        return self
+
+    def release(self):
+        """Drop a holder, returning the array to the pool on the last release."""
+        with self._pool._lock:
+            if self._refs <= 0:
+                raise RuntimeError("PooledFrame released more times than it was retained")
+            self._refs -= 1
+            if self._refs == 0:
+                self._pool._recycle(self.array)
+
+    @property
+    def refs(self):
+        """Current number of holders."""
+        return self._refs
+
+
+class FramePool:
+    """Thread-safe free lists of frame arrays keyed by shape and dtype.
+
+    ``acquire`` hands out a recycled array when one of the right shape is
+    free and allocates otherwise; at most ``max_free`` arrays per shape are
+    kept, so a resolution change does not pin old buffers forever.
+    """
+
+    def __init__(self, max_free=4):
+        self.max_free = max_free
+        self._free = defaultdict(list)
+        self._lock = threading.Lock()
+        self.allocated = 0
+        self.reused = 0
+        self.outstanding = 0
+
+    def acquire(self, shape, dtype="uint8"):
+        """Get a ``PooledFrame`` with uninitialised pixels and one holder."""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                array = free.pop()
+                self.reused += 1
+            else:
+                array = None
+                self.allocated += 1
+            self.outstanding += 1
+        if array is None:
+            array = np.empty(shape, dtype=dtype)
+        return PooledFrame(array, self)
+
+    def adopt(self, array):
+        """Wrap an array allocated elsewhere so it is recycled into this pool."""
+        with self._lock:
+            self.allocated += 1
+            self.outstanding += 1
+        return PooledFrame(array, self)
+
+    def _recycle(self, array):
+        # Called with self._lock held.
+        self.outstanding -= 1
+        free = self._free[(array.shape, array.dtype.str)]
+        if len(free) < self.max_free:
+            free.append(array)
+
+    def clear(self):
+        """Drop every free array."""
+        with self._lock:
+            self._free.clear()
+
+    def stats(self):
+        """Get allocation, reuse and outstanding-frame counters."""
+        with self._lock:
+            return {
+                "allocated": self.allocated,
+                "reused": self.reused,
+                "outstanding": self.outstanding,
+                "free": sum(len(free) for free in self._free.values()),
+            }
+
+
+def read_pooled(cap, pool, shape=None):
+    """Read the next frame from ``cap`` straight into a pooled array.
+
+    ``shape`` is the frame shape seen on the previous read; pass None for the
+    first read, which lets OpenCV allocate and adopts the result. Returns
+    ``(ret, frame)`` like ``cap.read`` but with a ``PooledFrame`` (or None).
+    """
+    if shape is None:
+        ret, array = cap.read()
+        return ret, (pool.adopt(array) if ret else None)
+
+    frame = pool.acquire(shape)
+    ret, array = cap.read(frame.array)
+    if not ret:
+        frame.release()
+        return False, None
+    if array is not frame.array:
+        # The source changed resolution and OpenCV allocated a new array.
+        frame.release()
+        frame = pool.adopt(array)
+    return True, frame
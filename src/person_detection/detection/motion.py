@@ -0,0 +1,77 @@
+"""Cheap motion gating to skip person inference on static scenes."""
+
+import time
+from ..core.config import Config
+from ..core.lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+
+
+class MotionGate:
+    """Decides per frame whether the scene changed enough to run inference.
+
+    Frames are downscaled to grayscale and compared with the frame from the
+    last inference, so slow movement still accumulates into a trigger.
+    Inference is also forced every ``refresh_seconds`` to pick up anything
+    the difference test missed.
+    """
+
+    def __init__(self, threshold=Config.MOTION_THRESHOLD,
+                 pixel_delta=Config.MOTION_PIXEL_DELTA,
+                 refresh_seconds=Config.MOTION_REFRESH_SECONDS,
+                 width=Config.MOTION_DOWNSCALE_WIDTH):
+        self.threshold = threshold
+        self.pixel_delta = pixel_delta
+        self.refresh_seconds = refresh_seconds
+        self.width = width
+        self._reference = None
+        self._last_inference = 0.0
+        self.frames = 0
+        self.skipped = 0
+        self.last_motion = 0.0
+
+    def _downscale(self, frame):
+        h, w = frame.shape[:2]
+        height = max(1, int(h * self.width / w))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_infer(self, frame, now=None):
+        """Return True if inference should run on this frame."""
+        now = time.monotonic() if now is None else now
+        self.frames += 1
+        small = self._downscale(frame)
+
+        if self._reference is None or self._reference.shape != small.shape:
+            self.last_motion = 1.0
+        else:
+            diff = cv2.absdiff(small, self._reference)
+            changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_delta, 255, cv2.THRESH_BINARY)[1])
+            self.last_motion = changed / diff.size
+
+        if (self.last_motion >= self.threshold
+                or now - self._last_inference >= self.refresh_seconds):
+            self._reference = small
+            self._last_inference = now
+            return True
+
+        self.skipped += 1
+        return False
+
+    def reset(self):
+        """Force inference on the next frame."""
+        self._reference = None
+
+    @property
+    def skip_fraction(self):
+        """Fraction of frames on which inference was skipped."""
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def stats(self):
+        """Get frame, skipped and skip-fraction counters."""
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "skip_fraction": round(self.skip_fraction, 4),
+        }
@@ -0,0 +1,309 @@
+"""Event-triggered clip recording with an in-memory pre-roll."""
+
+import math
+import os
+import queue
+import re
+import threading
+import time
+from ..core.config import Config
+from ..core.lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+_STOP = object()
+
+
+class JpegRing:
+    """Fixed number of JPEG-compressed frames; the oldest is overwritten."""
+
+    def __init__(self, capacity, quality=Config.CLIP_JPEG_QUALITY):
+        self.capacity = capacity
+        self.quality = quality
+        self._frames = [None] * capacity
+        self._timestamps = [0.0] * capacity
+        self._next = 0
+        self._count = 0
+
+    def append(self, timestamp, image):
+        ok, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), self.quality])
+        if not ok:
+            raise ValueError("Could not encode frame as JPEG")
+        data = buffer.tobytes()
+        self._frames[self._next] = data
+        self._timestamps[self._next] = timestamp
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        return data
+
+    def items(self):
+        """``(timestamp, jpeg_bytes)`` from oldest to newest."""
+        start = (self._next - self._count) % self.capacity
+        order = [(start + i) % self.capacity for i in range(self._count)]
+        return [(self._timestamps[i], self._frames[i]) for i in order]
+
+    @property
+    def nbytes(self):
+        return sum(len(data) for data in self._frames if data is not None)
+
+    def __len__(self):
+        return self._count
+
+
+class RawRing:
+    """Fixed number of raw frames in one array allocated on the first frame.
+
+    A frame of a different shape resets the ring to that shape.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._frames = None
+        self._timestamps = [0.0] * capacity
+        self._next = 0
+        self._count = 0
+
+    def append(self, timestamp, image):
+        if self._frames is None or self._frames.shape[1:] != image.shape:
+            self._frames = np.empty((self.capacity,) + image.shape, dtype=image.dtype)
+            self._next = self._count = 0
+        slot = self._frames[self._next]
+        np.copyto(slot, image)
+        self._timestamps[self._next] = timestamp
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        return slot
+
+    def items(self):
+        """``(timestamp, frame)`` from oldest to newest, copied out of the ring."""
+        start = (self._next - self._count) % self.capacity
+        order = [(start + i) % self.capacity for i in range(self._count)]
+        frames = self._frames[order] if order else []
+        return [(self._timestamps[i], frame) for i, frame in zip(order, frames)]
+
+    @property
+    def nbytes(self):
+        return self._frames.nbytes if self._frames is not None else 0
+
+    def __len__(self):
+        return self._count
+
+
+class Clip:
+    """One recording: where it goes and what it has seen so far."""
+
+    def __init__(self, camera, started, wall_time):
+        self.camera = camera
+        self.started = started
+        self.wall_time = wall_time
+        self.last_seen = started
+        self.persons = 0
+        self.frames = 0
+        self.path = None
+        self.writer = None
+
+
+class _CameraState:
+    def __init__(self, ring):
+        self.ring = ring
+        self.clip = None
+
+
+class ClipRecorder:
+    """Keeps a pre-roll per camera and writes clips around person detections.
+
+    ``push`` is called from the video loop with every annotated frame. It
+    keeps at most ``fps`` frames per second, retains the pooled frame and
+    queues it without blocking; a full queue drops the frame. A recorder
+    thread compresses kept frames into each camera's pre-roll ring
+    (``storage`` "jpeg", or "raw" for one preallocated array per camera).
+
+    When persons appear the ring's contents open a clip, and frames keep
+    being added until ``post_roll`` seconds after the last person was seen,
+    or the clip reaches ``max_seconds``. Clips are streamed to an encoder
+    thread that writes them to ``directory`` as they grow, so neither
+    encoding nor file I/O ever runs on the video loop and a long clip is
+    never held in memory.
+    """
+
+    def __init__(self, directory=Config.CLIP_DIR, pre_roll=Config.CLIP_PRE_ROLL_SECONDS,
+                 post_roll=Config.CLIP_POST_ROLL_SECONDS, max_seconds=Config.CLIP_MAX_SECONDS,
+                 fps=Config.CLIP_FPS, storage=Config.CLIP_STORAGE,
+                 queue_size=Config.CLIP_QUEUE_SIZE, codec=Config.CLIP_CODEC):
+        if storage not in ("jpeg", "raw"):
+            raise ValueError(f"Unknown clip storage: {storage!r}")
+        self.directory = directory
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self.max_seconds = max_seconds
+        self.fps = fps
+        self.storage = storage
+        self.codec = codec
+        self.capacity = max(1, int(round(pre_roll * fps)))
+        self._frames = queue.Queue(maxsize=queue_size)
+        # Bounded so a slow disk backs up into dropped frames, not memory.
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._cameras = {}
+        self._last_slot = {}
+        self._pending_persons = {}
+        self._recorder = None
+        self._encoder = None
+        self.pushed = 0
+        self.dropped = 0
+        self.clips_written = 0
+        self.written = []
+
+    def start(self):
+        """Start the recorder and encoder threads."""
+        if self._recorder is not None:
+            return
+        self._recorder = threading.Thread(target=self._record_loop, name="clip-recorder", daemon=True)
+        self._encoder = threading.Thread(target=self._encode_loop, name="clip-encoder", daemon=True)
+        self._recorder.start()
+        self._encoder.start()
+
+    def push(self, camera, frame, persons):
+        """Offer one annotated ``PooledFrame``; never blocks.
+
+        Returns True if the frame was queued for recording.
+        """
+        timestamp = frame.timestamp if frame.timestamp is not None else time.monotonic()
+        self._pending_persons[camera] = max(self._pending_persons.get(camera, 0), persons)
+        # Keep the first frame of every 1/fps slot, so any input rate
+        # averages out to ``fps``.
+        slot = math.floor(timestamp * self.fps)
+        if self._last_slot.get(camera) == slot:
+            return False
+        self._last_slot[camera] = slot
+        persons = self._pending_persons.pop(camera)
+        frame.retain()
+        try:
+            self._frames.put_nowait((camera, frame, timestamp, persons))
+        except queue.Full:
+            frame.release()
+            self.dropped += 1
+            return False
+        self.pushed += 1
+        return True
+
+    def _record_loop(self):
+        while True:
+            item = self._frames.get()
+            if item is _STOP:
+                break
+            camera, frame, timestamp, persons = item
+            try:
+                self._record(camera, frame.array, timestamp, persons)
+            except Exception as e:
+                print(f"Clip recorder error on {camera}: {e}")
+            finally:
+                frame.release()
+        for state in self._cameras.values():
+            if state.clip is not None:
+                self._finish(state)
+        self._jobs.put(_STOP)
+
+    def _record(self, camera, image, timestamp, persons):
+        state = self._cameras.get(camera)
+        if state is None:
+            ring = JpegRing(self.capacity) if self.storage == "jpeg" else RawRing(self.capacity)
+            state = self._cameras[camera] = _CameraState(ring)
+
+        clip = state.clip
+        if clip is None and persons > 0:
+            # The pre-roll opens the clip; the ring keeps running for the next one.
+            clip = state.clip = Clip(camera, timestamp, time.time())
+            self._jobs.put(("frames", clip, state.ring.items()))
+
+        data = state.ring.append(timestamp, image)
+        if clip is None:
+            return
+        # Raw ring slots are overwritten later; JPEG bytes are immutable.
+        self._jobs.put(("frames", clip, [(timestamp, data.copy() if self.storage == "raw" else data)]))
+        if persons > 0:
+            clip.last_seen = timestamp
+            clip.persons = max(clip.persons, persons)
+        if (timestamp - clip.last_seen >= self.post_roll
+                or timestamp - clip.started >= self.max_seconds):
+            self._finish(state)
+
+    def _finish(self, state):
+        self._jobs.put(("close", state.clip, None))
+        state.clip = None
+
+    def _encode_loop(self):
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                break
+            action, clip, frames = job
+            try:
+                if action == "frames":
+                    self._write(clip, frames)
+                else:
+                    self._close_clip(clip)
+            except Exception as e:
+                print(f"Could not write clip for {clip.camera}: {e}")
+                if clip.writer is not None:
+                    clip.writer.release()
+                    clip.writer = None
+
+    def clip_path(self, clip):
+        """File name for ``clip``: camera name and the wall time it was triggered."""
+        camera = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(clip.camera)).strip("_") or "camera"
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(clip.wall_time))
+        path = os.path.join(self.directory, f"{camera}_{stamp}.mp4")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{camera}_{stamp}_{suffix}.mp4")
+            suffix += 1
+        return path
+
+    def _write(self, clip, frames):
+        for _, data in frames:
+            image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) \
+                if isinstance(data, bytes) else data
+            if clip.writer is None:
+                if clip.path is not None:
+                    return  # the writer failed earlier; drop the rest of the clip
+                os.makedirs(self.directory, exist_ok=True)
+                clip.path = self.clip_path(clip)
+                h, w = image.shape[:2]
+                clip.writer = cv2.VideoWriter(clip.path, cv2.VideoWriter_fourcc(*self.codec),
+                                              self.fps, (w, h))
+                if not clip.writer.isOpened():
+                    clip.writer = None
+                    raise OSError(f"Could not open video writer for {clip.path}")
+            clip.writer.write(image)
+            clip.frames += 1
+
+    def _close_clip(self, clip):
+        if clip.writer is None:
+            return
+        clip.writer.release()
+        clip.writer = None
+        self.clips_written += 1
+        self.written.append(clip.path)
+        print(f"Clip saved: {clip.path} ({clip.frames} frames, up to {clip.persons} persons)")
+
+    def close(self, timeout=10):
+        """Finish open clips, write every pending clip and stop the threads."""
+        if self._recorder is None:
+            return
+        self._frames.put(_STOP, timeout=timeout)
+        self._recorder.join(timeout)
+        self._encoder.join(timeout)
+        self._recorder = self._encoder = None
+
+    def stats(self):
+        """Get frame, drop and clip counters and the pre-roll memory in use."""
+        return {
+            "pushed": self.pushed,
+            "dropped": self.dropped,
+            "queued": self._frames.qsize(),
+            "recording": sum(1 for s in self._cameras.values() if s.clip is not None),
+            "encoder_queued": self._jobs.qsize(),
+            "clips_written": self.clips_written,
+            "pre_roll_bytes": sum(s.ring.nbytes for s in self._cameras.values()),
+        }
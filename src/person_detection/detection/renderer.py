@@ -0,0 +1,105 @@
+"""Single-pass annotation rendering for person detections."""
+
+from ..core.lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+BOX_COLOR = (0, 150, 0)
+EDGE_COLOR = (0, 0, 255)
+LABEL_COLOR = (0, 255, 0)
+COUNT_COLOR = (255, 0, 0)
+BOX_RADIUS = 8
+OVERLAY_ALPHA = 0.4
+
+
+def draw_rounded_shape(img, x1, y1, x2, y2, color, radius, edge_color=EDGE_COLOR):
+    """Draw a filled rounded rectangle shape directly onto ``img``."""
+    cv2.rectangle(img, (x1 + radius, y1), (x2 - radius, y2), color, -1)
+    cv2.rectangle(img, (x1, y1 + radius), (x2, y2 - radius), color, -1)
+    cv2.circle(img, (x1 + radius, y1 + radius), radius, edge_color, -1)
+    cv2.circle(img, (x2 - radius, y1 + radius), radius, edge_color, -1)
+    cv2.circle(img, (x1 + radius, y2 - radius), radius, edge_color, -1)
+    cv2.circle(img, (x2 - radius, y2 - radius), radius, edge_color, -1)
+
+
+class AnnotationRenderer:
+    """Draws every box of a frame into one shared overlay and blends once.
+
+    Only the regions covered by boxes are copied and blended, so the cost
+    grows with the boxed area rather than persons x frame size. The overlay
+    buffers are reused across frames of the same size.
+
+    For non-overlapping boxes the output matches drawing each box with
+    ``draw_rounded_rectangle`` in turn; where boxes overlap the shared
+    overlay is blended once instead of once per box.
+    """
+
+    def __init__(self, radius=BOX_RADIUS, alpha=OVERLAY_ALPHA):
+        self.radius = radius
+        self.alpha = alpha
+        self._base = None
+        self._overlay = None
+
+    def _buffers(self, frame):
+        if self._base is None or self._base.shape != frame.shape or self._base.dtype != frame.dtype:
+            self._base = np.empty_like(frame)
+            self._overlay = np.empty_like(frame)
+        return self._base, self._overlay
+
+    def _dirty_regions(self, boxes, height, width):
+        """Clip each box, padded by the corner radius, to the frame."""
+        pad = self.radius
+        regions = []
+        for x1, y1, x2, y2 in boxes:
+            rx1, ry1 = max(0, min(x1, x2) - pad), max(0, min(y1, y2) - pad)
+            rx2, ry2 = min(width, max(x1, x2) + pad + 1), min(height, max(y1, y2) + pad + 1)
+            if rx2 > rx1 and ry2 > ry1:
+                regions.append((rx1, ry1, rx2, ry2))
+        return regions
+
+    def blend_boxes(self, frame, boxes, color=BOX_COLOR):
+        """Blend rounded box shapes for all ``boxes`` into ``frame`` in place."""
+        if len(boxes) == 0:
+            return frame
+        height, width = frame.shape[:2]
+        regions = self._dirty_regions(boxes, height, width)
+        if not regions:
+            return frame
+
+        base, overlay = self._buffers(frame)
+        for rx1, ry1, rx2, ry2 in regions:
+            base[ry1:ry2, rx1:rx2] = frame[ry1:ry2, rx1:rx2]
+            overlay[ry1:ry2, rx1:rx2] = frame[ry1:ry2, rx1:rx2]
+
+        for x1, y1, x2, y2 in boxes:
+            draw_rounded_shape(overlay, int(x1), int(y1), int(x2), int(y2), color, self.radius)
+
+        # Each region blends from the untouched base copy, so overlapping
+        # regions write identical values instead of compounding the blend.
+        for rx1, ry1, rx2, ry2 in regions:
+            frame[ry1:ry2, rx1:rx2] = cv2.addWeighted(
+                overlay[ry1:ry2, rx1:rx2], self.alpha,
+                base[ry1:ry2, rx1:rx2], 1.0 - self.alpha, 0
+            )
+        return frame
+
+    def render(self, frame, detections, show_accuracy=False, track_ids=None):
+        """Draw boxes, optional confidence labels and the person count.
+
+        When ``track_ids`` is given, labels are prefixed with each track ID.
+        """
+        boxes = [box for box, _ in detections]
+        self.blend_boxes(frame, boxes)
+
+        if show_accuracy:
+            for i, ((x1, y1, x2, y2), conf) in enumerate(detections):
+                label = f'Person: {round(conf, 2)}'
+                if track_ids is not None:
+                    label = f'#{track_ids[i]} {label}'
+                (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+                cv2.rectangle(frame, (x1, y1 - label_h - 10), (x1 + label_w, y1), LABEL_COLOR, cv2.FILLED)
+                cv2.putText(frame, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+
+        cv2.putText(frame, f'Persons: {len(detections)}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, COUNT_COLOR, 2)
+        return frame
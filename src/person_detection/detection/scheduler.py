@@ -0,0 +1,73 @@
+"""Adaptive inference stride driven by measured latency and CPU headroom."""
+
+import math
+import os
+from ..core.config import Config
+
+
+def cpu_headroom():
+    """Estimate the idle fraction of the CPUs from the 1-minute load average."""
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return 1.0
+    cpus = os.cpu_count() or 1
+    return max(0.0, 1.0 - load / cpus)
+
+
+class InferenceScheduler:
+    """Chooses how often (every Nth frame) inference runs.
+
+    Inference latency is tracked as an exponential moving average. The
+    stride is the number of frames needed to fit one inference into the
+    per-frame latency budget, plus one more while the CPUs have less than
+    ``min_headroom`` idle. Frames in between are shown with the last boxes.
+    """
+
+    def __init__(self, budget_ms=Config.INFERENCE_BUDGET_MS,
+                 max_stride=Config.MAX_INFERENCE_STRIDE,
+                 min_headroom=Config.MIN_CPU_HEADROOM,
+                 smoothing=Config.LATENCY_SMOOTHING,
+                 headroom_fn=cpu_headroom):
+        self.budget = budget_ms / 1000.0
+        self.max_stride = max_stride
+        self.min_headroom = min_headroom
+        self.smoothing = smoothing
+        self.headroom_fn = headroom_fn
+        self.latency = None
+        self.stride = 1
+        self._countdown = 0
+        self.frames = 0
+        self.inferred = 0
+
+    def should_infer(self):
+        """Return True if inference should run on the current frame."""
+        self.frames += 1
+        if self._countdown <= 0:
+            self._countdown = self.stride - 1
+            self.inferred += 1
+            return True
+        self._countdown -= 1
+        return False
+
+    def record(self, seconds):
+        """Feed the measured latency of one inference and update the stride."""
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += self.smoothing * (seconds - self.latency)
+
+        stride = max(1, math.ceil(self.latency / self.budget))
+        if self.headroom_fn() < self.min_headroom:
+            stride += 1
+        self.stride = min(self.max_stride, stride)
+        self._countdown = min(self._countdown, self.stride - 1)
+
+    def stats(self):
+        """Get the current stride, smoothed latency and inferred-frame counts."""
+        return {
+            "stride": self.stride,
+            "latency_ms": round(self.latency * 1000, 2) if self.latency is not None else None,
+            "frames": self.frames,
+            "inferred": self.inferred,
+        }
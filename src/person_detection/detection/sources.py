@@ -0,0 +1,413 @@
+"""Frame sources: cameras, video files, image sequences and network streams.
+
+Every source reads into pooled frames stamped with a capture time, a
+position in the source and a sequence number, reconnects with exponential
+backoff when a live source fails, and can run a prefetch thread that feeds
+a ``FrameBuffer`` (live use, newest frame wins) or yields every frame in
+order (deterministic replay).
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from ..core.config import Config
+from ..core.lazy_import import lazy_import
+from ..core.metrics import STAGE_SECONDS
+from .frame_pool import FramePool, read_pooled
+
+cv2 = lazy_import("cv2")
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+STREAM_SCHEMES = ('rtsp://', 'rtsps://', 'rtmp://', 'http://', 'https://', 'udp://', 'tcp://')
+REPLAY_OPTIONS = ('realtime', 'speed', 'loop')
+
+
+class FrameSource:
+    """Base class for frame sources.
+
+    Subclasses implement ``_open`` (return True once frames can be read),
+    ``_read`` (return a ``PooledFrame``, or None on failure) and ``_close``.
+    A finite source sets ``ended`` when it runs out of frames, which stops
+    ``read`` instead of triggering a reconnect.
+
+    ``read`` is meant for one thread at a time: the prefetch thread when
+    ``start`` or ``frames`` is used, otherwise the caller.
+    """
+
+    live = True
+
+    def __init__(self, name, pool=None, reconnect=True,
+                 backoff=Config.SOURCE_RECONNECT_BACKOFF,
+                 max_backoff=Config.SOURCE_RECONNECT_MAX_BACKOFF,
+                 max_retries=None):
+        self.name = name
+        self.pool = pool if pool is not None else FramePool(Config.FRAME_POOL_SIZE)
+        self.reconnect = reconnect
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.opened = False
+        self.ended = False
+        self.frames_read = 0
+        self.reconnects = 0
+        self.error = None
+        self._opened_at = None
+        self._sequence = 0
+        # Includes waiting on the device, so a live camera shows its frame interval.
+        self.capture_time = STAGE_SECONDS.labels(name, "capture")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def _position(self, timestamp):
+        """Seconds into the source for the frame just read; live sources count from the first open."""
+        return timestamp - self._opened_at
+
+    def _pace(self, frame):
+        """Hook for real-time replay; returns False if stopped while waiting."""
+        return True
+
+    @property
+    def opened_at(self):
+        """Monotonic time of the first successful open, or None if it never opened."""
+        return self._opened_at
+
+    def _try_open(self):
+        try:
+            self.opened = bool(self._open())
+        except Exception as e:
+            print(f"{self.name}: could not open source: {e}", file=sys.stderr)
+            self.opened = False
+        if self.opened:
+            if self._opened_at is None:
+                self._opened_at = time.monotonic()
+        else:
+            self._close()
+        return self.opened
+
+    def _shutdown(self):
+        self.opened = False
+        self._close()
+
+    def read(self):
+        """Return the next frame, reconnecting on failure.
+
+        Returns None once a finite source has ended, reconnecting is off or
+        out of retries, or the source was stopped.
+        """
+        delay = self.backoff
+        failures = 0
+        while not self._stop.is_set():
+            if self.opened or self._try_open():
+                start = time.perf_counter()
+                frame = self._read()
+                if frame is not None:
+                    self.capture_time.observe_since(start)
+                    frame.timestamp = time.monotonic()
+                    frame.position = self._position(frame.timestamp)
+                    frame.sequence = self._sequence
+                    self._sequence += 1
+                    self.frames_read += 1
+                    if not self._pace(frame):
+                        frame.release()
+                        return None
+                    return frame
+                self._shutdown()
+            if self.ended:
+                return None
+            failures += 1
+            if not self.reconnect or (self.max_retries is not None and failures > self.max_retries):
+                print(f"{self.name}: giving up after {failures} failed attempt(s)", file=sys.stderr)
+                return None
+            print(f"{self.name}: no frames, reconnecting in {delay:.1f}s", file=sys.stderr)
+            if self._stop.wait(delay):
+                return None
+            delay = min(delay * 2, self.max_backoff)
+            self.reconnects += 1
+        return None
+
+    def start(self, buffer):
+        """Read on a prefetch thread into ``buffer`` until stopped; closes it at the end."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._prefetch, args=(buffer,),
+                                        name=f"capture-{self.name}", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _prefetch(self, buffer):
+        try:
+            while not self._stop.is_set():
+                frame = self.read()
+                if frame is None:
+                    break
+                buffer.put(frame)
+        except Exception as e:
+            print(f"{self.name}: capture stopped: {e}", file=sys.stderr)
+            self.error = e
+        finally:
+            self._shutdown()
+            buffer.close()
+
+    def frames(self, prefetch=Config.SOURCE_PREFETCH):
+        """Yield every frame in order while a thread decodes up to ``prefetch`` ahead.
+
+        Nothing is dropped: the prefetch thread waits when the consumer
+        falls behind. The caller releases each frame. A read error ends the
+        frames and is kept in ``error``.
+        """
+        frames = queue.Queue(maxsize=max(1, prefetch))
+        self._stop.clear()
+
+        def produce():
+            try:
+                while True:
+                    try:
+                        frame = self.read()
+                    except Exception as e:
+                        print(f"{self.name}: capture stopped: {e}", file=sys.stderr)
+                        self.error = e
+                        frame = None
+                    while True:
+                        try:
+                            frames.put(frame, timeout=0.1)
+                            break
+                        except queue.Full:
+                            if self._stop.is_set():
+                                if frame is not None:
+                                    frame.release()
+                                return
+                    if frame is None:
+                        return
+            finally:
+                self._shutdown()
+
+        self._thread = threading.Thread(target=produce, name=f"prefetch-{self.name}", daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.stop()
+            while True:
+                try:
+                    frame = frames.get_nowait()
+                except queue.Empty:
+                    break
+                if frame is not None:
+                    frame.release()
+
+    def stop(self, timeout=2):
+        """Stop reading and wait for the prefetch thread."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if thread is None:
+            self._shutdown()
+
+    def stats(self):
+        """Get frame and reconnect counters."""
+        return {"frames": self.frames_read, "reconnects": self.reconnects, "ended": self.ended}
+
+
+class CaptureSource(FrameSource):
+    """A source read through ``cv2.VideoCapture``, decoding into pooled frames."""
+
+    def __init__(self, address, name=None, pool=None, **kwargs):
+        super().__init__(name or str(address), pool, **kwargs)
+        self.address = address
+        self._cap = None
+        self._shape = None
+
+    def _create_capture(self):
+        return cv2.VideoCapture(self.address)
+
+    def _configure(self, cap):
+        pass
+
+    def _open(self):
+        cap = self._create_capture()
+        if not cap.isOpened():
+            cap.release()
+            return False
+        self._configure(cap)
+        self._cap = cap
+        self._shape = None
+        return True
+
+    def _read(self):
+        ret, frame = read_pooled(self._cap, self.pool, self._shape)
+        if not ret:
+            return None
+        self._shape = frame.array.shape
+        return frame
+
+    def _close(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class V4L2Source(CaptureSource):
+    """A local camera, reopened with backoff if it stops delivering frames."""
+
+    def _configure(self, cap):
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, Config.DEFAULT_FRAME_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, Config.DEFAULT_FRAME_HEIGHT)
+        cap.set(cv2.CAP_PROP_FPS, Config.DEFAULT_FPS)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+class NetworkStreamSource(CaptureSource):
+    """An RTSP/HTTP stream opened through FFmpeg with open and read timeouts."""
+
+    def __init__(self, url, name=None, pool=None,
+                 open_timeout_ms=Config.STREAM_OPEN_TIMEOUT_MS,
+                 read_timeout_ms=Config.STREAM_READ_TIMEOUT_MS, **kwargs):
+        super().__init__(url, name, pool, **kwargs)
+        self.open_timeout_ms = open_timeout_ms
+        self.read_timeout_ms = read_timeout_ms
+
+    def _create_capture(self):
+        params = []
+        if hasattr(cv2, "CAP_PROP_OPEN_TIMEOUT_MSEC"):
+            params += [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, self.open_timeout_ms,
+                       cv2.CAP_PROP_READ_TIMEOUT_MSEC, self.read_timeout_ms]
+        return cv2.VideoCapture(self.address, cv2.CAP_FFMPEG, params)
+
+    def _configure(self, cap):
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+class _Replay:
+    """Real-time pacing for finite sources, from each frame's ``position``."""
+
+    def _init_replay(self, realtime, speed, loop):
+        self.live = False
+        self.realtime = realtime
+        self.speed = speed
+        self.loop = loop
+        self._clock_start = None
+        self._last_position = None
+
+    def _pace(self, frame):
+        if not self.realtime:
+            return True
+        now = time.monotonic()
+        if self._clock_start is None or frame.position < self._last_position:
+            # First frame, or the replay looped: restart the clock.
+            self._clock_start = now - frame.position / self.speed
+        self._last_position = frame.position
+        delay = self._clock_start + frame.position / self.speed - now
+        return delay <= 0 or not self._stop.wait(delay)
+
+
+class VideoFileSource(_Replay, CaptureSource):
+    """A video file replayed in real time or as fast as it decodes.
+
+    ``position`` is the frame's time in the file; with ``loop`` the file
+    starts over at the end instead of ending.
+    """
+
+    def __init__(self, path, name=None, pool=None, realtime=False, speed=1.0, loop=False, **kwargs):
+        kwargs.setdefault("reconnect", False)
+        super().__init__(path, name or os.path.basename(path), pool, **kwargs)
+        self._init_replay(realtime, speed, loop)
+
+    def _open(self):
+        if not os.path.exists(self.address):
+            self.ended = True
+            return False
+        return super()._open()
+
+    def _read(self):
+        frame = super()._read()
+        if frame is None and self.loop and self.frames_read:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            frame = super()._read()
+        if frame is None:
+            self.ended = True
+        return frame
+
+    def _position(self, timestamp):
+        return self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+
+class ImageSequenceSource(_Replay, FrameSource):
+    """Images from a directory in name order, as if captured at ``fps``.
+
+    An unreadable image is skipped but keeps its sequence number, so a
+    frame's ``sequence`` is always its image's index in name order.
+    """
+
+    def __init__(self, directory, name=None, pool=None, fps=Config.DEFAULT_FPS,
+                 realtime=False, speed=1.0, loop=False, **kwargs):
+        kwargs.setdefault("reconnect", False)
+        super().__init__(name or os.path.basename(os.path.normpath(directory)), pool, **kwargs)
+        self._init_replay(realtime, speed, loop)
+        self.directory = directory
+        self.fps = fps
+        self.paths = []
+        self.skipped = 0
+        self._index = 0
+
+    def _open(self):
+        try:
+            names = sorted(n for n in os.listdir(self.directory) if n.lower().endswith(IMAGE_EXTENSIONS))
+        except OSError:
+            self.ended = True
+            return False
+        self.paths = [os.path.join(self.directory, n) for n in names]
+        self._index = 0
+        return True
+
+    def _read(self):
+        while True:
+            if self._index >= len(self.paths):
+                if not (self.loop and self.paths and self.frames_read):
+                    self.ended = True
+                    return None
+                self._index = 0
+            path = self.paths[self._index]
+            self._index += 1
+            image = cv2.imread(path)
+            if image is not None:
+                return self.pool.adopt(image)
+            print(f"Skipping unreadable image: {path}", file=sys.stderr)
+            self.skipped += 1
+            self._sequence += 1
+
+    def _position(self, timestamp):
+        return (self._index - 1) / self.fps
+
+
+def open_source(spec, pool=None, **kwargs):
+    """Pick a source for ``spec``: a stream URL, image directory, video file or camera.
+
+    Camera specs are device paths such as ``/dev/video0`` or indexes.
+    Replay options (``realtime``, ``speed``, ``loop``) only apply to files
+    and image directories; live sources ignore them.
+    """
+    live_kwargs = {k: v for k, v in kwargs.items() if k not in REPLAY_OPTIONS}
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return V4L2Source(int(spec), pool=pool, **live_kwargs)
+    if spec.lower().startswith(STREAM_SCHEMES):
+        return NetworkStreamSource(spec, pool=pool, **live_kwargs)
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, pool=pool, **kwargs)
+    if os.path.dirname(spec) == Config.CAMERA_DEV_DIR and os.path.basename(spec).startswith("video"):
+        return V4L2Source(spec, pool=pool, **live_kwargs)
+    return VideoFileSource(spec, pool=pool, **kwargs)
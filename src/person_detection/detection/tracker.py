@@ -0,0 +1,176 @@
+"""Lightweight SORT-style multi-object tracker (NumPy only)."""
+
+import numpy as np
+from ..core.config import Config
+
+# Constant-velocity model over [cx, cy, area, aspect, vx, vy, varea].
+_F = np.eye(7)
+_F[0, 4] = _F[1, 5] = _F[2, 6] = 1.0
+_H = np.eye(4, 7)
+_Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001])
+_R = np.diag([1.0, 1.0, 10.0, 10.0])
+_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+
+
+def xyxy_to_z(boxes):
+    """Convert ``(N, 4)`` xyxy boxes to ``(N, 4)`` [cx, cy, area, aspect]."""
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w * h, w / np.maximum(h, 1e-6)], axis=1)
+
+
+def z_to_xyxy(z):
+    """Convert ``(N, >=4)`` [cx, cy, area, aspect, ...] states back to xyxy boxes."""
+    area = np.maximum(z[:, 2], 1e-6)
+    w = np.sqrt(area * np.maximum(z[:, 3], 1e-6))
+    h = area / np.maximum(w, 1e-6)
+    return np.stack([z[:, 0] - w / 2, z[:, 1] - h / 2, z[:, 0] + w / 2, z[:, 1] + h / 2], axis=1)
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between ``(N, 4)`` and ``(M, 4)`` xyxy boxes."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)))
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+def greedy_match(iou, threshold):
+    """Match rows to columns by descending IoU above ``threshold``.
+
+    Returns ``(row_indices, col_indices)`` of the matched pairs.
+    """
+    rows, cols = np.nonzero(iou >= threshold)
+    if rows.size == 0:
+        return rows, cols
+    order = np.argsort(-iou[rows, cols], kind="stable")
+    used_rows = np.zeros(iou.shape[0], dtype=bool)
+    used_cols = np.zeros(iou.shape[1], dtype=bool)
+    matched_rows, matched_cols = [], []
+    for r, c in zip(rows[order], cols[order]):
+        if not used_rows[r] and not used_cols[c]:
+            used_rows[r] = used_cols[c] = True
+            matched_rows.append(r)
+            matched_cols.append(c)
+    return np.asarray(matched_rows, dtype=int), np.asarray(matched_cols, dtype=int)
+
+
+class PersonTracker:
+    """Tracks person boxes across frames with stable IDs.
+
+    All track state lives in stacked arrays so a frame costs a handful of
+    vectorized operations regardless of the number of tracks. Call
+    ``update`` on frames where inference ran and ``carry`` on frames where
+    it was skipped; carried frames advance the motion model without
+    counting as misses.
+    """
+
+    def __init__(self, iou_threshold=Config.TRACK_IOU_THRESHOLD,
+                 max_age=Config.TRACK_MAX_AGE, min_hits=Config.TRACK_MIN_HITS):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self._next_id = 1
+        self.x = np.zeros((0, 7))
+        self.P = np.zeros((0, 7, 7))
+        self.ids = np.zeros(0, dtype=int)
+        self.conf = np.zeros(0)
+        self.hits = np.zeros(0, dtype=int)
+        self.misses = np.zeros(0, dtype=int)
+        self.last_detection_ids = np.zeros(0, dtype=int)
+
+    def _predict(self):
+        if len(self.x) == 0:
+            return
+        # Keep area non-negative when it is shrinking fast.
+        shrinking = self.x[:, 2] + self.x[:, 6] <= 0
+        self.x[shrinking, 6] = 0.0
+        self.x = self.x @ _F.T
+        self.P = _F @ self.P @ _F.T + _Q
+
+    def _correct(self, idx, z):
+        P = self.P[idx]
+        S = _H @ P @ _H.T + _R
+        K = P @ _H.T @ np.linalg.inv(S)
+        innovation = z - self.x[idx] @ _H.T
+        self.x[idx] += np.einsum("nij,nj->ni", K, innovation)
+        self.P[idx] = (np.eye(7) - K @ _H) @ P
+
+    def _spawn(self, z, conf):
+        count = len(z)
+        x = np.zeros((count, 7))
+        x[:, :4] = z
+        self.x = np.concatenate([self.x, x])
+        self.P = np.concatenate([self.P, np.broadcast_to(_P0, (count, 7, 7))])
+        self.ids = np.concatenate([self.ids, np.arange(self._next_id, self._next_id + count)])
+        self.conf = np.concatenate([self.conf, conf])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=int)])
+        self.misses = np.concatenate([self.misses, np.zeros(count, dtype=int)])
+        self._next_id += count
+
+    def _keep(self, mask):
+        self.x, self.P = self.x[mask], self.P[mask]
+        self.ids, self.conf = self.ids[mask], self.conf[mask]
+        self.hits, self.misses = self.hits[mask], self.misses[mask]
+
+    def update(self, boxes, confidences):
+        """Advance one inference frame with detected ``(N, 4)`` boxes.
+
+        Returns the confirmed tracks as ``(boxes, confidences, ids)``.
+        """
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        confidences = np.asarray(confidences, dtype=float).reshape(-1)
+        self._predict()
+
+        track_idx, det_idx = greedy_match(iou_matrix(z_to_xyxy(self.x), boxes), self.iou_threshold)
+        if track_idx.size:
+            self._correct(track_idx, xyxy_to_z(boxes[det_idx]))
+            self.conf[track_idx] = confidences[det_idx]
+            self.hits[track_idx] += 1
+
+        unmatched_tracks = np.ones(len(self.x), dtype=bool)
+        unmatched_tracks[track_idx] = False
+        self.misses[unmatched_tracks] += 1
+        self.misses[~unmatched_tracks] = 0
+
+        unmatched_dets = np.ones(len(boxes), dtype=bool)
+        unmatched_dets[det_idx] = False
+        detection_ids = np.zeros(len(boxes), dtype=int)
+        detection_ids[det_idx] = self.ids[track_idx]
+        detection_ids[unmatched_dets] = np.arange(self._next_id, self._next_id + unmatched_dets.sum())
+        self.last_detection_ids = detection_ids
+
+        self._keep(self.misses <= self.max_age)
+        if unmatched_dets.any():
+            self._spawn(xyxy_to_z(boxes[unmatched_dets]), confidences[unmatched_dets])
+        return self.confirmed()
+
+    def carry(self):
+        """Advance a frame without detections, carrying boxes forward."""
+        self._predict()
+        return self.confirmed()
+
+    def confirmed(self):
+        """Get confirmed tracks as ``(boxes, confidences, ids)``.
+
+        Tracks missed for up to ``max_age`` inference frames are kept at
+        their predicted position, which smooths the count over flickering
+        detections.
+        """
+        mask = self.hits >= self.min_hits
+        return z_to_xyxy(self.x[mask]).round().astype(int), self.conf[mask], self.ids[mask]
+
+    @property
+    def count(self):
+        """Smoothed person count: confirmed tracks that are still alive."""
+        return int(np.count_nonzero(self.hits >= self.min_hits))
+
+    def reset(self):
+        """Drop all tracks."""
+        self._keep(np.zeros(len(self.x), dtype=bool))
@@ -1,24 +1,27 @@
 """Main entry point for the Person Detection application."""
 
 import sys
+import time
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from .ui.main_window import MainWindow
 
 
 def main():
     """Main application entry point."""
-    # Initialize models when actually needed by UI
-    from .core.models import model_manager
-    print("Initializing models...")
-    model_manager.initialize()
+    launch_time = time.perf_counter()
     
-    # Create and run the application
+    # Create and run the application; models load in the background
     app = QApplication(sys.argv)
-    main_window = MainWindow()
+    main_window = MainWindow(launch_time)
     main_window.show()
+    QTimer.singleShot(0, lambda: print(
+        f"First window shown {time.perf_counter() - launch_time:.2f}s after launch."
+    ))
+    main_window.start_model_loading()
     
     return app.exec()
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Startup import profiling for the package entry points.
+
+Imports each entry module in a fresh interpreter under ``-X importtime``
+and prints where the time goes, grouped by top-level package. With
+``--check`` it exits non-zero when an entry point exceeds its budget in
+``Config.IMPORT_BUDGETS_MS``::
+
+    python -m person_detection.profiling
+    python -m person_detection.profiling --check
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from .core.config import Config
+
+
+def measure_imports(module, python=sys.executable):
+    """Import ``module`` in a fresh interpreter and parse ``-X importtime``.
+
+    Returns ``(total_us, by_package)`` where ``total_us`` is the cumulative
+    import time of ``module`` and ``by_package`` maps each top-level package
+    to the self time spent importing it, in microseconds.
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    total = 0
+    by_package = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        by_package[name.split(".")[0]] += int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    return total, dict(by_package)
+
+
+def print_breakdown(module, total, by_package, top=10):
+    print(f"{module}: {total / 1000:.1f} ms")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {package:<24} {self_us / 1000:8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile import time of the entry points.")
+    parser.add_argument("modules", nargs="*", default=list(Config.IMPORT_BUDGETS_MS),
+                        help="modules to import (default: headless and GUI entry points)")
+    parser.add_argument("--check", action="store_true",
+                        help="exit non-zero if a module exceeds its import budget")
+    parser.add_argument("--top", type=int, default=10, help="packages to list per module")
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    for module in args.modules:
+        try:
+            total, by_package = measure_imports(module)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            over_budget.append(module)
+            continue
+        print_breakdown(module, total, by_package, args.top)
+        budget = Config.IMPORT_BUDGETS_MS.get(module)
+        if budget is not None and total / 1000 > budget:
+            print(f"    over budget: {total / 1000:.1f} ms > {budget} ms")
+            over_budget.append(module)
+
+    return 1 if args.check and over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,12 @@
 """Telegram bot integration module."""
 
-from .bot import TelegramBot
 
-__all__ = ["TelegramBot"]
\ No newline at end of file
+def __getattr__(name):
+    # Import the bot on first use; it pulls in Qt.
+    if name == "TelegramBot":
+        from .bot import TelegramBot
+        return TelegramBot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["TelegramBot"]
@@ -3,11 +3,10 @@
 import os
 import asyncio
 import urllib.request
-import cv2
 from PyQt6.QtCore import QThread, pyqtSignal
-from telebot.async_telebot import AsyncTeleBot
-from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
-from ..database.handler import DBHelper
+from ..database.handler import AsyncDBHelper, DBHelper
+from .broadcast import Broadcaster, summarize
+from .photos import PhotoFanout, alert_items, photo_items
 
 
 class ConnectionError(Exception):
@@ -23,10 +22,14 @@ class TelegramBot(QThread):
     send_stop_camera = pyqtSignal()
     bot_status = pyqtSignal(str)
     
-    def __init__(self, database_obj: DBHelper, camera_status_callback):
+    def __init__(self, database_obj: DBHelper, camera_status_callback, alert_queue=None):
         super().__init__()
         self.db = database_obj
+        self.async_db = AsyncDBHelper(database_obj)
+        self.broadcaster = Broadcaster()
+        self.photo_fanout = PhotoFanout(self.broadcaster)
         self.camera_status_callback = camera_status_callback
+        self.alert_queue = alert_queue
         self.loop = None
         self.noconn = False
         self.bot = None
@@ -45,6 +48,7 @@ class TelegramBot(QThread):
             
             bot_token = self.db.get_bot_token()
             if bot_token is not None:
+                from telebot.async_telebot import AsyncTeleBot
                 self.bot = AsyncTeleBot(bot_token)
             else:
                 raise ConnectionError("Bot token is empty.")
@@ -62,6 +66,8 @@ class TelegramBot(QThread):
 
     def setup_handlers(self):
         """Setup bot message and callback handlers."""
+        from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
+
         @self.bot.message_handler(commands=['help', 'start'])
         async def send_welcome(message):
             text = 'Hello!'
@@ -71,12 +77,11 @@ class TelegramBot(QThread):
         async def echo_message(message):
             user_name = message.from_user.first_name
             user_id = message.from_user.id
-            if self.db.user_exists(user_id):
-                print(f"User {user_name} already exists in the database.")
-            else:
-                self.db.add_user(user_name, user_id)
+            if await self.async_db.add_user_if_missing(user_name, user_id):
                 print(f"User {user_name} added to the database.")
                 await self.bot.reply_to(message, message.text)
+            else:
+                print(f"User {user_name} already exists in the database.")
 
         @self.bot.message_handler(func=lambda message: message.text == 'sendtext' and int(message.chat.id) in self.admin_id)
         async def send_text(message):
@@ -131,6 +136,8 @@ class TelegramBot(QThread):
         self.setup_handlers()
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        if self.alert_queue is not None:
+            self.loop.create_task(self.send_alerts())
         
         try:
             self.loop.run_until_complete(self.bot.polling(none_stop=True))
@@ -142,41 +149,70 @@ class TelegramBot(QThread):
                 self.loop.close()
     
     def send_photo_to_admin(self, data, text):
-        """Send photo to admin users."""
+        """Send photo to admin users.
+
+        ``data`` is a list of ``(person, face)`` crops (``face`` may be None);
+        with ``text == "Noperson"`` it holds the full frame instead.
+        """
         if self.loop:
-            asyncio.run_coroutine_threadsafe(self.send_photoo(data, text), self.loop)
+            asyncio.run_coroutine_threadsafe(self.send_photos(data, text), self.loop)
     
-    async def send_photoo(self, data, text):
-        """Internal method to send photo via bot."""
+    async def send_photos(self, data, text):
+        """Send every crop to every admin, encoding and uploading each once."""
         print("Sending photo to admin...")
-        
-        _, buffer = cv2.imencode('.jpg', data[0])
-        photo = buffer.tobytes()
-        
+        results = await self.photo_fanout.send(self.bot, self.admin_id, photo_items(data, text))
+        for result in results:
+            if not result.ok:
+                print(f"Could not send photo to {result.recipient}: {result.error}")
         if text == "Noperson":
-            for admin in self.admin_id:
-                await self.bot.send_photo(admin, photo, caption="No person detected!")
             return
-            
-        for admin in self.admin_id:
-            await self.bot.send_photo(admin, photo, caption="Person detected!")
-        
-        if text == "pandf" and len(data) > 1:
-            _, buffer = cv2.imencode('.jpg', data[1])
-            face = buffer.tobytes()
-            for admin in self.admin_id:
-                await self.bot.send_photo(admin, face, caption="Face detected!")
         
         await self.bot.send_message(self.admin_id[0], "Photo sent to admin.")
 
+    async def send_alerts(self):
+        """Send queued person alerts to the admins as they come in.
+
+        Waiting on the queue happens in the executor; each burst the queue
+        coalesced goes out as one message of one photo per camera.
+        """
+        loop = asyncio.get_running_loop()
+        while not self.alert_queue.closed:
+            batch = await loop.run_in_executor(None, self.alert_queue.get_batch, 1.0)
+            if not batch:
+                continue
+            print(f"Sending {len(batch)} person alert(s) to admin...")
+            try:
+                results = await self.photo_fanout.send(self.bot, self.admin_id, alert_items(batch))
+            except Exception as e:
+                print(f"Could not send person alerts: {e}")
+                continue
+            for result in results:
+                if not result.ok:
+                    print(f"Could not send alert to {result.recipient}: {result.error}")
+
     async def send_message_to_all_users(self):
-        """Send message to all registered users."""
-        users = self.db.get_all_users()
-        print(f"Users: {users}")
-        for user in users:
-            user_id = user[0]
+        """Send message to all registered users.
+
+        Users are messaged concurrently within Telegram's rate limits; see
+        ``Broadcaster``.
+        """
+        users = await self.async_db.get_all_users()
+        print(f"Broadcasting to {len(users)} users...")
+
+        async def greet(user_id):
             chat = await self.bot.get_chat(user_id)
-            await self.bot.send_message(user_id, f"Hello {chat.first_name} @{chat.username}!")
+            # deliver() took the token for get_chat; send_message needs its own.
+            await self.broadcaster.bucket.acquire()
+            return await self.bot.send_message(user_id, f"Hello {chat.first_name} @{chat.username}!")
+
+        results = await self.broadcaster.broadcast([user[0] for user in users], greet)
+        summary = summarize(results)
+        for result in results:
+            if not result.ok:
+                print(f"Could not message user {result.recipient}: {result.error}")
+        print(f"Broadcast finished: {summary}")
         
         for admin in self.admin_id:
-            await self.bot.send_message(admin, "Message sent to all users.")
\ No newline at end of file
+            await self.bot.send_message(
+                admin, f"Message sent to {summary['delivered']}/{summary['recipients']} users."
+            )
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""Concurrent, rate-limited message delivery for the Telegram bot."""
+
+import asyncio
+import random
+import time
+from ..core.config import Config
+from ..core.metrics import registry
+
+SEND_SECONDS = registry.histogram(
+    "person_detection_telegram_send_seconds",
+    "Duration of one Telegram API call, per attempt, excluding rate-limit waits.",
+    ("result",),
+)
+
+
+class TokenBucket:
+    """Asyncio token bucket shared by every sender of one bot.
+
+    Tokens refill at ``rate`` per second up to ``capacity``; ``acquire``
+    waits for a token. ``pause`` empties the bucket and holds every caller
+    back for a while, which is how a 429 ``retry_after`` is honoured for the
+    whole bot rather than for one request.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("TokenBucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        # Created on first use: before Python 3.10 an asyncio.Lock binds to
+        # the loop current at construction, and the bucket is built on the
+        # GUI thread but used on the bot's own loop.
+        self._lock = None
+        self._loop = None
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Hold back every caller for ``seconds`` and drop saved-up tokens."""
+        now = self._clock()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = max(now, self._paused_until)
+
+
+class DeliveryResult:
+    """Outcome of delivering to one recipient."""
+
+    __slots__ = ("recipient", "ok", "attempts", "value", "error", "elapsed")
+
+    def __init__(self, recipient, ok, attempts, value=None, error=None, elapsed=0.0):
+        self.recipient = recipient
+        self.ok = ok
+        self.attempts = attempts
+        self.value = value
+        self.error = error
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"failed: {self.error}"
+        return f"DeliveryResult({self.recipient!r}, {status}, attempts={self.attempts})"
+
+
+def retry_after(error):
+    """Seconds Telegram asked us to wait in a 429 error, if given."""
+    result_json = getattr(error, "result_json", None) or {}
+    parameters = result_json.get("parameters") or {}
+    value = parameters.get("retry_after")
+    return float(value) if value is not None else None
+
+
+def is_transient(error):
+    """Whether an error is worth retrying: server errors, timeouts, network."""
+    code = getattr(error, "error_code", None)
+    if code is not None:
+        return code == 429 or code >= 500
+    return (isinstance(error, (OSError, asyncio.TimeoutError))
+            or type(error).__name__ == "RequestTimeout")
+
+
+class Broadcaster:
+    """Delivers to many recipients with bounded concurrency and a rate limit.
+
+    A fixed set of worker tasks pulls recipients from a queue, so thousands
+    of recipients never become thousands of pending requests. Every attempt
+    takes a token from the shared ``bucket``. A 429 pauses the bucket for
+    the ``retry_after`` Telegram sends; other transient errors back off
+    exponentially with jitter. Permanent errors (blocked bot, unknown chat)
+    are recorded without retrying.
+    """
+
+    def __init__(self, rate=Config.BROADCAST_RATE, concurrency=Config.BROADCAST_CONCURRENCY,
+                 max_retries=Config.BROADCAST_MAX_RETRIES, backoff=Config.BROADCAST_BACKOFF,
+                 bucket=None):
+        self.bucket = bucket or TokenBucket(rate, Config.BROADCAST_BURST)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limited = 0
+
+    async def broadcast(self, recipients, send):
+        """Call ``await send(recipient)`` for every recipient.
+
+        Each attempt takes one token before calling ``send``; a ``send``
+        that makes more than one API call must ``await bucket.acquire()``
+        before each further call.
+
+        Returns one ``DeliveryResult`` per recipient, in input order.
+        """
+        recipients = list(recipients)
+        results = [None] * len(recipients)
+        queue = asyncio.Queue()
+        for item in enumerate(recipients):
+            queue.put_nowait(item)
+
+        async def worker():
+            while True:
+                try:
+                    index, recipient = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[index] = await self.deliver(recipient, send)
+
+        workers = min(self.concurrency, len(recipients))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+    async def deliver(self, recipient, send):
+        """Deliver to one recipient, retrying transient errors."""
+        start = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            await self.bucket.acquire()
+            sent = time.perf_counter()
+            try:
+                value = await send(recipient)
+            except Exception as e:
+                SEND_SECONDS.labels("error").observe_since(sent)
+                delay = self._retry_delay(e, attempts)
+                if delay is None:
+                    return DeliveryResult(recipient, False, attempts, error=str(e) or type(e).__name__,
+                                          elapsed=time.monotonic() - start)
+                await asyncio.sleep(delay)
+                continue
+            SEND_SECONDS.labels("ok").observe_since(sent)
+            return DeliveryResult(recipient, True, attempts, value=value,
+                                  elapsed=time.monotonic() - start)
+
+    def _retry_delay(self, error, attempts):
+        """Seconds to wait before retrying, or None to give up."""
+        if attempts > self.max_retries or not is_transient(error):
+            return None
+        backoff = self.backoff * 2 ** (attempts - 1) * random.uniform(0.5, 1.0)
+        if getattr(error, "error_code", None) == 429:
+            self.rate_limited += 1
+            wait = retry_after(error)
+            wait = backoff if wait is None else wait
+            self.bucket.pause(wait)
+            return wait
+        return backoff
+
+
+def summarize(results):
+    """Count delivered, failed and retried recipients."""
+    return {
+        "recipients": len(results),
+        "delivered": sum(1 for r in results if r.ok),
+        "failed": sum(1 for r in results if not r.ok),
+        "retried": sum(1 for r in results if r.attempts > 1),
+    }
@@ -0,0 +1,119 @@
+"""Encode-once, upload-once photo delivery to several chats."""
+
+import asyncio
+from ..core.config import Config
+from ..core.lazy_import import lazy_import
+from .broadcast import Broadcaster
+
+cv2 = lazy_import("cv2")
+
+MEDIA_GROUP_MAX = 10  # Telegram accepts 2-10 photos per media group
+
+
+def encode_jpeg(image, quality=Config.PHOTO_JPEG_QUALITY):
+    """Encode a BGR image as JPEG bytes."""
+    ok, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    if not ok:
+        raise ValueError("Could not encode image as JPEG")
+    return buffer.tobytes()
+
+
+def photo_items(detections, kind):
+    """Turn the video thread's ``send_image`` payload into ``(image, caption)`` pairs.
+
+    ``detections`` is a list of ``(person, face)`` crops, ``face`` being None
+    when no face was found; for ``"Noperson"`` it holds the full frame.
+    """
+    if kind == "Noperson":
+        return [(image, "No person detected!") for image, _ in detections if image is not None]
+    items = []
+    for person, face in detections:
+        items.append((person, "Person detected!"))
+        if face is not None:
+            items.append((face, "Face detected!"))
+    return items
+
+
+def alert_items(alerts):
+    """Turn a batch of ``Alert`` objects into ``(image, caption)`` pairs."""
+    return [(alert.image, alert.caption()) for alert in alerts if alert.image is not None]
+
+
+def _input_media_photo(media, caption):
+    from telebot.types import InputMediaPhoto
+    return InputMediaPhoto(media, caption=caption)
+
+
+def _largest_file_id(message):
+    return message.photo[-1].file_id
+
+
+class PhotoFanout:
+    """Sends the same photos to several chats with one encode and one upload.
+
+    JPEG encoding runs in the loop's default executor, off the event loop.
+    The bytes are uploaded to the first chat that accepts them, and the
+    ``file_id`` Telegram returns is sent to every other chat, so each photo
+    crosses the network once. Several photos go out as media groups of up
+    to ``MEDIA_GROUP_MAX``. Sends go through a ``Broadcaster`` so 429s and
+    network errors are retried within the rate limit.
+    """
+
+    def __init__(self, broadcaster=None, media_factory=_input_media_photo):
+        self.broadcaster = broadcaster or Broadcaster()
+        self.media_factory = media_factory
+        self.upload_attempts = 0
+
+    async def send(self, bot, chat_ids, items):
+        """Send ``(image, caption)`` items to every chat in ``chat_ids``.
+
+        Returns one ``DeliveryResult`` per chat and group of photos.
+        """
+        if not items or not chat_ids:
+            return []
+        loop = asyncio.get_running_loop()
+        images = [image for image, _ in items]
+        encoded = await loop.run_in_executor(None, lambda: [encode_jpeg(image) for image in images])
+        captions = [caption for _, caption in items]
+
+        results = []
+        for start in range(0, len(encoded), MEDIA_GROUP_MAX):
+            group = list(zip(encoded[start:start + MEDIA_GROUP_MAX],
+                             captions[start:start + MEDIA_GROUP_MAX]))
+            results.extend(await self._send_group(bot, list(chat_ids), group))
+        return results
+
+    async def _send_group(self, bot, chat_ids, group):
+        """Upload one group to the first chat that takes it, then fan out file_ids."""
+        results = []
+        file_ids = None
+        while chat_ids and file_ids is None:
+            chat_id = chat_ids.pop(0)
+            result = await self.broadcaster.deliver(chat_id, lambda chat: self._upload(bot, chat, group))
+            results.append(result)
+            if result.ok:
+                file_ids = result.value
+
+        if file_ids is not None and chat_ids:
+            cached = list(zip(file_ids, [caption for _, caption in group]))
+            results.extend(await self.broadcaster.broadcast(
+                chat_ids, lambda chat: self._send_cached(bot, chat, cached)
+            ))
+        return results
+
+    async def _upload(self, bot, chat_id, group):
+        self.upload_attempts += len(group)
+        if len(group) == 1:
+            data, caption = group[0]
+            message = await bot.send_photo(chat_id, data, caption=caption)
+            return [_largest_file_id(message)]
+        media = [self.media_factory(data, caption) for data, caption in group]
+        messages = await bot.send_media_group(chat_id, media)
+        return [_largest_file_id(message) for message in messages]
+
+    async def _send_cached(self, bot, chat_id, cached):
+        if len(cached) == 1:
+            file_id, caption = cached[0]
+            return await bot.send_photo(chat_id, file_id, caption=caption)
+        media = [self.media_factory(file_id, caption) for file_id, caption in cached]
+        return await bot.send_media_group(chat_id, media)
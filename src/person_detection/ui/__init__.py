@@ -1,6 +1,18 @@
 """User interface modules."""
 
-from .main_window import MainWindow
-from .video_thread import VideoThread
 
-__all__ = ["MainWindow", "VideoThread"]
\ No newline at end of file
+def __getattr__(name):
+    # Import UI classes on first use so importing the package stays cheap.
+    if name == "MainWindow":
+        from .main_window import MainWindow
+        return MainWindow
+    if name == "VideoThread":
+        from .video_thread import VideoThread
+        return VideoThread
+    if name == "MultiVideoThread":
+        from .multi_video_thread import MultiVideoThread
+        return MultiVideoThread
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["MainWindow", "VideoThread", "MultiVideoThread"]
\ No newline at end of file
@@ -1,28 +1,54 @@
 """Main window for the Person Detection application."""
 
 import re
+import time
 from PyQt6.QtCore import Qt, QRect, QTimer
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
                              QComboBox, QRadioButton, QCheckBox, QLineEdit, QMessageBox)
 from PyQt6.QtGui import QPixmap
 from .video_thread import VideoThread
+from .multi_video_thread import MultiVideoThread
+from .model_loader import ModelLoader
+from ..detection.alerts import AlertQueue, PersonAlerts
 from ..detection.camera import CameraChecker
+from ..detection.recorder import ClipRecorder
 from ..telegram.bot import TelegramBot
-from ..database.handler import DBHelper
+from ..database.handler import DBHelper, DetectionEventLog
 from ..core.config import Config
+from ..core.metrics import MetricsServer
 from typing import Optional
 
 
 class MainWindow(QWidget):
     """Main application window."""
     
-    def __init__(self):
+    def __init__(self, launch_time=None):
         super().__init__()
         
         self.db = DBHelper()
+        self.event_log = DetectionEventLog() if Config.EVENT_LOG_ENABLED else None
+        self.alert_queue = AlertQueue() if Config.ALERTS_ENABLED else None
+        # Kept across camera restarts so cooldowns survive a stop/start.
+        self.alerts = PersonAlerts(self.alert_queue) if self.alert_queue is not None else None
+        self.recorder = ClipRecorder() if Config.CLIPS_ENABLED else None
+        if self.recorder is not None:
+            self.recorder.start()
+        self.metrics_server = MetricsServer() if Config.METRICS_ENABLED else None
+        if self.metrics_server is not None:
+            try:
+                self.metrics_server.start()
+            except OSError as e:
+                print(f"Could not serve metrics on port {self.metrics_server.port}: {e}")
+                self.metrics_server = None
         self.settings_window = QWidget()
         self.bot_st = ""
         self.camera_running = False
+        self.launch_time = launch_time if launch_time is not None else time.perf_counter()
+        self.models_ready = False
+        self._camera_start_pending = False
+        self.model_loader = ModelLoader()
+        self.model_loader.ready.connect(self._on_models_ready)
+        self.model_loader.failed.connect(self._on_models_failed)
         
         self._setup_ui()
         self._setup_connections()
@@ -53,6 +79,22 @@ class MainWindow(QWidget):
         self.stop_button.setGeometry(QRect(570, 800, 241, 25))
         self.stop_button.setStyleSheet("background-color: red")
 
+        # Multi-camera mode
+        self.multi_camera_checkbox = QCheckBox("All cameras", self)
+        self.multi_camera_checkbox.setGeometry(QRect(850, 800, 150, 25))
+
+        # Skip inference while the scene is static
+        self.motion_gate_checkbox = QCheckBox("Motion gate", self)
+        self.motion_gate_checkbox.setGeometry(QRect(850, 830, 150, 25))
+        self.motion_gate_checkbox.setChecked(Config.MOTION_GATE_ENABLED)
+        self.motion_gate_checkbox.toggled.connect(self._on_motion_gate_changed)
+
+        # Track persons across frames
+        self.tracking_checkbox = QCheckBox("Tracking", self)
+        self.tracking_checkbox.setGeometry(QRect(850, 860, 150, 25))
+        self.tracking_checkbox.setChecked(Config.TRACKING_ENABLED)
+        self.tracking_checkbox.toggled.connect(self._on_tracking_changed)
+
         # Accuracy controls
         self._setup_accuracy_controls()
         
@@ -110,6 +152,10 @@ class MainWindow(QWidget):
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.status_label.setStyleSheet("font-weight: bold; color: yellow;")
 
+        self.model_status_label = QLabel("Models: loading...", self)
+        self.model_status_label.setGeometry(QRect(650, 880, 190, 25))
+        self.model_status_label.setStyleSheet("font-weight: bold; color: yellow;")
+
         # Status update timer
         self.status_timer = QTimer(self)
         self.status_timer.timeout.connect(self._update_status_label)
@@ -121,7 +167,7 @@ class MainWindow(QWidget):
     
     def _start_telegram_bot(self):
         """Initialize and start the Telegram bot."""
-        self.telegram_bot = TelegramBot(self.db, self._get_camera_status)
+        self.telegram_bot = TelegramBot(self.db, self._get_camera_status, self.alert_queue)
         QTimer.singleShot(2000, self.telegram_bot.start)
         
         # Connect bot signals
@@ -190,10 +236,52 @@ class MainWindow(QWidget):
             if self.thread.isRunning():
                 self.thread.set_show_accuracy(show_accuracy)
         
+    def _on_motion_gate_changed(self, enabled):
+        """Toggle the motion gate on the running video thread."""
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.set_motion_gate(enabled)
+        
+    def _on_tracking_changed(self, enabled):
+        """Toggle person tracking on the running video thread."""
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.set_tracking(enabled)
+        
+    def start_model_loading(self):
+        """Load and warm up the models in the background."""
+        self.model_loader.start()
+
+    def _on_models_ready(self, load_seconds):
+        """Mark models as ready and start the camera if it was requested meanwhile."""
+        self.models_ready = True
+        since_launch = time.perf_counter() - self.launch_time
+        print(f"Models ready in {load_seconds:.2f}s ({since_launch:.2f}s after launch).")
+        self.model_status_label.setText("Models: ready")
+        self.model_status_label.setStyleSheet("font-weight: bold; color: green;")
+        if self._camera_start_pending:
+            self._camera_start_pending = False
+            self.start_camera()
+
+    def _on_models_failed(self, error):
+        """Show that models could not be loaded."""
+        self._camera_start_pending = False
+        self.model_status_label.setText("Models: failed")
+        self.model_status_label.setStyleSheet("font-weight: bold; color: red;")
+        QMessageBox.warning(self, "Model Loading", f"Could not load models: {error}")
+
     def start_camera(self):
-        """Start the camera and video processing."""
+        """Start the camera and video processing.
+        
+        If the models are still loading, the camera starts once they are ready.
+        """
+        if not self.models_ready:
+            self._camera_start_pending = True
+            self.model_status_label.setText("Models: loading (camera queued)")
+            return
         if self.thread is None or not self.thread.isRunning():
-            self.thread = VideoThread(self.combo, self.camera_checker)
+            if self.multi_camera_checkbox.isChecked():
+                self.thread = MultiVideoThread(self.camera_checker)
+            else:
+                self.thread = VideoThread(self.combo, self.camera_checker)
             
             # Apply current settings
             if self.radioButton.isChecked():
@@ -204,6 +292,11 @@ class MainWindow(QWidget):
                 self.thread.set_accuracy_threshold(0.75)
                 
             self.thread.set_show_accuracy(self.checkBox.isChecked())
+            self.thread.set_motion_gate(self.motion_gate_checkbox.isChecked())
+            self.thread.set_tracking(self.tracking_checkbox.isChecked())
+            self.thread.event_log = self.event_log
+            self.thread.alerts = self.alerts
+            self.thread.recorder = self.recorder
             
             # Connect signals
             self.thread.change_pixmap_signal.connect(self.update_image)
@@ -215,13 +308,38 @@ class MainWindow(QWidget):
 
     def stop_camera(self):
         """Stop the camera and video processing."""
+        self._camera_start_pending = False
         if self.thread is not None:
             self.thread.stop()
             self.camera_running = False
 
+    def closeEvent(self, event):
+        """Stop the camera and alerts, and write out open clips and detection events on exit."""
+        self.stop_camera()
+        self.camera_checker.stop()
+        if self.thread is not None:
+            self.thread.wait(2000)
+        if self.alert_queue is not None:
+            self.alert_queue.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.event_log is not None:
+            self.event_log.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        super().closeEvent(event)
+
     def update_image(self, qt_image):
-        """Update the image display."""
+        """Update the image display.
+
+        ``qt_image`` wraps the video thread's pooled frame buffer;
+        ``QPixmap.fromImage`` copies it, after which the thread is told it
+        may recycle the buffer.
+        """
         self.image_label.setPixmap(QPixmap.fromImage(qt_image))
+        sender = self.sender()
+        if isinstance(sender, VideoThread):
+            sender.frame_displayed()
         
     def show_settings_window(self):
         """Show the bot settings window."""
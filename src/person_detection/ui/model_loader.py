@@ -0,0 +1,25 @@
+"""Background model loading for a non-blocking startup."""
+
+import time
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class ModelLoader(QThread):
+    """Loads and warms up the YOLO models off the GUI thread."""
+    
+    ready = pyqtSignal(float)
+    failed = pyqtSignal(str)
+    
+    def run(self):
+        """Load models, run a warmup inference and report the time taken."""
+        start = time.perf_counter()
+        try:
+            from ..core.models import model_manager
+            print("Initializing models...")
+            model_manager.initialize()
+            model_manager.warmup()
+        except Exception as e:
+            print(f"Model loading failed: {e}")
+            self.failed.emit(str(e))
+            return
+        self.ready.emit(time.perf_counter() - start)
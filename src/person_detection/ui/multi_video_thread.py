@@ -0,0 +1,251 @@
+"""Video thread for processing several cameras with batched inference."""
+
+import math
+import time
+from .video_thread import VideoThread
+from ..detection.detector import PersonDetector
+from ..detection.camera import CameraChecker
+from ..detection.frame_buffer import FrameBuffer
+from ..detection.frame_pool import PooledFrame
+from ..detection.sources import V4L2Source
+from ..core.config import Config
+from ..core.metrics import (DROPPED, PROCESSED, QUEUE_DEPTH, RECONNECTS, registry, sample,
+                            stage_summary, stage_timers)
+from ..core.lazy_import import lazy_import
+
+cv2 = lazy_import("cv2")
+
+
+class MultiVideoThread(VideoThread):
+    """Thread that runs every available camera through one batched model call.
+
+    Each camera has its own capture thread and latest-frame buffer. On every
+    tick the newest frame of each camera is collected, the person model runs
+    once over the whole batch, and the results are split back out to
+    per-camera detectors. The annotated frames are tiled into one mosaic for
+    the main view.
+    """
+
+    def __init__(self, camera_obj: CameraChecker):
+        super().__init__(None, camera_obj)
+        self.sources = dict(camera_obj.get_cameras())
+        self.detectors = {name: PersonDetector() for name in self.sources}
+        self.buffers = {
+            name: FrameBuffer(Config.FRAME_BUFFER_SIZE, on_drop=PooledFrame.release)
+            for name in self.sources
+        }
+        self.frame_sources = {}
+        self.last_frames = {}
+        self.batches = 0
+
+    def set_accuracy_threshold(self, threshold):
+        """Set the accuracy threshold for every camera."""
+        super().set_accuracy_threshold(threshold)
+        for detector in self.detectors.values():
+            detector.set_accuracy_threshold(threshold)
+
+    def set_show_accuracy(self, show):
+        """Set whether to show accuracy labels on every camera."""
+        super().set_show_accuracy(show)
+        for detector in self.detectors.values():
+            detector.set_show_accuracy(show)
+
+    def set_motion_gate(self, enabled):
+        """Enable or disable the motion gate on every camera."""
+        super().set_motion_gate(enabled)
+        for detector in self.detectors.values():
+            detector.set_motion_gate(enabled)
+
+    def set_tracking(self, enabled):
+        """Enable or disable tracking on every camera."""
+        super().set_tracking(enabled)
+        for detector in self.detectors.values():
+            detector.set_tracking(enabled)
+
+    def send_persons(self):
+        """Send detected persons from every camera to admin via Telegram."""
+        print("Sending persons from all cameras...")
+        detections = []
+        for detector in self.detectors.values():
+            detections.extend(detector.get_detections_with_faces())
+
+        if not detections:
+            self.send_image.emit([(self._snapshot_copy(), None)], "Noperson")
+            return
+        self.send_image.emit(detections, "persons")
+        print("Persons sent to all users.")
+
+    def run(self):
+        """Main multi-camera processing loop."""
+        try:
+            if not self.sources:
+                raise ValueError("No cameras available for multi-camera mode")
+
+            # Batched inference, the mosaic and display are timed as "all".
+            self._bind_metrics("all")
+            for name, address in self.sources.items():
+                self.detectors[name].timings = stage_timers(name)
+                source = V4L2Source(address, name=name, pool=self.frame_pool)
+                self.frame_sources[name] = source
+                source.start(self.buffers[name])
+
+            while self._run_flag:
+                names, frames = self._collect_frames()
+                if not frames:
+                    if all(buffer.closed for buffer in self.buffers.values()):
+                        break
+                    time.sleep(Config.MULTI_CAMERA_IDLE_SLEEP)
+                    continue
+
+                tick = time.perf_counter()
+                # Detectors annotate the pooled arrays in place.
+                if self.scheduler is not None and not self.scheduler.should_infer():
+                    for name, frame in zip(names, frames):
+                        _, persons = self.detectors[name].annotate_last(frame.array)
+                        self._publish(name, frame, persons)
+                    self._emit_mosaic()
+                    self._observe("total", tick)
+                    continue
+
+                start = time.perf_counter()
+                pending = []
+                for name, frame in zip(names, frames):
+                    reused = self.detectors[name].reuse_if_static(frame.array)
+                    if reused is not None:
+                        self._publish(name, frame, reused[1])
+                    else:
+                        pending.append((name, frame))
+
+                if pending:
+                    # Any detector can run the batch; they share the same model.
+                    predictions = self.detector.predict_batch([frame.array for _, frame in pending])
+                    self.batches += 1
+                    for (name, frame), prediction in zip(pending, predictions):
+                        _, persons = self.detectors[name].process_result(frame.array, prediction)
+                        self._publish(name, frame, persons)
+                    # Ticks where every camera was static ran no model; skip them.
+                    if self.scheduler is not None:
+                        self.scheduler.record(time.perf_counter() - start)
+
+                self._emit_mosaic()
+                self._observe("total", tick)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+        finally:
+            self._run_flag = False
+            registry.remove_collector(self.collect_metrics)
+            for buffer in self.buffers.values():
+                buffer.close()
+            for source in self.frame_sources.values():
+                source.stop()
+            for buffer in self.buffers.values():
+                buffer.drain()
+            for frame in self.last_frames.values():
+                frame.release()
+            self.last_frames.clear()
+            print(f"Pipeline stats: {self.pipeline_stats()}")
+
+    def _publish(self, name, frame, persons):
+        """Store one camera's annotated ``PooledFrame`` and pass its count on.
+
+        The count is already drawn on the frame, so it shows on the camera's
+        mosaic tile without a separate signal to the UI.
+        """
+        previous = self.last_frames.get(name)
+        self.last_frames[name] = frame
+        if previous is not None:
+            previous.release()
+        self._log_persons(name, self.detectors[name], persons)
+        self._alert_persons(name, persons, frame.array)
+        self._record_frame(name, frame, persons)
+
+    def _collect_frames(self):
+        """Take the newest pending frame from each camera for this tick."""
+        names, frames = [], []
+        for name, buffer in self.buffers.items():
+            frame = buffer.get_latest(timeout=0)
+            if frame is not None:
+                names.append(name)
+                frames.append(frame)
+        return names, frames
+
+    def _emit_mosaic(self):
+        """Build the mosaic and hand it to the display stage."""
+        start = time.perf_counter()
+        mosaic = self._build_mosaic()
+        self._observe("mosaic", start)
+        self._emit_frame(mosaic)
+
+    def _build_mosaic(self):
+        """Tile the latest annotated frame of each camera into a pooled image."""
+        count = len(self.sources)
+        cols = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / cols)
+        tile_w, tile_h = Config.DEFAULT_FRAME_WIDTH, Config.DEFAULT_FRAME_HEIGHT
+        pooled = self.frame_pool.acquire((rows * tile_h, cols * tile_w, 3))
+        mosaic = pooled.array
+
+        names = list(self.sources)
+        for index in range(rows * cols):
+            row, col = divmod(index, cols)
+            tile = mosaic[row * tile_h:(row + 1) * tile_h, col * tile_w:(col + 1) * tile_w]
+            frame = self.last_frames.get(names[index]) if index < count else None
+            if frame is None:
+                # Recycled buffers hold an old mosaic; blank empty tiles.
+                tile[:] = 0
+                continue
+            image = frame.array
+            if image.shape[1] != tile_w or image.shape[0] != tile_h:
+                cv2.resize(image, (tile_w, tile_h), dst=tile)
+            else:
+                tile[:] = image
+            cv2.putText(mosaic, names[index], (col * tile_w + 10, (row + 1) * tile_h - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        return pooled
+
+    def pipeline_stats(self):
+        """Get frame and dropped-frame counters for every camera."""
+        stats = {
+            "batches": self.batches,
+            "scheduler": self.scheduler.stats() if self.scheduler is not None else None,
+            "displayed": self.displayed,
+            "display_dropped": self.display_dropped,
+            "frame_pool": self.frame_pool.stats(),
+            "alerts": self.alerts.stats() if self.alerts is not None else None,
+            "recorder": self.recorder.stats() if self.recorder is not None else None,
+        }
+        for name, buffer in self.buffers.items():
+            capture = buffer.stats()
+            stats[name] = {
+                "captured": capture["put"],
+                "capture_dropped": capture["dropped"],
+                "inferred": capture["get"],
+            }
+            if name in self.frame_sources:
+                stats[name]["source"] = self.frame_sources[name].stats()
+            stats[name]["face_cache"] = self.detectors[name].face_cache.stats()
+            gate = self.detectors[name].motion_gate
+            if gate is not None:
+                stats[name]["motion_gate"] = gate.stats()
+            if self.detectors[name].timings is not None:
+                stats[name]["stages"] = stage_summary(self.detectors[name].timings)
+        if self.timings is not None:
+            stats["stages"] = stage_summary(self.timings)
+        return stats
+
+    def collect_metrics(self):
+        """Per-camera queue depths and frame counters, read when ``/metrics`` is scraped."""
+        samples = [sample(PROCESSED, self.displayed, camera="all", stage="displayed"),
+                   sample(DROPPED, self.display_dropped, queue="display", camera="all")]
+        for name, buffer in self.buffers.items():
+            capture = buffer.stats()
+            samples += [
+                sample(PROCESSED, capture["put"], camera=name, stage="captured"),
+                sample(PROCESSED, capture["get"], camera=name, stage="inferred"),
+                sample(QUEUE_DEPTH, capture["depth"], queue="capture", camera=name),
+                sample(DROPPED, capture["dropped"], queue="capture", camera=name),
+            ]
+            source = self.frame_sources.get(name)
+            if source is not None:
+                samples.append(sample(RECONNECTS, source.reconnects, camera=name))
+        return samples + self._shared_metrics()
@@ -1,11 +1,18 @@
 """Video thread for camera processing."""
 
-import cv2
+import threading
+import time
 from PyQt6.QtCore import QThread, pyqtSignal
 from PyQt6.QtGui import QImage
 from ..detection.detector import PersonDetector
 from ..detection.camera import CameraChecker
+from ..detection.frame_buffer import FrameBuffer
+from ..detection.frame_pool import FramePool, PooledFrame
+from ..detection.scheduler import InferenceScheduler
+from ..detection.sources import V4L2Source
 from ..core.config import Config
+from ..core.metrics import (DROPPED, PROCESSED, QUEUE_DEPTH, RECONNECTS, registry, sample,
+                            stage_summary, stage_timers)
 
 
 class VideoThread(QThread):
@@ -14,13 +21,29 @@ class VideoThread(QThread):
     change_pixmap_signal = pyqtSignal(QImage)
     send_image = pyqtSignal(object, str)
 
-    def __init__(self, combo_obj, camera_obj: CameraChecker):
+    def __init__(self, combo_obj, camera_obj: CameraChecker, source=None):
         super().__init__()
         self._run_flag = True
-        self.detected_img = None
         self.combo_obj = combo_obj
         self.camera_obj = camera_obj
+        # A FrameSource to read instead of the camera selected in the combo box.
+        self.source = source
+        self.capture_source = None
         self.detector = PersonDetector()
+        self.frame_pool = source.pool if source is not None else FramePool(Config.FRAME_POOL_SIZE)
+        self.capture_buffer = FrameBuffer(Config.FRAME_BUFFER_SIZE, on_drop=PooledFrame.release)
+        self.scheduler = InferenceScheduler() if Config.ADAPTIVE_STRIDE_ENABLED else None
+        self.event_log = None
+        self.alerts = None
+        self.recorder = None
+        self.camera_name = None
+        self.timings = None
+        self._display_pending = threading.Event()
+        self._display_lock = threading.Lock()
+        self._snapshot = None
+        self._on_screen = None
+        self.displayed = 0
+        self.display_dropped = 0
     
     def set_accuracy_threshold(self, threshold):
         """Set the accuracy threshold for detection."""
@@ -30,6 +53,24 @@ class VideoThread(QThread):
         """Set whether to show accuracy labels."""
         self.detector.set_show_accuracy(show)
 
+    def set_motion_gate(self, enabled):
+        """Enable or disable skipping inference on static scenes."""
+        self.detector.set_motion_gate(enabled)
+
+    def set_tracking(self, enabled):
+        """Enable or disable tracking persons across frames."""
+        self.detector.set_tracking(enabled)
+
+    @property
+    def detected_img(self):
+        """The last annotated frame, or None before the first frame.
+
+        This is a pooled buffer that is recycled once a newer frame replaces
+        it; copy it before keeping it beyond the current call.
+        """
+        snapshot = self._snapshot
+        return snapshot.array if snapshot is not None else None
+
     def send_persons(self):
         """Send detected persons to admin via Telegram."""
         print("Sending persons to all users...")
@@ -37,53 +78,227 @@ class VideoThread(QThread):
         detections = self.detector.get_detections_with_faces()
         
         if not detections:
-            self.send_image.emit((self.detected_img,), "Noperson")
+            self.send_image.emit([(self._snapshot_copy(), None)], "Noperson")
             return
         
-        for detection, face in detections:
-            if face is not None:
-                self.send_image.emit((detection, face), "pandf")
-            else:
-                self.send_image.emit((detection,), "Noface")
+        # One emission for all crops so the bot can send them as one media group.
+        self.send_image.emit(detections, "persons")
         
-        print("Persons sent to all users.")
+        print(f"Persons sent to all users. Face cache: {self.detector.face_cache.stats()}")
 
     def run(self):
-        """Main video processing loop."""
+        """Main video processing loop.
+
+        Capture runs on its own thread and always overwrites the newest slot
+        of ``capture_buffer``; this thread only ever runs inference on the
+        most recent frame, so latency stays bounded however slow the model is.
+        """
+        source = self.source
         try:
-            option_selected = self.combo_obj.currentText()
-            address = self.camera_obj.get_cameras().get(option_selected)
-            if address is None:
-                raise ValueError(f"No address found for the selected camera: {option_selected}")
+            if source is None:
+                option_selected = self.combo_obj.currentText()
+                address = self.camera_obj.get_cameras().get(option_selected)
+                if address is None:
+                    raise ValueError(f"No address found for the selected camera: {option_selected}")
+                source = V4L2Source(address, name=option_selected, pool=self.frame_pool)
+            else:
+                option_selected = source.name
+            self.capture_source = source
+            self._bind_metrics(option_selected)
 
-            cap = cv2.VideoCapture(address)
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, Config.DEFAULT_FRAME_WIDTH)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, Config.DEFAULT_FRAME_HEIGHT)
-            cap.set(cv2.CAP_PROP_FPS, Config.DEFAULT_FPS)
+            # The source's prefetch thread is the capture stage; it reconnects
+            # on its own if the camera stops delivering frames.
+            source.start(self.capture_buffer)
 
             while self._run_flag:
-                ret, frame = cap.read()
-                if ret:
-                    frame, persons = self.detector.detect_and_count_persons(frame)
-                    
-                    self.detected_img = frame.copy()
-                    rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    h, w, ch = rgb_image.shape
-                    bytes_per_line = ch * w
-                    qt_image = QImage(
-                        rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888
-                    )
-
-                    self.change_pixmap_signal.emit(qt_image)
-                else:
-                    print("Failed to read frame from camera.")
-                    break
-
-            cap.release()
+                frame = self.capture_buffer.get_latest(timeout=Config.FRAME_WAIT_TIMEOUT)
+                if frame is None:
+                    if self.capture_buffer.closed:
+                        break
+                    continue
+                start = time.perf_counter()
+                # Annotation draws into the pooled array in place.
+                _, persons = self._detect(frame.array)
+                self._log_persons(option_selected, self.detector, persons)
+                self._alert_persons(option_selected, persons, frame.array)
+                self._record_frame(option_selected, frame, persons)
+                self._emit_frame(frame)
+                self._observe("total", start)
         except Exception as e:
             print(f"An error occurred: {e}")
-            if 'cap' in locals():
-                cap.release()
+        finally:
+            self._run_flag = False
+            registry.remove_collector(self.collect_metrics)
+            self.capture_buffer.close()
+            if source is not None:
+                source.stop()
+            self.capture_buffer.drain()
+            print(f"Pipeline stats: {self.pipeline_stats()}")
+
+    def _bind_metrics(self, camera):
+        """Time this camera's stages and expose its queues at ``/metrics``."""
+        self.camera_name = camera
+        self.timings = stage_timers(camera)
+        self.detector.timings = self.timings
+        registry.add_collector(self.collect_metrics)
+
+    def _observe(self, stage, start):
+        """Record the time since ``start`` under ``stage`` if timings are on."""
+        if self.timings is not None:
+            self.timings[stage].observe(time.perf_counter() - start)
+
+    def _detect(self, frame):
+        """Run inference, or reuse the last boxes when the scheduler skips this frame.
+
+        Only frames the model actually ran on feed the scheduler's latency;
+        frames the motion gate reused would drag it towards zero.
+        """
+        if self.scheduler is None:
+            return self.detector.detect_and_count_persons(frame)
+        if not self.scheduler.should_infer():
+            return self.detector.annotate_last(frame)
+        start = time.perf_counter()
+        result = self.detector.detect_and_count_persons(frame)
+        if self.detector.inferred:
+            self.scheduler.record(time.perf_counter() - start)
+        return result
+
+    def _log_persons(self, camera, detector, persons):
+        """Queue a detection event when the person count changes.
+
+        The boxes logged are the ones that were counted, so with tracking on
+        they are the confirmed tracks rather than the raw model output.
+        """
+        if self.event_log is not None:
+            self.event_log.record_change(camera, persons, detector.shown_detections)
+
+    def _alert_persons(self, camera, persons, image):
+        """Feed the person count to the alerting stage; never blocks on sending."""
+        if self.alerts is not None:
+            self.alerts.observe(camera, persons, image)
+
+    def _record_frame(self, camera, frame, persons):
+        """Offer the annotated ``PooledFrame`` to the clip recorder; never blocks."""
+        if self.recorder is not None:
+            self.recorder.push(camera, frame, persons)
+
+    def _emit_frame(self, frame):
+        """Display stage: hand the annotated frame to the UI if it is ready.
+
+        ``frame`` is a ``PooledFrame`` whose reference this call takes over.
+        It becomes the snapshot without copying, and the QImage wraps the BGR
+        pixels directly; the display holds its own reference until
+        ``frame_displayed`` so the buffer cannot be recycled under Qt.
+
+        A frame is dropped when the previous one has not been painted yet, so
+        the Qt event queue never accumulates stale images.
+        """
+        with self._display_lock:
+            previous, self._snapshot = self._snapshot, frame
+        if previous is not None:
+            previous.release()
+        if self._display_pending.is_set():
+            self.display_dropped += 1
+            return
+
+        start = time.perf_counter()
+        array = frame.array
+        h, w, ch = array.shape
+        qt_image = QImage(array.data, w, h, array.strides[0], QImage.Format.Format_BGR888)
+        self._observe("convert", start)
+
+        with self._display_lock:
+            self._on_screen = frame.retain()
+        self._display_pending.set()
+        start = time.perf_counter()
+        self.change_pixmap_signal.emit(qt_image)
+        self._observe("emit", start)
+        self.displayed += 1
+
+    def frame_displayed(self):
+        """Mark the last emitted frame as painted by the UI.
+
+        Called on the UI thread after ``QPixmap.fromImage`` has copied the
+        pixels, so the frame buffer can go back to the pool.
+        """
+        with self._display_lock:
+            on_screen, self._on_screen = self._on_screen, None
+        if on_screen is not None:
+            on_screen.release()
+        self._display_pending.clear()
+
+    def _snapshot_copy(self):
+        """Copy of the last annotated frame that outlives the pool buffer."""
+        with self._display_lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return None
+            snapshot.retain()
+        try:
+            return snapshot.array.copy()
+        finally:
+            snapshot.release()
+
+    def pipeline_stats(self):
+        """Get per-stage frame and dropped-frame counters."""
+        capture = self.capture_buffer.stats()
+        stats = {
+            "captured": capture["put"],
+            "capture_dropped": capture["dropped"],
+            "inferred": capture["get"],
+            "displayed": self.displayed,
+            "display_dropped": self.display_dropped,
+            "frame_pool": self.frame_pool.stats(),
+        }
+        if self.capture_source is not None:
+            stats["source"] = self.capture_source.stats()
+        gate = self.detector.motion_gate
+        if gate is not None:
+            stats["motion_gate"] = gate.stats()
+        if self.scheduler is not None:
+            stats["scheduler"] = self.scheduler.stats()
+        stats["face_cache"] = self.detector.face_cache.stats()
+        if self.alerts is not None:
+            stats["alerts"] = self.alerts.stats()
+        if self.recorder is not None:
+            stats["recorder"] = self.recorder.stats()
+        if self.timings is not None:
+            stats["stages"] = stage_summary(self.timings)
+        return stats
+
+    def collect_metrics(self):
+        """Queue depths and frame counters, read when ``/metrics`` is scraped."""
+        camera = self.camera_name
+        capture = self.capture_buffer.stats()
+        samples = [
+            sample(PROCESSED, capture["put"], camera=camera, stage="captured"),
+            sample(PROCESSED, capture["get"], camera=camera, stage="inferred"),
+            sample(PROCESSED, self.displayed, camera=camera, stage="displayed"),
+            sample(QUEUE_DEPTH, capture["depth"], queue="capture", camera=camera),
+            sample(DROPPED, capture["dropped"], queue="capture", camera=camera),
+            sample(DROPPED, self.display_dropped, queue="display", camera=camera),
+        ]
+        if self.capture_source is not None:
+            samples.append(sample(RECONNECTS, self.capture_source.reconnects, camera=camera))
+        return samples + self._shared_metrics()
+
+    def _shared_metrics(self):
+        """Depths and drops of the queues shared by every camera."""
+        samples = []
+        if self.alerts is not None:
+            alerts = self.alerts.queue.stats()
+            samples += [sample(QUEUE_DEPTH, alerts["pending"], queue="alerts"),
+                        sample(DROPPED, alerts["dropped"], queue="alerts")]
+        if self.recorder is not None:
+            recorder = self.recorder.stats()
+            samples += [sample(QUEUE_DEPTH, recorder["queued"], queue="clip_frames"),
+                        sample(QUEUE_DEPTH, recorder["encoder_queued"], queue="clip_encoder"),
+                        sample(DROPPED, recorder["dropped"], queue="clip_frames")]
+        if self.event_log is not None:
+            events = self.event_log.stats()
+            samples += [sample(QUEUE_DEPTH, events["queued"], queue="event_log"),
+                        sample(DROPPED, events["dropped"], queue="event_log")]
+        return samples
 
     def stop(self):
         """Stop the video thread."""
@@ -0,0 +1,55 @@
+"""person-detect must write nothing but JSONL rows to stdout."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import cv2
+import numpy as np
+
+from person_detection import cli
+from person_detection.detection.detector import PersonDetector
+from stub_model import StubModel, StubModelManager
+
+
+class ChattyModelManager(StubModelManager):
+    """Prints while loading, like ``ModelManager`` does."""
+
+    def get_person_model(self):
+        print("Model already exists.")
+        return super().get_person_model()
+
+
+class StubDetector(PersonDetector):
+    def __init__(self):
+        super().__init__()
+        self._model_manager = ChattyModelManager(StubModel(2))
+
+
+def test_stdout_carries_only_jsonl(tmp_path, monkeypatch, capsys):
+    for i in range(3):
+        cv2.imwrite(str(tmp_path / f"{i}.png"), np.zeros((48, 64, 3), dtype=np.uint8))
+    monkeypatch.setattr(cli, "PersonDetector", StubDetector)
+
+    assert cli.main([str(tmp_path)]) == 0
+
+    out, err = capsys.readouterr()
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [row["frame"] for row in rows] == [0, 1, 2]
+    assert "Model already exists." in err
+
+
+def test_rows_keep_the_input_index_past_an_unreadable_image(tmp_path, monkeypatch, capsys):
+    for i in range(4):
+        cv2.imwrite(str(tmp_path / f"{i}.png"), np.zeros((48, 64, 3), dtype=np.uint8))
+    (tmp_path / "1.png").write_bytes(b"not an image")
+    monkeypatch.setattr(cli, "PersonDetector", StubDetector)
+
+    assert cli.main([str(tmp_path), "--max-frames", "3"]) == 0
+
+    out, _ = capsys.readouterr()
+    # --max-frames counts inputs, the unreadable one included.
+    assert [json.loads(line)["frame"] for line in out.splitlines()] == [0, 2]
@@ -0,0 +1,35 @@
+"""The boxes logged with a detection event must match the reported count."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import numpy as np
+
+from person_detection.detection.detector import PersonDetector
+from stub_model import StubModel, StubModelManager
+
+
+def run_frames(tracking, frames=4, persons=3):
+    detector = PersonDetector()
+    detector.set_tracking(tracking)
+    detector._model_manager = StubModelManager(StubModel(persons))
+    counts = []
+    for _ in range(frames):
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        _, count = detector.detect_and_count_persons(frame)
+        counts.append((count, len(detector.shown_detections), len(detector.last_detections)))
+    return counts
+
+
+def test_logged_boxes_match_count_with_tracking():
+    counts = run_frames(tracking=True)
+    assert all(count == shown for count, shown, _ in counts)
+    # New tracks are only confirmed after a few hits, so raw boxes differ at first.
+    assert any(count != raw for count, _, raw in counts)
+
+
+def test_logged_boxes_match_count_without_tracking():
+    assert all(count == shown == raw for count, shown, raw in run_frames(tracking=False))
@@ -0,0 +1,81 @@
+"""Face cache entries must not outlive the tracker whose IDs keyed them."""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import numpy as np
+
+from person_detection.detection.detector import PersonDetector
+from person_detection.detection.face_cache import spatial_key, track_key
+from stub_model import StubModel, StubModelManager
+
+
+def next_frame(detector):
+    """Process one frame without the model, applying pending settings."""
+    detector.annotate_last(np.zeros((48, 64, 3), dtype=np.uint8))
+
+
+def test_toggling_tracking_drops_faces_cached_by_track_id():
+    detector = PersonDetector()
+    detector.set_tracking(True)
+    next_frame(detector)
+    face = np.zeros((8, 8, 3), dtype=np.uint8)
+    detector.face_cache.put(track_key(1), face)
+    assert detector.face_cache.get(track_key(1))[0]
+
+    detector.set_tracking(False)
+    next_frame(detector)
+    detector.set_tracking(True)
+    next_frame(detector)
+
+    # The new tracker hands ID 1 to whoever it sees first.
+    assert detector.face_cache.get(track_key(1)) == (False, None)
+
+
+def test_enabling_tracking_when_already_on_keeps_the_cache():
+    detector = PersonDetector()
+    detector.set_tracking(True)
+    next_frame(detector)
+    detector.face_cache.put(track_key(1), None)
+    detector.set_tracking(True)
+    next_frame(detector)
+    assert detector.face_cache.get(track_key(1)) == (True, None)
+
+
+def test_tracking_changes_wait_for_the_next_frame():
+    detector = PersonDetector()
+    detector.set_tracking(True)
+    assert detector.tracker is None
+    next_frame(detector)
+    assert detector.tracker is not None
+
+
+def test_toggling_tracking_from_another_thread_mid_stream():
+    detector = PersonDetector()
+    detector._model_manager = StubModelManager(StubModel(3))
+    done = threading.Event()
+
+    def toggle():
+        enabled = True
+        while not done.is_set():
+            detector.set_tracking(enabled)
+            enabled = not enabled
+
+    thread = threading.Thread(target=toggle)
+    thread.start()
+    try:
+        for _ in range(300):
+            detector.detect_and_count_persons(np.zeros((48, 64, 3), dtype=np.uint8))
+            next_frame(detector)
+    finally:
+        done.set()
+        thread.join()
+
+
+def test_track_and_spatial_keys_never_collide():
+    assert track_key(1) != spatial_key((0, 0, 1, 1))
+    assert track_key(1)[0] == "track" and spatial_key((0, 0, 1, 1))[0] == "spatial"
@@ -0,0 +1,27 @@
+"""Entry points must import within Config.IMPORT_BUDGETS_MS."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from person_detection.core.config import Config
+from person_detection.profiling import measure_imports
+
+
+@pytest.mark.parametrize("module", sorted(Config.IMPORT_BUDGETS_MS))
+def test_entry_point_import_time_within_budget(module):
+    timings = []
+    # Best of three fresh interpreters, so a busy machine does not fail the check.
+    for _ in range(3):
+        try:
+            total, _ = measure_imports(module)
+        except RuntimeError as e:
+            if "ModuleNotFoundError" in str(e):
+                pytest.skip(str(e).splitlines()[-1])
+            raise
+        timings.append(total / 1000)
+    assert min(timings) <= Config.IMPORT_BUDGETS_MS[module], \
+        f"{module} imports in {min(timings):.1f} ms"
@@ -0,0 +1,15 @@
+"""The ONNX backends must not pull in ultralytics or torch at import time."""
+
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+def test_model_manager_import_leaves_ultralytics_unloaded():
+    code = ("import sys; import person_detection.core.models; "
+            "print(sorted(m for m in ('ultralytics', 'torch') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=SRC, check=True,
+                         capture_output=True, text=True).stdout
+    assert out.strip() == "[]"
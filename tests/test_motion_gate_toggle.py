@@ -0,0 +1,56 @@
+"""Motion gate toggles from the GUI thread must not break a running frame."""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import numpy as np
+
+from person_detection.detection.detector import PersonDetector
+from stub_model import StubModel, StubModelManager
+
+
+def test_motion_gate_changes_wait_for_the_next_frame():
+    detector = PersonDetector()
+    detector._model_manager = StubModelManager(StubModel(1))
+    detector.set_motion_gate(True)
+    assert detector.motion_gate is None
+    detector.detect_and_count_persons(np.zeros((48, 64, 3), dtype=np.uint8))
+    assert detector.motion_gate is not None
+
+
+def test_toggling_motion_gate_from_another_thread_mid_stream():
+    detector = PersonDetector()
+    detector._model_manager = StubModelManager(StubModel(2))
+    done = threading.Event()
+
+    def toggle():
+        enabled = True
+        while not done.is_set():
+            detector.set_motion_gate(enabled)
+            detector.set_accuracy_threshold(0.5)
+            enabled = not enabled
+
+    thread = threading.Thread(target=toggle)
+    thread.start()
+    try:
+        for _ in range(300):
+            detector.detect_and_count_persons(np.zeros((48, 64, 3), dtype=np.uint8))
+    finally:
+        done.set()
+        thread.join()
+
+
+def test_reused_frames_are_not_reported_as_inferred():
+    detector = PersonDetector()
+    detector._model_manager = StubModelManager(StubModel(2))
+    detector.set_motion_gate(True)
+    inferred = []
+    for _ in range(5):
+        detector.detect_and_count_persons(np.zeros((48, 64, 3), dtype=np.uint8))
+        inferred.append(detector.inferred)
+    # The first frame runs the model; the unchanged frames after it reuse its boxes.
+    assert inferred[0] and not any(inferred[1:])
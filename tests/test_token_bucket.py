@@ -0,0 +1,20 @@
+"""A TokenBucket built outside the bot's event loop must work inside it."""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from person_detection.telegram.broadcast import TokenBucket
+
+
+def test_bucket_built_before_the_loop_serves_contended_acquires():
+    bucket = TokenBucket(rate=200, capacity=1)
+
+    async def contend():
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+
+    # Two loops in a row, as when the bot is restarted in the same process.
+    asyncio.run(contend())
+    asyncio.run(contend())